@@ -4,9 +4,11 @@ from contextlib import asynccontextmanager
 from typing import Optional
 
 import openlit
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
+from rainmaker_orchestrator.jobs import JobHandler, JobStore, JobWorkerPool
 from rainmaker_orchestrator.orchestrator import RainmakerOrchestrator
 
 # Configure logging with structured format for Datadog
@@ -31,12 +33,56 @@ class HubSpotWebhookPayload(BaseModel):
     message_body: str = Field(..., description="Event message content")
 
 
+AUTHORITY_FLOW_JOB: str = "authority_flow"
+
+
+def _judge_provider(orchestrator: RainmakerOrchestrator) -> str:
+    """Name of the judge provider an authority flow will call, for rate limiting."""
+    try:
+        return orchestrator.judge_client.endpoint.provider
+    except ValueError:
+        return "default"
+
+
+def build_job_pool(orchestrator: RainmakerOrchestrator) -> JobWorkerPool:
+    """
+    Create the persistent job queue and worker pool for authority flows.
+
+    Configured via JOB_DB_PATH, JOB_WORKERS, JOB_MAX_ATTEMPTS, JOB_IDEMPOTENCY_TTL_SECONDS,
+    and per-provider judge-call budgets JOB_RATE_LIMIT_<PROVIDER>_PER_MINUTE
+    (falling back to JOB_RATE_LIMIT_PER_MINUTE).
+    """
+    config = orchestrator.config
+    store = JobStore(
+        path=config.get("JOB_DB_PATH") or "jobs.db",
+        idempotency_ttl=float(config.get_int("JOB_IDEMPOTENCY_TTL_SECONDS", 3600)),
+    )
+    handler = JobHandler(
+        run=orchestrator.run_authority_flow,
+        provider=lambda: _judge_provider(orchestrator),
+        cost=len(orchestrator.authority_dag.steps),
+    )
+    rate_limits = {}
+    for provider in ("zai", "mistral"):
+        per_minute = config.get_int(f"JOB_RATE_LIMIT_{provider.upper()}_PER_MINUTE", 0)
+        if per_minute > 0:
+            rate_limits[provider] = float(per_minute)
+    return JobWorkerPool(
+        store,
+        {AUTHORITY_FLOW_JOB: handler},
+        concurrency=config.get_int("JOB_WORKERS", 4),
+        rate_limits_per_minute=rate_limits,
+        default_rate_per_minute=float(config.get_int("JOB_RATE_LIMIT_PER_MINUTE", 60)),
+        max_attempts=config.get_int("JOB_MAX_ATTEMPTS", 2),
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> None:
     """
     Manage application startup and shutdown for the Authority Engine.
     
-    On startup, conditionally initialize OpenLIT telemetry (skipped when the environment variable CI is "true") using the OPENLIT_OTLP_ENDPOINT and ENVIRONMENT environment variables, instantiate a RainmakerOrchestrator, and attach it to app.state.orchestrator. On shutdown, close the orchestrator by calling its aclose() coroutine.
+    On startup, conditionally initialize OpenLIT telemetry (skipped when the environment variable CI is "true") using the OPENLIT_OTLP_ENDPOINT and ENVIRONMENT environment variables, instantiate a RainmakerOrchestrator, and attach it to app.state.orchestrator, then start the persistent job worker pool on app.state.job_pool (requeueing jobs interrupted by a previous shutdown). On shutdown, stop the workers and close the orchestrator by calling its aclose() coroutine.
     """
     # Initialize OpenLIT only if not in CI environment
     if os.getenv("CI") != "true":
@@ -55,10 +101,15 @@ async def lifespan(app: FastAPI) -> None:
 
     orchestrator: RainmakerOrchestrator = RainmakerOrchestrator()
     app.state.orchestrator = orchestrator
+    job_pool: JobWorkerPool = build_job_pool(orchestrator)
+    job_pool.start()
+    app.state.job_pool = job_pool
     logger.info("✅ Authority Engine initialized and ready")
 
     yield
 
+    await job_pool.stop()
+    job_pool.store.close()
     await orchestrator.aclose()
     logger.info("🛑 Authority Engine shut down gracefully")
 
@@ -92,34 +143,68 @@ async def health() -> dict:
 @app.post("/webhook/hubspot", tags=["Webhooks"])
 async def hubspot_webhook(
     payload: HubSpotWebhookPayload,
-    background_tasks: BackgroundTasks,
     request: Request,
 ) -> dict:
     """
     Enqueues an authority flow run for an incoming HubSpot webhook event.
-    
+
+    The job is persisted before the response is sent and executed by the bounded worker pool.
+    Repeat deliveries for the same `objectId` return the existing job instead of starting another flow.
+
     Parameters:
         payload (HubSpotWebhookPayload): HubSpot event payload containing `objectId` and `message_body`.
-    
+
     Returns:
-        dict: A response with status and human-readable message, e.g. `{"status": "accepted", "message": "Authority Flow queued"}`.
-    
+        dict: A response with status, human-readable message, the `job_id` to poll via `GET /jobs/{job_id}`,
+        and `duplicate` set when the event matched an existing job.
+
     Raises:
         HTTPException: Raised with status code 500 when webhook processing fails.
     """
     try:
-        orchestrator: RainmakerOrchestrator = request.app.state.orchestrator
-        background_tasks.add_task(
-            orchestrator.run_authority_flow,
+        job_pool: JobWorkerPool = request.app.state.job_pool
+        job, created = await job_pool.submit(
+            AUTHORITY_FLOW_JOB,
             payload.model_dump(),
+            idempotency_key=f"hubspot:{payload.objectId}",
         )
-        logger.info(f"HubSpot event queued: contact_id={payload.objectId}")
-        return {"status": "accepted", "message": "Authority Flow queued"}
+        logger.info(f"HubSpot event queued: contact_id={payload.objectId} job_id={job.id} duplicate={not created}")
+        return {
+            "status": "accepted",
+            "message": "Authority Flow queued" if created else "Authority Flow already queued",
+            "job_id": job.id,
+            "duplicate": not created,
+        }
     except Exception as e:
         logger.error(f"Webhook processing error: {str(e)}")
         raise HTTPException(status_code=500, detail="Webhook processing failed")
 
 
+@app.get("/jobs/{job_id}", tags=["Tasks"])
+async def get_job(job_id: str, request: Request) -> dict:
+    """
+    Return the status of a queued authority flow job.
+
+    Returns:
+        dict: Job id, kind, status (queued, running, succeeded, failed), attempts, result, error,
+        timestamps, and wait/run durations in seconds.
+
+    Raises:
+        HTTPException: Raised with status code 404 when the job does not exist.
+    """
+    job_pool: JobWorkerPool = request.app.state.job_pool
+    job = await job_pool.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/metrics", tags=["System"])
+async def metrics() -> Response:
+    """Expose Prometheus metrics, including job queue depth, wait time and run time."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post("/execute", tags=["Tasks"])
 async def execute(payload: ExecuteTaskPayload, request: Request) -> dict:
     """
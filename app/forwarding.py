@@ -0,0 +1,350 @@
+"""
+Webhook forwarding subsystem for Atlassian targets.
+
+Each target (Jira, Bitbucket, Atlassian webhook) owns one pooled SSRF-safe
+HTTP client, a circuit breaker and an AIMD concurrency limiter. Target
+configuration is resolved from the environment once at startup instead of
+on every event.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+import httpx
+
+from vaal_ai_empire.api.secure_requests import create_ssrf_safe_async_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ForwardTargetConfig:
+    """Static configuration for a single forwarding target."""
+
+    name: str
+    url: str
+    auth: Optional[Tuple[str, str]] = None
+    timeout: float = 30.0
+    max_connections: int = 20
+    # Batching is only meaningful for targets that accept a list of events
+    # in one request (the Atlassian automation webhook). REST targets keep 1.
+    batch_size: int = 1
+    batch_window: float = 0.05
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    latency_target: float = 1.0
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 32
+
+    @property
+    def supports_batching(self) -> bool:
+        return self.batch_size > 1
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker with a single recovery probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN or self._probe_in_flight:
+            return False
+        # Half-open: let exactly one probe through
+        self._state = self.HALF_OPEN
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe that never reached the target."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        if self._state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        logger.warning("Circuit opened after %d failures", self._failures)
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limit: additive increase, multiplicative decrease.
+
+    The limit grows by roughly one slot per window of successful requests
+    below ``latency_target`` and is cut by ``backoff`` when a request fails or
+    exceeds the target. Decreases happen at most once per ``latency_target``
+    so a burst of slow responses does not collapse the limit to the floor.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: float = 1.0,
+        backoff: float = 0.5,
+        clock=time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._clock = clock
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+    async def release(self, latency: float, success: bool) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            if success and latency <= self.latency_target:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            else:
+                now = self._clock()
+                if now - self._last_decrease >= self.latency_target:
+                    self._limit = max(self.min_limit, self._limit * self.backoff)
+                    self._last_decrease = now
+            self._cond.notify_all()
+
+
+class ForwardingTarget:
+    """A single forwarding destination with its own pool, breaker and limiter."""
+
+    def __init__(self, config: ForwardTargetConfig, client: Optional[httpx.AsyncClient] = None):
+        self.config = config
+        self._client = client or create_ssrf_safe_async_session(
+            timeout=config.timeout,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_connections,
+            ),
+        )
+        self.breaker = CircuitBreaker(config.failure_threshold, config.reset_timeout)
+        self.limiter = AIMDLimiter(
+            initial=config.initial_concurrency,
+            min_limit=config.min_concurrency,
+            max_limit=config.max_concurrency,
+            latency_target=config.latency_target,
+        )
+        self.stats = {"forwarded": 0, "failed": 0, "rejected": 0, "batches": 0}
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def send(self, payload: Any) -> Dict[str, Any]:
+        """Deliver a payload, coalescing into batches if the target supports it."""
+        if not self.config.supports_batching:
+            return await self._deliver(payload)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.config.batch_size:
+            self._schedule_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_after_window())
+            self._flushes.add(self._flush_timer)
+            self._flush_timer.add_done_callback(self._flushes.discard)
+        return await future
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        # Take the batch now so events queued before the task runs start a new one
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.config.batch_window)
+        self._flush_timer = None
+        batch, self._pending = self._pending, []
+        await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        if not batch:
+            return
+        result = await self._deliver({"events": [payload for payload, _ in batch]})
+        result["batch_size"] = len(batch)
+        self.stats["batches"] += 1
+        for _, future in batch:
+            if not future.done():
+                future.set_result(dict(result))
+
+    async def _deliver(self, body: Any) -> Dict[str, Any]:
+        if not self.breaker.allow_request():
+            self.stats["rejected"] += 1
+            return {"status": "error", "reason": "circuit_open", "target": self.config.name}
+
+        start = None
+        success = False
+        target_healthy = False
+        try:
+            await self.limiter.acquire()
+            start = time.monotonic()
+            response = await self._client.post(self.config.url, json=body, auth=self.config.auth)
+            response.raise_for_status()
+            success = target_healthy = True
+            self.stats["forwarded"] += 1
+            return {"status": "forwarded", "status_code": response.status_code, "target": self.config.url}
+        except httpx.HTTPStatusError as e:
+            # A 4xx means the target is up and rejected this event; don't trip the breaker
+            target_healthy = e.response.status_code < 500
+            self.stats["failed"] += 1
+            logger.error(f"Error forwarding to {self.config.name}: {e}")
+            return {"status": "error", "error": str(e), "status_code": e.response.status_code}
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Error forwarding to {self.config.name}: {e}")
+            return {"status": "error", "error": str(e)}
+        finally:
+            if start is None:
+                # Cancelled while waiting for a slot: nothing was sent
+                self.breaker.release_probe()
+            else:
+                await self.limiter.release(time.monotonic() - start, success)
+                if target_healthy:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "concurrency_limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+            "pending_batch": len(self._pending),
+            **self.stats,
+        }
+
+    async def aclose(self) -> None:
+        """Flush any pending batch and close the pooled client."""
+        if self._pending:
+            self._schedule_flush()
+        elif self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self._client.aclose()
+
+
+def _auth_from_env(env: Mapping[str, str], user_key: str, secret_key: str) -> Optional[Tuple[str, str]]:
+    user, secret = env.get(user_key), env.get(secret_key)
+    return (user, secret) if user and secret else None
+
+
+def load_target_configs(env: Optional[Mapping[str, str]] = None) -> Dict[str, ForwardTargetConfig]:
+    """Resolve forwarding targets from the environment. Unconfigured targets are omitted."""
+    env = os.environ if env is None else env
+    timeout = float(env.get('WEBHOOK_TIMEOUT', '30'))
+    max_connections = int(env.get('WEBHOOK_MAX_CONNECTIONS', '20'))
+    failure_threshold = int(env.get('WEBHOOK_CIRCUIT_FAILURES', '5'))
+    reset_timeout = float(env.get('WEBHOOK_CIRCUIT_RESET_SECONDS', '30'))
+    latency_target = float(env.get('WEBHOOK_LATENCY_TARGET_SECONDS', '1.0'))
+
+    specs = {
+        "jira": (env.get('JIRA_BASE_URL'), _auth_from_env(env, 'JIRA_USER_EMAIL', 'JIRA_API_TOKEN'), 1),
+        "bitbucket": (
+            env.get('BITBUCKET_BASE_URL'),
+            _auth_from_env(env, 'BITBUCKET_USERNAME', 'BITBUCKET_APP_PASSWORD'),
+            1,
+        ),
+        "atlassian": (env.get('ATLAS_WEBHOOK_URL'), None, int(env.get('ATLAS_WEBHOOK_BATCH_SIZE', '1'))),
+    }
+
+    configs = {}
+    for name, (url, auth, batch_size) in specs.items():
+        if not url:
+            continue
+        configs[name] = ForwardTargetConfig(
+            name=name,
+            url=url,
+            auth=auth,
+            timeout=timeout,
+            max_connections=max_connections,
+            batch_size=batch_size,
+            batch_window=float(env.get('ATLAS_WEBHOOK_BATCH_WINDOW', '0.05')),
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            latency_target=latency_target,
+        )
+    return configs
+
+
+class WebhookForwarder:
+    """Registry of forwarding targets, built once and shared by all handlers."""
+
+    def __init__(self, targets: Optional[Dict[str, ForwardingTarget]] = None):
+        self.targets = targets or {}
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "WebhookForwarder":
+        return cls({name: ForwardingTarget(cfg) for name, cfg in load_target_configs(env).items()})
+
+    def has(self, name: str) -> bool:
+        return name in self.targets
+
+    async def forward(self, name: str, payload: Any) -> Dict[str, Any]:
+        target = self.targets.get(name)
+        if target is None:
+            return {"status": "error", "reason": "missing_config"}
+        return await target.send(payload)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: target.snapshot() for name, target in self.targets.items()}
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(t.aclose() for t in self.targets.values()), return_exceptions=True)
@@ -0,0 +1,139 @@
+"""
+Fast ingestion path for webhook bodies.
+
+The raw request body is read once and reused for both HMAC verification and
+JSON parsing (orjson when installed, stdlib ``json`` otherwise). Atlassian
+payloads are wrapped in a ``LazyPayload`` that sanitizes string values only
+when they are read, so converting a payload touches the handful of fields
+``convert_atlassian_payload`` needs instead of copying the whole tree.
+"""
+
+import hashlib
+import hmac
+import json
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Union
+
+from vaal_ai_empire.api.sanitizers import sanitize_context, sanitize_prompt
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(body: Buffer) -> Any:
+    """Parse a JSON body without copying it into an intermediate ``str``."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(bytes(body) if isinstance(body, memoryview) else body)
+
+
+def verify_signature(body: Buffer, secret: str, signature: Optional[str]) -> bool:
+    """Check an ``X-Hub-Signature`` style ``sha256=<hex>`` HMAC over the raw body."""
+    if not signature:
+        return False
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+
+def body_dedupe_key(payload: Mapping, body: Buffer) -> str:
+    """Dedupe key from the event id, timestamp and a digest of the raw body.
+
+    Hashing the buffer avoids ``str(payload)`` over the full parsed tree.
+    """
+    webhook_id = payload.get('webhookEvent', payload.get('id', ''))
+    timestamp = payload.get('timestamp', payload.get('created_at', ''))
+    body_digest = hashlib.sha256(body).hexdigest()
+    return hashlib.sha256(f"{webhook_id}:{timestamp}:{body_digest}".encode()).hexdigest()
+
+
+class LazyPayload(Mapping):
+    """Read-only view over a parsed payload that sanitizes values on access.
+
+    String values are passed through ``sanitize_prompt(strict=False)`` and
+    nested dicts are wrapped in another ``LazyPayload`` the first time they
+    are read, matching what ``sanitize_webhook_payload`` would produce for
+    those keys. Lists and other values are returned unchanged, as before.
+    """
+
+    __slots__ = ("_raw", "_cache")
+
+    def __init__(self, raw: Dict[str, Any]):
+        self._raw = raw
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        return self._raw
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = self._raw[key]
+        if isinstance(value, str):
+            value = sanitize_prompt(value, strict=False)
+        elif isinstance(value, dict):
+            value = LazyPayload(value)
+        self._cache[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully sanitized copy, for callers that need the whole tree."""
+        return sanitize_context(self._raw)
+
+
+def materialize(value: Any) -> Any:
+    """Replace any ``LazyPayload`` views inside a small result tree with plain dicts."""
+    if isinstance(value, LazyPayload):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {k: materialize(v) for k, v in value.items()}
+    return value
+
+
+def convert_atlassian_payload(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    event_type = payload.get('webhookEvent', 'unknown')
+    standard = {
+        "event_type": event_type,
+        "timestamp": payload.get('timestamp', datetime.now(timezone.utc).isoformat()),
+        "source": "atlassian",
+        "data": {}
+    }
+    if 'issue' in payload:
+        standard['data']['issue'] = {
+            "key": payload['issue'].get('key'),
+            "summary": payload['issue'].get('fields', {}).get('summary'),
+            "status": payload['issue'].get('fields', {}).get('status', {}).get('name'),
+            "assignee": payload['issue'].get('fields', {}).get('assignee', {}).get('displayName'),
+            "description": payload['issue'].get('description', payload['issue'].get('fields', {}).get('description'))
+        }
+    if 'comment' in payload:
+        standard['data']['comment'] = {
+            "body": payload['comment'].get('body'),
+            "author": payload['comment'].get('author', {}).get('displayName')
+        }
+    if 'pullRequest' in payload:
+        standard['data']['pull_request'] = {
+            "id": payload['pullRequest'].get('id'),
+            "title": payload['pullRequest'].get('title'),
+            "state": payload['pullRequest'].get('state'),
+            "author": payload['pullRequest'].get('author', {}).get('displayName')
+        }
+    return standard
@@ -3,8 +3,6 @@ Enhanced main application with security, monitoring, distributed state, and Atla
 """
 
 import hashlib
-import hmac
-import json
 import logging
 import os
 import time
@@ -13,7 +11,6 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Union
 
-import httpx
 import redis.asyncio as redis
 from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -23,8 +20,15 @@ from pydantic import BaseModel
 from vaal_ai_empire.api.shared_state import RedisDedupeCache, RedisRateLimiter
 
 from agent.tools.llm_provider import TaskType, get_global_provider, initialize_from_env
-from vaal_ai_empire.api.sanitizers import sanitize_webhook_payload
-from vaal_ai_empire.api.secure_requests import create_ssrf_safe_async_session
+from app.forwarding import WebhookForwarder
+from app.ingest import (
+    LazyPayload,
+    body_dedupe_key,
+    convert_atlassian_payload,
+    loads,
+    materialize,
+    verify_signature,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -103,11 +107,19 @@ class InMemoryRateLimiter:
 dedupe_cache: Union[RedisDedupeCache, InMemoryDedupeCache] = InMemoryDedupeCache()
 rate_limiter: Union[RedisRateLimiter, InMemoryRateLimiter] = InMemoryRateLimiter()
 redis_client: Optional[redis.Redis] = None
+forwarder: Optional[WebhookForwarder] = None
+
+def get_forwarder() -> WebhookForwarder:
+    """Return the shared forwarder, building it from the environment on first use."""
+    global forwarder
+    if forwarder is None:
+        forwarder = WebhookForwarder.from_env()
+    return forwarder
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global dedupe_cache, rate_limiter, redis_client
+    global dedupe_cache, rate_limiter, redis_client, forwarder
 
     logger.info("Starting VAAL AI Empire application")
 
@@ -139,9 +151,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize LLM provider: {e}")
 
+    # Resolve forwarding targets once; each keeps a pooled client for the app lifetime
+    forwarder = WebhookForwarder.from_env()
+    logger.info(f"Webhook forwarding targets: {sorted(forwarder.targets) or 'none'}")
+
     yield
 
     # Shutdown
+    await forwarder.aclose()
+    forwarder = None
     if redis_client:
         await redis_client.close()
     logger.info("Shutting down VAAL AI Empire application")
@@ -265,12 +283,10 @@ async def handle_bitbucket_webhook(
         if not signature:
             raise HTTPException(status_code=403, detail="X-Hub-Signature header is missing")
 
-        expected_signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
-        if not hmac.compare_digest(signature, expected_signature):
+        if not verify_signature(body, secret, signature):
             raise HTTPException(status_code=403, detail="Invalid signature")
 
-    payload = json.loads(body)
-    payload = BitbucketWebhookPayload(**payload)
+    payload = BitbucketWebhookPayload.model_validate(loads(body))
 
     logger.info(f"Received Bitbucket webhook: {payload.build_status}")
 
@@ -279,9 +295,8 @@ async def handle_bitbucket_webhook(
         qwen_analysis = await analyze_with_qwen_3_plus(payload)
 
         # Forward to Jira if Atlassian webhook is configured
-        atlassian_webhook_url = os.getenv("ATLAS_WEBHOOK_URL")
-        if atlassian_webhook_url:
-            await forward_to_jira(atlassian_webhook_url, payload, qwen_analysis)
+        if get_forwarder().has("atlassian"):
+            await forward_to_jira(payload, qwen_analysis)
 
         return {
             "original_response": original_response,
@@ -306,14 +321,18 @@ async def atlassian_webhook(
     rate_limited: bool = Depends(check_rate_limit)
 ):
     try:
-        raw_payload = await request.json()
-        dedupe_key = dedupe_cache.generate_key(raw_payload)
+        # Parse the body buffer once; only fields read by the converter get sanitized
+        body = await request.body()
+        raw_payload = loads(body)
+        if not isinstance(raw_payload, dict):
+            raise HTTPException(status_code=400, detail="Webhook payload must be a JSON object")
+
+        dedupe_key = body_dedupe_key(raw_payload, body)
         if await dedupe_cache.is_duplicate(dedupe_key):
             logger.info(f"Duplicate webhook received: {dedupe_key[:16]}")
             return {"status": "duplicate", "message": "Event already processed"}
 
-        payload = sanitize_webhook_payload(raw_payload)
-        standard_payload = convert_atlassian_payload(payload)
+        standard_payload = materialize(convert_atlassian_payload(LazyPayload(raw_payload)))
         result = await forward_webhook(standard_payload)
 
         return {"status": "success", "message": "Webhook processed", "result": result}
@@ -322,75 +341,27 @@ async def atlassian_webhook(
         logger.error(f"Webhook processing error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-def convert_atlassian_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
-    event_type = payload.get('webhookEvent', 'unknown')
-    standard = {
-        "event_type": event_type,
-        "timestamp": payload.get('timestamp', datetime.now(timezone.utc).isoformat()),
-        "source": "atlassian",
-        "data": {}
-    }
-    if 'issue' in payload:
-        standard['data']['issue'] = {
-            "key": payload['issue'].get('key'),
-            "summary": payload['issue'].get('fields', {}).get('summary'),
-            "status": payload['issue'].get('fields', {}).get('status', {}).get('name'),
-            "assignee": payload['issue'].get('fields', {}).get('assignee', {}).get('displayName'),
-            "description": payload['issue'].get('description', payload['issue'].get('fields', {}).get('description'))
-        }
-    if 'comment' in payload:
-        standard['data']['comment'] = {
-            "body": payload['comment'].get('body'),
-            "author": payload['comment'].get('author', {}).get('displayName')
-        }
-    if 'pullRequest' in payload:
-        standard['data']['pull_request'] = {
-            "id": payload['pullRequest'].get('id'),
-            "title": payload['pullRequest'].get('title'),
-            "state": payload['pullRequest'].get('state'),
-            "author": payload['pullRequest'].get('author', {}).get('displayName')
-        }
-    return standard
-
 async def forward_webhook(payload: Dict[str, Any]) -> Dict[str, Any]:
     event_type = payload.get('event_type', '')
     if 'jira' in event_type.lower() or 'issue' in payload.get('data', {}):
-        target_url = os.getenv('JIRA_BASE_URL')
-        auth = (os.getenv('JIRA_USER_EMAIL'), os.getenv('JIRA_API_TOKEN'))
+        target = "jira"
     elif 'bitbucket' in event_type.lower() or 'pull_request' in payload.get('data', {}):
-        target_url = os.getenv('BITBUCKET_BASE_URL')
-        auth = (os.getenv('BITBUCKET_USERNAME'), os.getenv('BITBUCKET_APP_PASSWORD'))
+        target = "bitbucket"
     else:
         return {"status": "skipped", "reason": "unknown_type"}
 
-    if not target_url: return {"status": "error", "reason": "missing_config"}
+    return await get_forwarder().forward(target, payload)
 
-    try:
-        async with create_ssrf_safe_async_session(timeout=float(os.getenv('WEBHOOK_TIMEOUT', '30'))) as client:
-            response = await client.post(target_url, json=payload, auth=auth)
-            response.raise_for_status()
-            return {"status": "forwarded", "status_code": response.status_code, "target": target_url}
-    except Exception as e:
-        logger.error(f"Error forwarding webhook: {e}")
-        return {"status": "error", "error": str(e)}
-
-async def forward_to_jira(webhook_url: str, payload: Union[BitbucketWebhookPayload, AtlassianWebhookPayload], qwen_analysis: Dict[str, Any]) -> None:
+async def forward_to_jira(payload: Union[BitbucketWebhookPayload, AtlassianWebhookPayload], qwen_analysis: Dict[str, Any]) -> None:
     """Forward enhanced analysis to Jira through Atlassian webhook"""
-    try:
-        enhanced_payload = {
-            "original_payload": payload.dict() if hasattr(payload, 'dict') else payload,
-            "qwen_analysis": qwen_analysis,
-            "enhanced_timestamp": datetime.now(timezone.utc).isoformat()
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(webhook_url, json=enhanced_payload)
-            response.raise_for_status()
-            logger.info(f"Forwarded to Jira: {response.status_code}")
-    except httpx.RequestError as exc:
-        logger.error(f"An error occurred while requesting {exc.request.url!r}: {exc}")
-    except Exception as e:
-        logger.error(f"An unexpected error occurred when forwarding to Jira: {e}")
+    enhanced_payload = {
+        "original_payload": payload.dict() if hasattr(payload, 'dict') else payload,
+        "qwen_analysis": qwen_analysis,
+        "enhanced_timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    result = await get_forwarder().forward("atlassian", enhanced_payload)
+    if result.get("status") == "forwarded":
+        logger.info(f"Forwarded to Jira: {result['status_code']}")
 
 async def handle_build_failure(payload: BitbucketWebhookPayload) -> Dict[str, Any]:
     """Original build failure handling logic"""
@@ -438,6 +409,7 @@ async def bitbucket_integration_status() -> Dict[str, Any]:
         "integration": "active",
         "webhook_configured": os.getenv("ATLAS_WEBHOOK_URL") is not None,
         "atlassian_webhook": "configured" if os.getenv("ATLAS_WEBHOOK_URL") else "not configured",
+        "forwarding": get_forwarder().snapshot(),
         "last_sync": "recent",
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
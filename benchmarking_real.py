@@ -5,14 +5,22 @@ Tests different models and tracks metrics over time
 """
 
 import json
+import math
+import random
+import sqlite3
 import statistics
 import time
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# Throughput must improve by at least this fraction for a concurrency level to count
+SATURATION_GAIN = 0.10
 
 
 @dataclass
@@ -26,6 +34,9 @@ class BenchmarkMetrics:
     tokens_generated: int
     memory_usage_mb: float
     timestamp: str
+    ttft: Optional[float] = None  # time to first token (streaming)
+    tokens_per_sec: Optional[float] = None  # eval_count / eval_duration
+    repetition: int = 0
 
     def to_dict(self):
         return asdict(self)
@@ -44,6 +55,10 @@ class ModelPerformance:
     total_tokens: int
     avg_memory_mb: float
     timestamp: str
+    p50_response_time: float = 0.0
+    p99_response_time: float = 0.0
+    p50_ttft: float = 0.0
+    tokens_per_sec: float = 0.0  # median over runs
 
     def pass_rate(self) -> float:
         return self.passed_tests / self.total_tests if self.total_tests > 0 else 0.0
@@ -52,42 +67,239 @@ class ModelPerformance:
         return asdict(self)
 
 
+@dataclass
+class GenerationResult:
+    """One /api/generate call with client- and server-side timings"""
+    text: str
+    elapsed: float
+    ttft: Optional[float] = None
+    eval_count: int = 0
+    eval_duration: float = 0.0  # seconds
+    prompt_eval_count: int = 0
+    load_duration: float = 0.0  # seconds
+    error: Optional[str] = None
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        return self.eval_count / self.eval_duration if self.eval_duration else None
+
+
+@dataclass
+class BenchmarkCase:
+    """A prompt scored either as generated code or as error analysis"""
+    name: str
+    label: str
+    kind: str  # "code" | "error_analysis"
+    prompt: str
+    expected: List[str] = field(default_factory=list)
+
+
+BENCHMARK_CASES = [
+    BenchmarkCase(
+        "simple_function", "Simple Function Generation", "code",
+        "Create a Python function called add_numbers that takes two parameters and returns their sum. Only code, no explanations.",
+        ["def add_numbers", "return", "+"]
+    ),
+    BenchmarkCase(
+        "class_creation", "Class Generation", "code",
+        "Create a Python class Person with __init__ taking name and age. Only code.",
+        ["class Person", "__init__", "self", "name", "age"]
+    ),
+    BenchmarkCase(
+        "error_handling", "Error Handling Code", "code",
+        "Create a function that reads a file with try/except. Only code.",
+        ["def", "try", "except", "open", "with"]
+    ),
+    BenchmarkCase(
+        "import_error_analysis", "Import Error Analysis", "error_analysis",
+        "ImportError: No module named 'requests'"
+    ),
+    BenchmarkCase(
+        "syntax_error_analysis", "Syntax Error Analysis", "error_analysis",
+        "SyntaxError: invalid syntax at line 10"
+    ),
+    BenchmarkCase(
+        "file_error_analysis", "File Error Analysis", "error_analysis",
+        'Error: File "config.py" not found'
+    ),
+    BenchmarkCase(
+        "list_comprehension", "List Comprehension", "code",
+        "Create a Python function that uses list comprehension to filter even numbers. Only code.",
+        ["def", "return", "[", "for", "if", "%"]
+    ),
+    BenchmarkCase(
+        "decorator", "Decorator Creation", "code",
+        "Create a simple Python decorator that prints function name. Only code.",
+        ["def", "def", "return", "functools"]
+    ),
+]
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile, q in [0, 100]"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def bootstrap_ci(
+    values: Sequence[float],
+    stat: Callable[[Sequence[float]], float] = statistics.median,
+    confidence: float = 0.95,
+    resamples: int = 1000,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval (seeded, so reports are reproducible)"""
+    if len(values) < 2:
+        value = stat(values) if values else 0.0
+        return value, value
+    rng = random.Random(seed)
+    n = len(values)
+    estimates = sorted(stat([values[rng.randrange(n)] for _ in range(n)]) for _ in range(resamples))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Distribution summary with 95% bootstrap CIs for the mean and median"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"n": 0}
+    mean_ci = bootstrap_ci(values, statistics.mean)
+    median_ci = bootstrap_ci(values, statistics.median)
+    return {
+        "n": len(values),
+        "mean": statistics.mean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "max": max(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean_ci95": list(mean_ci),
+        "p50_ci95": list(median_ci),
+    }
+
+
+def find_saturation(levels: List[Dict]) -> Optional[int]:
+    """
+    Concurrency at which throughput stops scaling
+
+    Returns the last level before the first one whose requests/sec fails to
+    beat the best lower level by SATURATION_GAIN, or the highest level tried.
+    """
+    best = None
+    for level in levels:
+        if best and level["requests_per_sec"] < best["requests_per_sec"] * (1 + SATURATION_GAIN):
+            return best["concurrency"]
+        if best is None or level["requests_per_sec"] > best["requests_per_sec"]:
+            best = level
+    return levels[-1]["concurrency"] if levels else None
+
+
 class OllamaBenchmarker:
     """Real benchmarking that actually tests performance"""
 
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        ollama_url: str = "http://localhost:11434",
+        repetitions: int = 5,
+        warmup_runs: int = 1,
+        stream: bool = True,
+        keep_alive: str = "10m",
+        timeout: float = 60,
+        max_connections: int = 8
+    ):
         self.ollama_url = ollama_url
         self.api_url = f"{ollama_url}/api/generate"
-
-    def query_timed(self, model: str, prompt: str, temperature: float = 0.2) -> Tuple[str, float, int]:
-        """Query with timing and token counting"""
-        start_time = time.time()
+        self.repetitions = repetitions
+        self.warmup_runs = warmup_runs
+        self.stream = stream
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.warmup_stats: Dict[str, Dict] = {}
+
+    def generate(self, model: str, prompt: str, temperature: float = 0.2) -> GenerationResult:
+        """Run one generation, recording TTFT (streaming) and Ollama's eval statistics"""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": self.stream,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": temperature},
+        }
+        start = time.perf_counter()
+        ttft = None
+        parts = []
+        final: Dict = {}
 
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": temperature
-                },
-                timeout=60
-            )
-            response.raise_for_status()
-
-            elapsed = time.time() - start_time
-            result_json = response.json()
-            result_text = result_json.get("response", "")
-
-            # Estimate tokens (rough approximation: 1 token ≈ 4 chars)
-            tokens = len(result_text) // 4
-
-            return result_text, elapsed, tokens
-
+            with self.session.post(self.api_url, json=payload, timeout=self.timeout, stream=self.stream) as response:
+                response.raise_for_status()
+                if self.stream:
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        if "error" in data:
+                            raise RuntimeError(data["error"])
+                        chunk = data.get("response", "")
+                        if chunk and ttft is None:
+                            ttft = time.perf_counter() - start
+                        parts.append(chunk)
+                        if data.get("done"):
+                            final = data
+                else:
+                    final = response.json()
+                    parts.append(final.get("response", ""))
         except Exception as e:
-            elapsed = time.time() - start_time
-            return f"Error: {e}", elapsed, 0
+            return GenerationResult(text=f"Error: {e}", elapsed=time.perf_counter() - start, error=str(e))
+
+        return GenerationResult(
+            text="".join(parts),
+            elapsed=time.perf_counter() - start,
+            ttft=ttft,
+            eval_count=final.get("eval_count", 0),
+            eval_duration=final.get("eval_duration", 0) / 1e9,
+            prompt_eval_count=final.get("prompt_eval_count", 0),
+            load_duration=final.get("load_duration", 0) / 1e9,
+        )
+
+    def query_timed(self, model: str, prompt: str, temperature: float = 0.2) -> Tuple[str, float, int]:
+        """Query with timing and token counting"""
+        result = self.generate(model, prompt, temperature)
+        return result.text, result.elapsed, self._token_count(result)
+
+    @staticmethod
+    def _token_count(result: GenerationResult) -> int:
+        if result.error:
+            return 0
+        # Older servers may omit eval_count; fall back to ~4 chars per token
+        return result.eval_count or len(result.text) // 4
+
+    def warmup(self, model: str) -> Dict:
+        """Load the model and prime caches; these runs are excluded from results"""
+        runs = [self.generate(model, "Reply with OK.") for _ in range(self.warmup_runs)]
+        stats = {
+            "runs": len(runs),
+            "cold_start_seconds": runs[0].elapsed if runs else 0.0,
+            "load_duration_seconds": runs[0].load_duration if runs else 0.0,
+            "errors": sum(1 for r in runs if r.error),
+        }
+        self.warmup_stats[model] = stats
+        return stats
 
     def get_memory_usage(self) -> float:
         """Get current memory usage in MB"""
@@ -126,154 +338,159 @@ class OllamaBenchmarker:
 
         return min(score, 1.0)
 
-    def run_code_generation_test(self, model: str, test_name: str, prompt: str, expected: List[str]) -> BenchmarkMetrics:
-        """Run a single code generation test"""
-        mem_before = self.get_memory_usage()
-
-        response, elapsed, tokens = self.query_timed(model, prompt)
-
-        mem_after = self.get_memory_usage()
-        mem_used = mem_after - mem_before
-
-        quality = self.evaluate_code_quality(response, expected)
-        success = quality >= 0.6 and elapsed < 30.0
-
+    def _metrics(self, model: str, test_name: str, result: GenerationResult, quality: float,
+                 success: bool, mem_used: float, repetition: int) -> BenchmarkMetrics:
         return BenchmarkMetrics(
             model=model,
             test_name=test_name,
-            response_time=elapsed,
+            response_time=result.elapsed,
             success=success,
             quality_score=quality,
-            tokens_generated=tokens,
+            tokens_generated=self._token_count(result),
             memory_usage_mb=mem_used,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.utcnow().isoformat(),
+            ttft=result.ttft,
+            tokens_per_sec=result.tokens_per_sec,
+            repetition=repetition
         )
 
-    def run_error_analysis_test(self, model: str, test_name: str, error: str) -> BenchmarkMetrics:
+    def run_code_generation_test(self, model: str, test_name: str, prompt: str, expected: List[str],
+                                 repetition: int = 0) -> BenchmarkMetrics:
+        """Run a single code generation test"""
+        mem_before = self.get_memory_usage()
+        result = self.generate(model, prompt)
+        mem_used = self.get_memory_usage() - mem_before
+
+        quality = self.evaluate_code_quality(result.text, expected)
+        success = quality >= 0.6 and result.elapsed < 30.0
+
+        return self._metrics(model, test_name, result, quality, success, mem_used, repetition)
+
+    def run_error_analysis_test(self, model: str, test_name: str, error: str,
+                                repetition: int = 0) -> BenchmarkMetrics:
         """Run error analysis test"""
         prompt = f"Analyze this error and suggest a fix in 2-3 sentences: {error}"
 
         mem_before = self.get_memory_usage()
-        response, elapsed, tokens = self.query_timed(model, prompt)
-        mem_after = self.get_memory_usage()
+        result = self.generate(model, prompt)
+        mem_used = self.get_memory_usage() - mem_before
 
         # Quality: Should mention key terms
         quality = 0.0
+        response = result.text
         if "fix" in response.lower() or "solution" in response.lower():
             quality += 0.5
         if len(response) > 20:
             quality += 0.3
-        if elapsed < 15.0:
+        if result.elapsed < 15.0:
             quality += 0.2
 
-        success = quality >= 0.5 and elapsed < 30.0
+        success = quality >= 0.5 and result.elapsed < 30.0
 
-        return BenchmarkMetrics(
-            model=model,
-            test_name=test_name,
-            response_time=elapsed,
-            success=success,
-            quality_score=quality,
-            tokens_generated=tokens,
-            memory_usage_mb=mem_after - mem_before,
-            timestamp=datetime.utcnow().isoformat()
-        )
+        return self._metrics(model, test_name, result, quality, success, mem_used, repetition)
 
-    def run_benchmark_suite(self, model: str) -> List[BenchmarkMetrics]:
-        """Run complete benchmark suite"""
+    def run_case(self, model: str, case: BenchmarkCase, repetition: int = 0) -> BenchmarkMetrics:
+        """Run one repetition of a benchmark case"""
+        if case.kind == "error_analysis":
+            return self.run_error_analysis_test(model, case.name, case.prompt, repetition)
+        return self.run_code_generation_test(model, case.name, case.prompt, case.expected, repetition)
+
+    def run_benchmark_suite(self, model: str, cases: Optional[List[BenchmarkCase]] = None) -> List[BenchmarkMetrics]:
+        """Run complete benchmark suite: warmup, then ``repetitions`` runs of every case"""
+        cases = cases or BENCHMARK_CASES
         print(f"\n{'='*70}")
         print(f"Benchmarking: {model}")
         print(f"{'='*70}\n")
 
-        metrics = []
+        if self.warmup_runs:
+            stats = self.warmup(model)
+            print(f"Warmup: {stats['runs']} run(s), cold start {stats['cold_start_seconds']:.2f}s "
+                  f"(model load {stats['load_duration_seconds']:.2f}s)\n")
 
-        # Test 1: Simple function
-        print("Test 1: Simple Function Generation...", end=" ")
-        m = self.run_code_generation_test(
-            model,
-            "simple_function",
-            "Create a Python function called add_numbers that takes two parameters and returns their sum. Only code, no explanations.",
-            ["def add_numbers", "return", "+"]
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 2: Class creation
-        print("Test 2: Class Generation...", end=" ")
-        m = self.run_code_generation_test(
-            model,
-            "class_creation",
-            "Create a Python class Person with __init__ taking name and age. Only code.",
-            ["class Person", "__init__", "self", "name", "age"]
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 3: Error handling
-        print("Test 3: Error Handling Code...", end=" ")
-        m = self.run_code_generation_test(
-            model,
-            "error_handling",
-            "Create a function that reads a file with try/except. Only code.",
-            ["def", "try", "except", "open", "with"]
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 4: Import error analysis
-        print("Test 4: Import Error Analysis...", end=" ")
-        m = self.run_error_analysis_test(
-            model,
-            "import_error_analysis",
-            "ImportError: No module named 'requests'"
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 5: Syntax error analysis
-        print("Test 5: Syntax Error Analysis...", end=" ")
-        m = self.run_error_analysis_test(
-            model,
-            "syntax_error_analysis",
-            "SyntaxError: invalid syntax at line 10"
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 6: File not found analysis
-        print("Test 6: File Error Analysis...", end=" ")
-        m = self.run_error_analysis_test(
-            model,
-            "file_error_analysis",
-            'Error: File "config.py" not found'
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 7: List comprehension
-        print("Test 7: List Comprehension...", end=" ")
-        m = self.run_code_generation_test(
-            model,
-            "list_comprehension",
-            "Create a Python function that uses list comprehension to filter even numbers. Only code.",
-            ["def", "return", "[", "for", "if", "%"]
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
-
-        # Test 8: Decorator
-        print("Test 8: Decorator Creation...", end=" ")
-        m = self.run_code_generation_test(
-            model,
-            "decorator",
-            "Create a simple Python decorator that prints function name. Only code.",
-            ["def", "def", "return", "functools"]
-        )
-        metrics.append(m)
-        print(f"{'✓' if m.success else '✗'} ({m.response_time:.2f}s, Q:{m.quality_score:.2f})")
+        metrics = []
+        for i, case in enumerate(cases, 1):
+            print(f"Test {i}: {case.label}...", end=" ", flush=True)
+            runs = [self.run_case(model, case, rep) for rep in range(self.repetitions)]
+            metrics.extend(runs)
+
+            passed = sum(1 for m in runs if m.success)
+            times = [m.response_time for m in runs]
+            ttfts = [m.ttft for m in runs if m.ttft is not None]
+            rates = [m.tokens_per_sec for m in runs if m.tokens_per_sec]
+            print(
+                f"{'✓' if passed == len(runs) else '✗'} {passed}/{len(runs)} "
+                f"(p50 {percentile(times, 50):.2f}s"
+                + (f", TTFT {percentile(ttfts, 50):.2f}s" if ttfts else "")
+                + (f", {statistics.median(rates):.0f} tok/s" if rates else "")
+                + f", Q:{statistics.mean(m.quality_score for m in runs):.2f})"
+            )
 
         return metrics
 
+    def summarize_cases(self, metrics: List[BenchmarkMetrics]) -> Dict[str, Dict]:
+        """Per-case latency, TTFT and throughput distributions"""
+        by_case: Dict[str, List[BenchmarkMetrics]] = {}
+        for m in metrics:
+            by_case.setdefault(m.test_name, []).append(m)
+        return {
+            name: {
+                "runs": len(runs),
+                "passed": sum(1 for m in runs if m.success),
+                "quality": summarize([m.quality_score for m in runs]),
+                "latency_seconds": summarize([m.response_time for m in runs]),
+                "ttft_seconds": summarize([m.ttft for m in runs]),
+                "tokens_per_sec": summarize([m.tokens_per_sec for m in runs]),
+            }
+            for name, runs in by_case.items()
+        }
+
+    def run_concurrency_sweep(
+        self,
+        model: str,
+        case: Optional[BenchmarkCase] = None,
+        levels: Sequence[int] = (1, 2, 4, 8),
+        requests_per_client: int = 2
+    ) -> Dict:
+        """
+        Measure throughput with 1, 2, 4, ... parallel clients to find saturation
+
+        See find_saturation() for how the saturation point is chosen.
+        """
+        case = case or BENCHMARK_CASES[0]
+        prompt = case.prompt
+        if case.kind == "error_analysis":
+            prompt = f"Analyze this error and suggest a fix in 2-3 sentences: {case.prompt}"
+
+        results = []
+        for level in levels:
+            total = level * requests_per_client
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                runs = list(pool.map(lambda _: self.generate(model, prompt), range(total)))
+            wall = time.perf_counter() - start
+
+            ok = [r for r in runs if not r.error]
+            rate = len(ok) / wall if wall else 0.0
+            results.append({
+                "concurrency": level,
+                "requests": total,
+                "errors": total - len(ok),
+                "wall_seconds": wall,
+                "requests_per_sec": rate,
+                "tokens_per_sec": sum(r.eval_count for r in ok) / wall if wall else 0.0,
+                "latency_seconds": summarize([r.elapsed for r in ok]),
+                "ttft_seconds": summarize([r.ttft for r in ok]),
+            })
+            print(f"  concurrency {level:>2}: {rate:6.2f} req/s, "
+                  f"p50 {percentile([r.elapsed for r in ok], 50):.2f}s, errors {total - len(ok)}")
+
+        return {
+            "case": case.name,
+            "requests_per_client": requests_per_client,
+            "levels": results,
+            "saturation_concurrency": find_saturation(results),
+        }
+
     def calculate_performance(self, metrics: List[BenchmarkMetrics]) -> ModelPerformance:
         """Calculate aggregate performance"""
         if not metrics:
@@ -292,6 +509,8 @@ class OllamaBenchmarker:
 
         response_times = [m.response_time for m in metrics]
         quality_scores = [m.quality_score for m in metrics]
+        ttfts = [m.ttft for m in metrics if m.ttft is not None]
+        rates = [m.tokens_per_sec for m in metrics if m.tokens_per_sec]
 
         return ModelPerformance(
             model=metrics[0].model,
@@ -299,11 +518,15 @@ class OllamaBenchmarker:
             passed_tests=sum(1 for m in metrics if m.success),
             failed_tests=sum(1 for m in metrics if not m.success),
             avg_response_time=statistics.mean(response_times),
-            p95_response_time=statistics.quantiles(response_times, n=20)[18] if len(response_times) > 1 else response_times[0],
+            p95_response_time=percentile(response_times, 95),
             avg_quality_score=statistics.mean(quality_scores),
             total_tokens=sum(m.tokens_generated for m in metrics),
             avg_memory_mb=statistics.mean(m.memory_usage_mb for m in metrics),
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.utcnow().isoformat(),
+            p50_response_time=percentile(response_times, 50),
+            p99_response_time=percentile(response_times, 99),
+            p50_ttft=percentile(ttfts, 50) if ttfts else 0.0,
+            tokens_per_sec=statistics.median(rates) if rates else 0.0
         )
 
     def print_performance_summary(self, perf: ModelPerformance):
@@ -313,7 +536,11 @@ class OllamaBenchmarker:
         print(f"{'='*70}")
         print(f"Tests: {perf.total_tests} total, {perf.passed_tests} passed, {perf.failed_tests} failed")
         print(f"Pass Rate: {perf.pass_rate()*100:.1f}%")
-        print(f"Response Time: {perf.avg_response_time:.2f}s avg, {perf.p95_response_time:.2f}s P95")
+        print(f"Response Time: {perf.p50_response_time:.2f}s P50, {perf.p95_response_time:.2f}s P95, "
+              f"{perf.p99_response_time:.2f}s P99 ({perf.avg_response_time:.2f}s avg)")
+        if perf.p50_ttft:
+            print(f"Time to First Token: {perf.p50_ttft:.2f}s P50")
+        print(f"Throughput: {perf.tokens_per_sec:.1f} tokens/sec (median)")
         print(f"Quality Score: {perf.avg_quality_score:.2f}/1.00")
         print(f"Tokens: {perf.total_tokens} total, {perf.total_tokens/perf.total_tests:.0f} avg/test")
         print(f"Memory: {perf.avg_memory_mb:.1f} MB avg")
@@ -332,8 +559,25 @@ class OllamaBenchmarker:
         print(f"Grade: {grade}")
         print(f"{'='*70}")
 
-    def compare_models(self, models: List[str]) -> Dict:
-        """Compare multiple models"""
+    def benchmark_model(self, model: str, concurrency_levels: Sequence[int] = ()) -> Dict:
+        """Warm up, run the suite and (optionally) a concurrency sweep for one model"""
+        metrics = self.run_benchmark_suite(model)
+        perf = self.calculate_performance(metrics)
+        self.print_performance_summary(perf)
+
+        result = {"metrics": metrics, "performance": perf, "cases": self.summarize_cases(metrics)}
+        if concurrency_levels:
+            print("\nConcurrency sweep:")
+            result["concurrency_sweep"] = self.run_concurrency_sweep(model, levels=concurrency_levels)
+        return result
+
+    def compare_models(self, models: List[str], concurrency_levels: Sequence[int] = ()) -> Dict:
+        """
+        Compare multiple models
+
+        Models run one after another, each after its own warmup, so a model is
+        never measured while another is loading or competing for the GPU.
+        """
         print(f"\n{'='*70}")
         print(f"COMPARING {len(models)} MODELS")
         print(f"{'='*70}\n")
@@ -342,13 +586,7 @@ class OllamaBenchmarker:
 
         for model in models:
             try:
-                metrics = self.run_benchmark_suite(model)
-                perf = self.calculate_performance(metrics)
-                self.print_performance_summary(perf)
-                results[model] = {
-                    "metrics": metrics,
-                    "performance": perf
-                }
+                results[model] = self.benchmark_model(model, concurrency_levels)
             except Exception as e:
                 print(f"\n❌ Error benchmarking {model}: {e}\n")
 
@@ -370,8 +608,8 @@ class OllamaBenchmarker:
             reverse=True
         )
 
-        print(f"{'Model':<20} {'Pass Rate':<12} {'Avg Time':<12} {'Quality':<10} {'Grade'}")
-        print(f"{'-'*70}")
+        print(f"{'Model':<20} {'Pass Rate':<12} {'P50 Time':<12} {'Tok/s':<9} {'Quality':<10} {'Grade'}")
+        print(f"{'-'*76}")
 
         for model, data in sorted_models:
             perf = data["performance"]
@@ -379,42 +617,292 @@ class OllamaBenchmarker:
 
             winner = "🏆" if model == sorted_models[0][0] else "  "
 
-            print(f"{model:<20} {perf.pass_rate()*100:>5.1f}%    {perf.avg_response_time:>6.2f}s    {perf.avg_quality_score:>5.2f}/1.0  {grade}  {winner}")
+            print(f"{model:<20} {perf.pass_rate()*100:>5.1f}%    {perf.p50_response_time:>6.2f}s    "
+                  f"{perf.tokens_per_sec:>6.1f}   {perf.avg_quality_score:>5.2f}/1.0  {grade}  {winner}")
+
+        print(f"{'='*76}")
+
+    def build_report(self, results: Dict) -> Dict:
+        """Machine-readable report; keys are sorted on save so runs diff cleanly"""
+        return {
+            "config": {
+                "ollama_url": self.ollama_url,
+                "repetitions": self.repetitions,
+                "warmup_runs": self.warmup_runs,
+                "stream": self.stream,
+                "keep_alive": self.keep_alive,
+            },
+            "generated_at": datetime.utcnow().isoformat(),
+            "models": {
+                model: {
+                    "performance": data["performance"].to_dict(),
+                    "warmup": self.warmup_stats.get(model, {}),
+                    "cases": data["cases"],
+                    "concurrency_sweep": data.get("concurrency_sweep"),
+                    "metrics": [m.to_dict() for m in data["metrics"]],
+                }
+                for model, data in results.items()
+            },
+        }
+
+
+def save_report(report: Dict, path: Path):
+    """Write a benchmark report as stable, diffable JSON"""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+# ============================================================================
+# Regression detection
+# ============================================================================
+
+def median_abs_deviation(values: Sequence[float]) -> float:
+    """Median absolute deviation from the median"""
+    center = statistics.median(values)
+    return statistics.median(abs(v - center) for v in values)
+
+
+def mann_whitney_u(current: Sequence[float], baseline: Sequence[float]) -> Tuple[float, float]:
+    """
+    One-sided Mann-Whitney U test that ``current`` tends to be larger than ``baseline``
+
+    Returns (U, p-value) using the normal approximation with tie and
+    continuity corrections, which is adequate from ~5 samples per side.
+    """
+    n1, n2 = len(current), len(baseline)
+    ranked = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2 + 1
+        rank_sum += avg_rank * sum(1 for k in range(i, j + 1) if ranked[k][1] == 0)
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
 
-        print(f"{'='*70}")
+
+@dataclass
+class Regression:
+    """A metric that got significantly worse than its rolling baseline"""
+    model: str
+    metric: str
+    baseline_median: float
+    current_median: float
+    change: float  # relative change in the "worse" direction
+    method: str  # "mann-whitney" | "mad"
+    score: float  # p-value for mann-whitney, robust z for mad
+
+    def to_dict(self):
+        return asdict(self)
+
+    def describe(self) -> str:
+        stat = f"p={self.score:.4f}" if self.method == "mann-whitney" else f"z={self.score:.1f}"
+        return (f"{self.model} {self.metric}: {self.baseline_median:.3f} → {self.current_median:.3f} "
+                f"({self.change:+.1%} worse, {self.method} {stat})")
+
+
+class RegressionDetector:
+    """
+    Compare a run against a rolling baseline with robust statistics
+
+    With enough per-request samples on both sides a one-sided Mann-Whitney U
+    test is used; otherwise (e.g. history recorded before samples were kept)
+    the run's summary value is scored against the baseline runs' median/MAD.
+    Either way the median must also move by at least ``min_effect`` so tiny
+    but significant shifts don't fail CI.
+    """
+
+    # metric -> True if larger values are better
+    METRICS = {"response_time": False, "ttft": False, "tokens_per_sec": True}
+
+    def __init__(self, alpha: float = 0.01, min_effect: float = 0.05,
+                 mad_threshold: float = 3.5, min_samples: int = 5):
+        self.alpha = alpha
+        self.min_effect = min_effect
+        self.mad_threshold = mad_threshold
+        self.min_samples = min_samples
+
+    def compare(self, model: str, metric: str, current: Sequence[float],
+                baseline: Sequence[float]) -> Optional[Regression]:
+        current = [v for v in current if v is not None]
+        baseline = [v for v in baseline if v is not None]
+        if not current or len(baseline) < 3:
+            return None
+
+        higher_is_better = self.METRICS[metric]
+        sign = -1 if higher_is_better else 1
+        base_median = statistics.median(baseline)
+        cur_median = statistics.median(current)
+        change = sign * (cur_median - base_median) / base_median if base_median else 0.0
+        if change < self.min_effect:
+            return None
+
+        if len(current) >= self.min_samples and len(baseline) >= self.min_samples:
+            # Test "current is worse": larger latency, or smaller throughput
+            _, p = mann_whitney_u([sign * v for v in current], [sign * v for v in baseline])
+            if p < self.alpha:
+                return Regression(model, metric, base_median, cur_median, change, "mann-whitney", p)
+            return None
+
+        # 1.4826 scales MAD to a standard-deviation estimate for normal data
+        spread = 1.4826 * median_abs_deviation(baseline)
+        z = sign * (cur_median - base_median) / spread if spread else math.inf
+        if z > self.mad_threshold:
+            return Regression(model, metric, base_median, cur_median, change, "mad", z)
+        return None
+
+
+# ============================================================================
+# Progress tracking
+# ============================================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    performance TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_model_timestamp ON runs (model, timestamp);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    test_name TEXT NOT NULL,
+    response_time REAL,
+    ttft REAL,
+    tokens_per_sec REAL,
+    success INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id);
+"""
+
+_PERFORMANCE_FIELDS = {f.name for f in fields(ModelPerformance)}
+
+
+def _performance_from_json(data: str) -> ModelPerformance:
+    return ModelPerformance(**{k: v for k, v in json.loads(data).items() if k in _PERFORMANCE_FIELDS})
 
 
 class ProgressTracker:
-    """Track performance over time"""
-
-    def __init__(self, db_path: Path):
-        self.db_path = Path(db_path)
-        self.db = self._load_db()
-
-    def _load_db(self) -> Dict:
-        """Load history database"""
-        if self.db_path.exists():
-            with open(self.db_path) as f:
-                return json.load(f)
-        return {"benchmarks": []}
-
-    def _save_db(self):
-        """Save history database"""
-        with open(self.db_path, 'w') as f:
-            json.dump(self.db, f, indent=2)
-
-    def add_benchmark(self, perf: ModelPerformance):
-        """Add benchmark result"""
-        self.db["benchmarks"].append(perf.to_dict())
-        self._save_db()
-
-    def get_history(self, model: str) -> List[ModelPerformance]:
-        """Get history for model"""
-        history = []
-        for b in self.db["benchmarks"]:
-            if b["model"] == model:
-                history.append(ModelPerformance(**b))
-        return sorted(history, key=lambda x: x.timestamp)
+    """
+    Track performance over time in an append-only SQLite store
+
+    Runs are indexed by (model, timestamp) and keep their per-request samples
+    so new runs can be tested against a rolling baseline. A legacy JSON
+    history file is imported into ``<name>.db`` next to it on first use.
+    """
+
+    def __init__(self, db_path: Path, baseline_window: int = 10,
+                 detector: Optional[RegressionDetector] = None):
+        db_path = Path(db_path)
+        legacy = None
+        if db_path.suffix == ".json":
+            legacy, db_path = db_path, db_path.with_suffix(".db")
+
+        self.db_path = db_path
+        self.baseline_window = baseline_window
+        self.detector = detector or RegressionDetector()
+        fresh = not db_path.exists()
+        self._conn = sqlite3.connect(str(db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        if fresh and legacy is not None and legacy.exists():
+            self._import_legacy(legacy)
+
+    def _import_legacy(self, path: Path):
+        """Import the old single-file JSON history (summaries only, no samples)"""
+        with open(path) as f:
+            benchmarks = json.load(f).get("benchmarks", [])
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO runs (model, timestamp, performance) VALUES (?, ?, ?)",
+                [(b["model"], b["timestamp"], json.dumps(b)) for b in benchmarks]
+            )
+        print(f"Imported {len(benchmarks)} benchmark(s) from {path} into {self.db_path}")
+
+    def add_benchmark(self, perf: ModelPerformance, metrics: Optional[List[BenchmarkMetrics]] = None) -> int:
+        """Append a benchmark run (and its samples); returns the run id"""
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (model, timestamp, performance) VALUES (?, ?, ?)",
+                (perf.model, perf.timestamp, json.dumps(perf.to_dict()))
+            )
+            run_id = cursor.lastrowid
+            if metrics:
+                self._conn.executemany(
+                    "INSERT INTO samples (run_id, test_name, response_time, ttft, tokens_per_sec, success) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, m.test_name, m.response_time, m.ttft, m.tokens_per_sec, int(m.success))
+                     for m in metrics]
+                )
+        return run_id
+
+    def _recent_runs(self, model: str, limit: int) -> List[sqlite3.Row]:
+        return self._conn.execute(
+            "SELECT id, performance FROM runs WHERE model = ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (model, limit)
+        ).fetchall()
+
+    def get_history(self, model: str, limit: Optional[int] = None) -> List[ModelPerformance]:
+        """Get history for model, oldest first (optionally only the latest ``limit`` runs)"""
+        rows = self._recent_runs(model, -1 if limit is None else limit)
+        return [_performance_from_json(row["performance"]) for row in reversed(rows)]
+
+    def check_regression(self, perf: ModelPerformance,
+                         metrics: Optional[List[BenchmarkMetrics]] = None) -> List[Regression]:
+        """Compare a run (before it is added) with the last ``baseline_window`` runs of its model"""
+        runs = self._recent_runs(perf.model, self.baseline_window)
+        if not runs:
+            return []
+
+        sample_rows = self._conn.execute(
+            f"SELECT run_id, response_time, ttft, tokens_per_sec FROM samples "
+            f"WHERE run_id IN ({','.join('?' * len(runs))})",
+            [row["id"] for row in runs]
+        ).fetchall()
+        sampled_runs = {row["run_id"] for row in sample_rows}
+
+        regressions = []
+        for metric in RegressionDetector.METRICS:
+            if metrics and len(sampled_runs) == len(runs):
+                current = [getattr(m, metric) for m in metrics]
+                baseline = [row[metric] for row in sample_rows]
+            else:
+                current = [self._summary_value(perf, metric)]
+                baseline = [self._summary_value(_performance_from_json(row["performance"]), metric)
+                            for row in runs]
+            regression = self.detector.compare(perf.model, metric, current, baseline)
+            if regression:
+                regressions.append(regression)
+        return regressions
+
+    @staticmethod
+    def _summary_value(perf: ModelPerformance, metric: str) -> Optional[float]:
+        """Run-level value of a metric; zero means "not recorded" (e.g. legacy rows)"""
+        value = {
+            "response_time": perf.p50_response_time or perf.avg_response_time,
+            "ttft": perf.p50_ttft,
+            "tokens_per_sec": perf.tokens_per_sec,
+        }[metric]
+        return value or None
+
+    def close(self):
+        self._conn.close()
 
     def print_progress_report(self, model: str):
         """Print progress report"""
@@ -444,10 +932,11 @@ class ProgressTracker:
             print(f"  Avg Time: {first.avg_response_time:.2f}s → {latest.avg_response_time:.2f}s ({time_change:+.2f}s)")
             print(f"  Quality: {first.avg_quality_score:.2f} → {latest.avg_quality_score:.2f} ({quality_change:+.2f})")
 
-        print(f"\n{'Date':<12} {'Pass Rate':<12} {'Avg Time':<12} {'Quality'}")
-        print(f"{'-'*50}")
+        print(f"\n{'Date':<12} {'Pass Rate':<12} {'Avg Time':<12} {'Tok/s':<9} {'Quality'}")
+        print(f"{'-'*58}")
         for h in history[-10:]:  # Last 10
-            print(f"{h.timestamp[:10]:<12} {h.pass_rate()*100:>5.1f}%    {h.avg_response_time:>6.2f}s    {h.avg_quality_score:>5.2f}")
+            print(f"{h.timestamp[:10]:<12} {h.pass_rate()*100:>5.1f}%    {h.avg_response_time:>6.2f}s    "
+                  f"{h.tokens_per_sec:>6.1f}   {h.avg_quality_score:>5.2f}")
 
         print(f"{'='*70}")
 
@@ -460,9 +949,18 @@ def main():
     parser.add_argument("--models", nargs="+", default=["codellama"], help="Models to benchmark")
     parser.add_argument("--ollama-url", default="http://localhost:11434", help="Ollama URL")
     parser.add_argument("--compare", action="store_true", help="Compare models")
-    parser.add_argument("--track", help="Track progress (path to DB)")
+    parser.add_argument("--track", help="Track progress (path to SQLite DB; a legacy .json is imported)")
     parser.add_argument("--progress-report", help="Show progress for model")
     parser.add_argument("--output", help="Save results to JSON")
+    parser.add_argument("--repetitions", type=int, default=5, help="Measured runs per test case")
+    parser.add_argument("--warmup", type=int, default=1, help="Warmup runs per model (not measured)")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[],
+                        help="Concurrency sweep levels, e.g. --concurrency 1 2 4 8")
+    parser.add_argument("--no-stream", action="store_true", help="Disable streaming (no TTFT)")
+    parser.add_argument("--baseline-window", type=int, default=10,
+                        help="Tracked runs per model forming the regression baseline")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level for regressions")
+    parser.add_argument("--ci", action="store_true", help="Exit non-zero if a regression is detected")
 
     args = parser.parse_args()
 
@@ -475,7 +973,13 @@ def main():
         print("   Please ensure Ollama is running: ollama serve")
         return 1
 
-    benchmarker = OllamaBenchmarker(ollama_url=args.ollama_url)
+    benchmarker = OllamaBenchmarker(
+        ollama_url=args.ollama_url,
+        repetitions=args.repetitions,
+        warmup_runs=args.warmup,
+        stream=not args.no_stream,
+        max_connections=max(args.concurrency or [1])
+    )
 
     # Progress report
     if args.progress_report and args.track:
@@ -483,50 +987,36 @@ def main():
         tracker.print_progress_report(args.progress_report)
         return 0
 
-    # Compare models
+    models = args.models if args.compare else args.models[:1]
     if args.compare:
-        results = benchmarker.compare_models(args.models)
-
-        if args.output:
-            output_data = {}
-            for model, data in results.items():
-                output_data[model] = {
-                    "performance": data["performance"].to_dict(),
-                    "metrics": [m.to_dict() for m in data["metrics"]]
-                }
-
-            with open(args.output, 'w') as f:
-                json.dump(output_data, f, indent=2)
-            print(f"\n💾 Results saved to {args.output}")
-
-        # Track if requested
-        if args.track:
-            tracker = ProgressTracker(Path(args.track))
-            for model, data in results.items():
-                tracker.add_benchmark(data["performance"])
-            print(f"💾 Progress tracked to {args.track}")
-
-    # Single model benchmark
+        results = benchmarker.compare_models(models, args.concurrency)
     else:
-        model = args.models[0]
-        metrics = benchmarker.run_benchmark_suite(model)
-        perf = benchmarker.calculate_performance(metrics)
-        benchmarker.print_performance_summary(perf)
-
-        if args.track:
-            tracker = ProgressTracker(Path(args.track))
-            tracker.add_benchmark(perf)
-            print(f"\n💾 Progress tracked to {args.track}")
-
-        if args.output:
-            output_data = {
-                "performance": perf.to_dict(),
-                "metrics": [m.to_dict() for m in metrics]
-            }
-            with open(args.output, 'w') as f:
-                json.dump(output_data, f, indent=2)
-            print(f"💾 Results saved to {args.output}")
-
+        results = {models[0]: benchmarker.benchmark_model(models[0], args.concurrency)}
+
+    if args.output:
+        save_report(benchmarker.build_report(results), Path(args.output))
+        print(f"\n💾 Results saved to {args.output}")
+
+    # Track if requested
+    regressions = []
+    if args.track:
+        tracker = ProgressTracker(Path(args.track), baseline_window=args.baseline_window,
+                                  detector=RegressionDetector(alpha=args.alpha))
+        for model, data in results.items():
+            regressions.extend(tracker.check_regression(data["performance"], data["metrics"]))
+            tracker.add_benchmark(data["performance"], data["metrics"])
+        tracker.close()
+        print(f"💾 Progress tracked to {tracker.db_path}")
+
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) against the rolling baseline:")
+            for regression in regressions:
+                print(f"  - {regression.describe()}")
+        else:
+            print("✓ No regressions against the rolling baseline")
+
+    if args.ci and regressions:
+        return 1
     return 0
 
 
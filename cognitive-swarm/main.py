@@ -1,20 +1,255 @@
 import asyncio
+import email.utils
 import json
 import logging
 import os
-from typing import Any, Dict
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import aiohttp
+import httpx
 import openlit
 import redis.asyncio as redis
 import yaml
 from openai import AsyncOpenAI
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from redis.exceptions import ResponseError
 
 openlit.init()
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+swarm_backlog = Gauge(
+    "cognitive_swarm_event_backlog",
+    "Events in the stream not yet delivered (lag) or delivered but not acknowledged (pending)",
+    ["state"],
+)
+swarm_missions_inflight = Gauge("cognitive_swarm_missions_inflight", "Missions currently running")
+swarm_mission_seconds = Histogram(
+    "cognitive_swarm_mission_seconds",
+    "Mission latency from dequeue to acknowledgement",
+    buckets=[1, 5, 15, 30, 60, 120, 300, 600, 1200],
+)
+swarm_missions_total = Counter("cognitive_swarm_missions_total", "Missions by outcome", ["outcome"])
+
+
+async def publish_event(
+    redis_client: Any, stream: str, payload: Dict[str, Any], maxlen: Optional[int] = 10000
+) -> str:
+    """
+    Appends an event to the swarm's Redis stream.
+
+    Unlike pub/sub, stream entries persist until a consumer acknowledges them, so events
+    published while the orchestrator is down are processed when it comes back.
+
+    Returns:
+        str: The stream entry id.
+    """
+    return await redis_client.xadd(stream, {"data": json.dumps(payload)}, maxlen=maxlen, approximate=True)
+
+
+def build_step_graph(execution_plan: List[Dict[str, Any]]) -> Dict[int, List[int]]:
+    """
+    Build the dependency graph of an execution plan.
+
+    Each step's optional `depends_on` lists the steps whose results it needs. Steps
+    without `depends_on` are independent, except the final `synthesis_reasoning` step,
+    which depends on every other step unless it declares its own edges. Unknown and
+    self references are dropped; if the edges form a cycle the plan falls back to
+    running strictly in step order.
+
+    Returns:
+        Dict[int, List[int]]: step number -> step numbers it depends on.
+    """
+    steps = sorted(task['step'] for task in execution_plan)
+    known = set(steps)
+    final_step = steps[-1] if steps else None
+    graph: Dict[int, List[int]] = {}
+
+    for task in execution_plan:
+        step = task['step']
+        declared = task.get('depends_on')
+        if declared is None:
+            deps = [s for s in steps if s != step] if (
+                step == final_step and task.get('agent_type') == 'synthesis_reasoning'
+            ) else []
+        else:
+            if not isinstance(declared, list):
+                declared = [declared]
+            deps = []
+            for dep in declared:
+                try:
+                    dep = int(dep)
+                except (TypeError, ValueError):
+                    dep = None
+                if dep is None or dep == step or dep not in known:
+                    logger.warning(f"Step {step}: ignoring invalid dependency {dep!r}")
+                    continue
+                if dep not in deps:
+                    deps.append(dep)
+        graph[step] = deps
+
+    # Kahn's algorithm: any node left unvisited is part of a cycle
+    remaining = {step: len(deps) for step, deps in graph.items()}
+    dependents: Dict[int, List[int]] = {step: [] for step in graph}
+    for step, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(step)
+    ready = [step for step, count in remaining.items() if count == 0]
+    visited = 0
+    while ready:
+        step = ready.pop()
+        visited += 1
+        for child in dependents[step]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+    if visited != len(graph):
+        logger.warning("Execution plan has a dependency cycle; running steps sequentially.")
+        return {step: steps[:i] for i, step in enumerate(steps)}
+    return graph
+
+
+class AsyncTokenBucket:
+    """Token bucket for pacing outbound requests: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SlackOutbox:
+    """
+    Async outbox that coalesces mission reports into Slack webhook messages.
+
+    Reports queued within `window` seconds of the first one are joined into a single
+    message (split if it would exceed Slack's text limit). Posts are paced by a token
+    bucket and `Retry-After` is honoured on 429 responses. `aclose()` sends everything
+    still queued before returning.
+    """
+
+    SEPARATOR = "\n\n"
+    MAX_CHARS = 39000  # Slack truncates `text` at 40,000 characters
+    MAX_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        session_provider: Callable[[], aiohttp.ClientSession],
+        webhook_url: str,
+        window: float = 5.0,
+        rate_per_second: float = 1.0,
+    ):
+        self.session_provider = session_provider
+        self.webhook_url = webhook_url
+        self.window = window
+        self.bucket = AsyncTokenBucket(rate_per_second, capacity=1)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._flush_now = asyncio.Event()
+        self._closing = False
+
+    async def enqueue(self, message: str):
+        """Queues a report for delivery."""
+        if self._closing:
+            logger.warning("Slack outbox is closed; sending report directly.")
+            await self._post(message)
+            return
+        await self._queue.put(message)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def _drain(self) -> List[str]:
+        messages = []
+        while not self._queue.empty():
+            messages.append(self._queue.get_nowait())
+        return messages
+
+    def _batches(self, messages: List[str]) -> List[str]:
+        batches: List[str] = []
+        current = ""
+        for message in messages:
+            message = message[:self.MAX_CHARS]
+            if current and len(current) + len(self.SEPARATOR) + len(message) > self.MAX_CHARS:
+                batches.append(current)
+                current = ""
+            current = f"{current}{self.SEPARATOR}{message}" if current else message
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _run(self):
+        while not self._queue.empty():
+            first = await self._queue.get()
+            try:
+                # aclose() cuts the coalescing window short
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+            messages = [first] + self._drain()
+            for batch in self._batches(messages):
+                await self._post(batch)
+            if len(messages) > 1:
+                logger.info(f"Coalesced {len(messages)} reports into one Slack delivery.")
+
+    async def _post(self, text: str):
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            await self.bucket.acquire()
+            try:
+                async with self.session_provider().post(self.webhook_url, json={"text": text}) as response:
+                    if response.status == 429:
+                        retry_after = self._retry_after(response.headers.get("Retry-After"))
+                        logger.warning(f"Slack rate limited; retrying in {retry_after}s.")
+                        await asyncio.sleep(retry_after)
+                        continue
+                    response.raise_for_status()
+                logger.info("Successfully sent report to Slack.")
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # Caught per post so one bad delivery never kills the outbox worker
+                logger.error(f"Failed to send Slack notification (attempt {attempt}): {e!r}")
+        logger.error("Giving up on Slack notification after retries.")
+
+    @staticmethod
+    def _retry_after(value: Optional[str], default: float = 1.0) -> float:
+        """Parses a Retry-After header given either as seconds or as an HTTP date."""
+        if not value:
+            return default
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return default
+
+    async def aclose(self):
+        """Flushes queued reports immediately and waits for delivery."""
+        self._closing = True
+        self._flush_now.set()
+        if self._worker is not None:
+            await self._worker
+        remaining = self._drain()
+        for batch in self._batches(remaining):
+            await self._post(batch)
+
+
 class CognitiveSwarmOrchestrator:
     """
     Listens for events, uses a Supervisor Agent to create a plan,
@@ -26,13 +261,56 @@ class CognitiveSwarmOrchestrator:
             f"redis://{config['redis']['host']}:{config['redis']['port']}/{config['redis']['db']}",
             decode_responses=True
         )
-        # This client is configured via environment variables for security
-        self.ai_client = AsyncOpenAI(timeout=config['ai_client']['timeout'])
         self.agent_model_map = config['agent_model_map']
+        swarm_config = config.get('swarm', {})
+        redis_config = config['redis']
+        self.max_step_concurrency = swarm_config.get('max_step_concurrency', 4)
+        self.max_inflight_missions = swarm_config.get('max_inflight_missions', 4)
+
+        # One pooled transport sized for the worst case: every mission running every step at once
+        max_llm_connections = self.max_inflight_missions * self.max_step_concurrency
+        self._llm_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_llm_connections,
+                max_keepalive_connections=max_llm_connections,
+                keepalive_expiry=60.0,
+            ),
+            timeout=config['ai_client']['timeout'],
+        )
+        # This client is configured via environment variables for security
+        self.ai_client = AsyncOpenAI(timeout=config['ai_client']['timeout'], http_client=self._llm_http_client)
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._slack_outbox: Optional[SlackOutbox] = None
+
+        # Event intake: Redis Stream consumed through a consumer group
+        self.events_stream = redis_config.get('events_stream') or redis_config['events_channel']
+        self.consumer_group = redis_config.get('consumer_group', 'cognitive-swarm')
+        self.consumer_name = swarm_config.get('consumer_name') or f"{socket.gethostname()}-{os.getpid()}"
+        self.reclaim_idle_ms = int(swarm_config.get('reclaim_idle_seconds', 900) * 1000)
+        self.reclaim_interval = swarm_config.get('reclaim_interval_seconds', 60)
+        self.read_block_ms = int(swarm_config.get('read_block_seconds', 5) * 1000)
+        self._mission_slots = asyncio.Semaphore(self.max_inflight_missions)
+        self._missions: Set[asyncio.Task] = set()
+        self._inflight_ids: Set[str] = set()
+        self._stopping = asyncio.Event()
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Returns the orchestrator's shared aiohttp session, creating it on first use."""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_inflight_missions * 2,
+                limit_per_host=self.max_inflight_missions,
+                ttl_dns_cache=300,
+            )
+            self._http_session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._http_session
 
     async def _send_slack_notification(self, message: str):
-        """Sends a final report to a Slack webhook."""
-        if not self.config['notifications']['slack']['enabled']:
+        """Queues a final report for delivery to a Slack webhook."""
+        slack_config = self.config['notifications']['slack']
+        if not slack_config['enabled']:
             return
 
         webhook_url = os.getenv("SLACK_WEBHOOK_URL")
@@ -40,14 +318,26 @@ class CognitiveSwarmOrchestrator:
             logger.warning("Slack notifications enabled, but SLACK_WEBHOOK_URL is not set.")
             return
 
-        payload = {"text": message}
+        if self._slack_outbox is None:
+            self._slack_outbox = SlackOutbox(
+                self._get_http_session,
+                webhook_url,
+                window=slack_config.get('coalesce_window_seconds', 5),
+                rate_per_second=slack_config.get('rate_per_second', 1),
+            )
+        await self._slack_outbox.enqueue(message)
+
+    async def aclose(self):
+        """Flushes pending Slack reports and closes the shared HTTP session and LLM client."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(webhook_url, json=payload) as response:
-                    response.raise_for_status()
-            logger.info("Successfully sent report to Slack.")
-        except aiohttp.ClientError as e:
-            logger.error(f"Failed to send Slack notification: {e}")
+            if self._slack_outbox is not None:
+                await self._slack_outbox.aclose()
+        finally:
+            try:
+                if self._http_session is not None and not self._http_session.closed:
+                    await self._http_session.close()
+            finally:
+                await self.ai_client.close()
 
     async def _run_supervisor_agent(self, event_payload: Dict[str, Any]) -> Dict[str, Any]:
         """Generates a strategic plan using the Supervisor Agent."""
@@ -66,9 +356,11 @@ class CognitiveSwarmOrchestrator:
 
         Based on this event, generate a JSON object with two keys:
         1. `strategic_question`: A single, high-level question that captures the core strategic importance of this event.
-        2. `execution_plan`: An array of task objects. Each object must have `step` (int), `goal` (str), and `agent_type` (str).
+        2. `execution_plan`: An array of task objects. Each object must have `step` (int), `goal` (str), and `agent_type` (str),
+           and may have `depends_on` (array of step numbers whose results this step needs). Leave `depends_on` empty for
+           steps that can run independently; independent steps run in parallel.
 
-        Ensure the final step is always a `synthesis_reasoning` task. Respond with nothing but the raw JSON.
+        Ensure the final step is always a `synthesis_reasoning` task that depends on the steps it synthesizes. Respond with nothing but the raw JSON.
         """
 
         try:
@@ -94,13 +386,13 @@ class CognitiveSwarmOrchestrator:
 
         logger.info(f"Executing Step {task['step']} ('{task['goal']}') with Agent '{agent_type}' ({model})...")
 
-        # The context provides all prior results to the current agent
+        # The context holds the mission brief plus only the results of this step's dependencies
         prompt = f"""
         You are an AI agent of type '{agent_type}'. Your goal is: "{task['goal']}".
 
-        Here is the full context of the mission so far, including the strategic question and results from previous steps:
+        Here is the mission context: the source event, the strategic question and the results of the steps you depend on:
         ```json
-        {json.dumps(context, indent=2)}
+        {json.dumps(context, separators=(',', ':'))}
         ```
 
         Fulfill your goal. Provide a concise and direct response focusing only on your specific task.
@@ -119,19 +411,79 @@ class CognitiveSwarmOrchestrator:
             logger.error(f"Agent '{agent_type}' failed on Step {task['step']}: {e}")
             return f"ERROR: Agent '{agent_type}' failed. Reason: {e}"
 
-    async def _handle_event(self, event_message: str):
-        """Main workflow for handling a single event from start to finish."""
+    async def _execute_plan(
+        self,
+        execution_plan: List[Dict[str, Any]],
+        event_payload: Dict[str, Any],
+        strategic_question: Any,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Executes the plan as a dependency graph.
+
+        Each step starts as soon as the steps in its `depends_on` have finished, with at
+        most `max_step_concurrency` agents running at once. An agent only sees the results
+        of its own dependencies, not the whole mission so far.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: "step_<n>" -> {"goal", "result", "duration_seconds"}.
+        """
+        graph = build_step_graph(execution_plan)
+        tasks_by_step = {task['step']: task for task in execution_plan}
+        semaphore = asyncio.Semaphore(self.max_step_concurrency)
+        loop = asyncio.get_running_loop()
+        done: Dict[int, asyncio.Future] = {step: loop.create_future() for step in graph}
+        step_results: Dict[str, Dict[str, Any]] = {}
+
+        async def run_step(step: int) -> None:
+            deps = graph[step]
+            task = tasks_by_step[step]
+            started = time.perf_counter()
+            result = None
+            try:
+                if deps:
+                    await asyncio.gather(*(done[dep] for dep in deps))
+                step_context = {
+                    "original_event": event_payload,
+                    "strategic_question": strategic_question,
+                    "dependency_results": {
+                        f"step_{dep}": {
+                            "goal": step_results[f"step_{dep}"]["goal"],
+                            "result": step_results[f"step_{dep}"]["result"],
+                        }
+                        for dep in deps
+                    },
+                }
+                async with semaphore:
+                    started = time.perf_counter()
+                    result = await self._execute_agent_task(task, step_context)
+            except Exception as e:
+                logger.error(f"Step {step} failed: {e}")
+                result = f"ERROR: Step {step} failed. Reason: {e}"
+            finally:
+                step_results[f"step_{step}"] = {
+                    "goal": task.get('goal'),
+                    "result": result,
+                    "duration_seconds": round(time.perf_counter() - started, 3),
+                }
+                # Dependents wait on this future, so it is resolved however the step ends
+                done[step].set_result(None)
+
+        await asyncio.gather(*(run_step(step) for step in sorted(graph)))
+        return {f"step_{step}": step_results[f"step_{step}"] for step in sorted(graph)}
+
+    async def _handle_event(self, event_message: str) -> bool:
+        """Main workflow for handling a single event from start to finish. Returns True if the mission completed."""
         try:
             event_payload = json.loads(event_message)
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON received: {event_message}")
-            return
+            return False
 
         try:
             plan_data = await self._run_supervisor_agent(event_payload)
         except Exception:
             logger.error("Failed to generate a plan. Aborting mission.")
-            return
+            return False
 
         context = {
             "original_event": event_payload,
@@ -140,13 +492,12 @@ class CognitiveSwarmOrchestrator:
             "step_results": {}
         }
 
-        # Execute plan steps sequentially
-        for task in sorted(context["execution_plan"], key=lambda x: x['step']):
-            step_result = await self._execute_agent_task(task, context)
-            context["step_results"][f"step_{task['step']}"] = {
-                "goal": task['goal'],
-                "result": step_result
-            }
+        start = time.perf_counter()
+        context["step_results"] = await self._execute_plan(
+            context["execution_plan"], event_payload, context["strategic_question"]
+        )
+        logger.info(f"Execution plan finished in {time.perf_counter() - start:.2f}s")
+        final_step = max(task['step'] for task in context["execution_plan"])
 
         final_report = f"""
         **Cognitive Swarm Mission Report**
@@ -155,7 +506,7 @@ class CognitiveSwarmOrchestrator:
         --------------------------------------
 
         **Final Analysis & Recommendation:**
-        {context['step_results'][f'step_{len(context["execution_plan"])}']['result']}
+        {context['step_results'][f'step_{final_step}']['result']}
 
         ---
         *Source Event: {context['original_event']['source']} - {context['original_event']['event_type']}*
@@ -167,25 +518,158 @@ class CognitiveSwarmOrchestrator:
         print("--------------------")
 
         await self._send_slack_notification(final_report)
+        return True
+
+    async def _ensure_consumer_group(self):
+        """Creates the stream and consumer group if needed; a new group starts from the oldest entry."""
+        try:
+            await self.redis_client.xgroup_create(self.events_stream, self.consumer_group, id="0", mkstream=True)
+            logger.info(f"Created consumer group '{self.consumer_group}' on stream '{self.events_stream}'.")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _start_mission(self, entry_id: str, fields: Dict[str, Any], reclaimed: bool = False):
+        """Runs one stream entry as a tracked mission. The caller must hold a mission slot."""
+        self._inflight_ids.add(entry_id)
+        task = asyncio.create_task(self._run_mission(entry_id, fields, reclaimed))
+        self._missions.add(task)
+        task.add_done_callback(self._missions.discard)
+
+    async def _run_mission(self, entry_id: str, fields: Dict[str, Any], reclaimed: bool):
+        """Handles an event and acknowledges it once the mission has finished.
+
+        Failed missions are acknowledged too: they have already been logged and retrying
+        would repeat the same LLM calls. Only a crash or shutdown mid-mission leaves the
+        entry pending, to be reclaimed by a live consumer.
+        """
+        started = time.perf_counter()
+        swarm_missions_inflight.inc()
+        try:
+            logger.info(f"{'Reclaimed' if reclaimed else 'Received'} event {entry_id}. Triggering swarm...")
+            try:
+                completed = await self._handle_event(fields.get("data", ""))
+            except Exception as e:
+                logger.exception(f"Mission for event {entry_id} crashed: {e}")
+                completed = False
+            await self.redis_client.xack(self.events_stream, self.consumer_group, entry_id)
+            swarm_missions_total.labels(outcome="completed" if completed else "failed").inc()
+        except asyncio.CancelledError:
+            logger.warning(f"Mission for event {entry_id} interrupted; leaving it pending for reclaim.")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to acknowledge event {entry_id}: {e}")
+        finally:
+            swarm_mission_seconds.observe(time.perf_counter() - started)
+            swarm_missions_inflight.dec()
+            self._inflight_ids.discard(entry_id)
+            self._mission_slots.release()
+
+    async def _reclaim_pending(self) -> int:
+        """Claims entries left pending by crashed consumers for longer than the reclaim idle time.
+
+        Returns:
+            int: Number of missions started from reclaimed entries.
+        """
+        cursor, started = "0-0", 0
+        while not self._stopping.is_set():
+            await self._mission_slots.acquire()
+            try:
+                result = await self.redis_client.xautoclaim(
+                    self.events_stream, self.consumer_group, self.consumer_name,
+                    min_idle_time=self.reclaim_idle_ms, start_id=cursor, count=1,
+                )
+            except Exception:
+                self._mission_slots.release()
+                raise
+            cursor, claimed = result[0], result[1]
+            # Entries deleted (e.g. trimmed) while pending come back without fields
+            claimed = [(entry_id, fields) for entry_id, fields in claimed
+                       if fields and entry_id not in self._inflight_ids]
+            if claimed:
+                entry_id, fields = claimed[0]
+                self._start_mission(entry_id, fields, reclaimed=True)
+                started += 1
+            else:
+                self._mission_slots.release()
+            if cursor in ("0-0", "0"):
+                return started
+        return started
+
+    async def _update_backlog_metrics(self):
+        """Exports the consumer group's lag and pending counts."""
+        for group in await self.redis_client.xinfo_groups(self.events_stream):
+            if group.get("name") == self.consumer_group:
+                swarm_backlog.labels(state="pending").set(group.get("pending") or 0)
+                swarm_backlog.labels(state="lag").set(group.get("lag") or 0)
+
+    async def _maintenance_loop(self):
+        """Periodically reclaims abandoned entries and refreshes backlog metrics."""
+        while not self._stopping.is_set():
+            try:
+                reclaimed = await self._reclaim_pending()
+                if reclaimed:
+                    logger.warning(f"Reclaimed {reclaimed} abandoned event(s).")
+                await self._update_backlog_metrics()
+            except Exception as e:
+                logger.error(f"Error in stream maintenance loop: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.reclaim_interval)
+            except asyncio.TimeoutError:
+                pass
 
     async def listen_for_events(self):
-        """Connects to Redis and listens for events to trigger the swarm."""
-        logger.info("Cognitive Swarm Orchestrator is online. Listening for events...")
-        pubsub = self.redis_client.pubsub()
-        await pubsub.subscribe(self.config['redis']['events_channel'])
+        """
+        Consumes events from the Redis stream and runs at most `max_inflight_missions` at once.
 
+        A new entry is only read when a mission slot is free, so an event storm queues up
+        in Redis instead of spawning unbounded missions. Entries are acknowledged after
+        their mission finishes; entries abandoned by a crashed consumer are reclaimed
+        after `reclaim_idle_seconds`. Returns after `stop()` once in-flight missions drain.
+        """
         while True:
             try:
-                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=60)
-                if message:
-                    logger.info(f"Received event on channel '{message['channel']}'. Triggering swarm...")
-                    # Run handler in the background to not block the listener
-                    asyncio.create_task(self._handle_event(message['data']))
-            except asyncio.TimeoutError:
-                continue
+                await self._ensure_consumer_group()
+                break
             except Exception as e:
-                logger.error(f"Error in event listener loop: {e}")
-                await asyncio.sleep(5) # Avoid rapid-fire errors
+                logger.error(f"Could not create consumer group: {e}")
+                await asyncio.sleep(5)
+
+        logger.info(
+            f"Cognitive Swarm Orchestrator is online as '{self.consumer_name}'. "
+            f"Consuming '{self.events_stream}' with up to {self.max_inflight_missions} missions in flight..."
+        )
+        maintenance = asyncio.create_task(self._maintenance_loop())
+        try:
+            while not self._stopping.is_set():
+                await self._mission_slots.acquire()
+                try:
+                    response = await self.redis_client.xreadgroup(
+                        self.consumer_group, self.consumer_name, {self.events_stream: ">"},
+                        count=1, block=self.read_block_ms,
+                    )
+                except Exception as e:
+                    self._mission_slots.release()
+                    logger.error(f"Error in event listener loop: {e}")
+                    await asyncio.sleep(5)  # Avoid rapid-fire errors
+                    continue
+
+                entries: List[Tuple[str, Dict[str, Any]]] = [
+                    entry for _, stream_entries in (response or []) for entry in stream_entries
+                ]
+                if not entries:
+                    self._mission_slots.release()
+                    continue
+                for entry_id, fields in entries:
+                    self._start_mission(entry_id, fields)
+        finally:
+            maintenance.cancel()
+            if self._missions:
+                await asyncio.gather(*self._missions, return_exceptions=True)
+
+    def stop(self):
+        """Stops reading new events; `listen_for_events` returns once in-flight missions finish."""
+        self._stopping.set()
 
 async def main():
     # Load configuration
@@ -197,16 +681,22 @@ async def main():
         f"redis://{config['redis']['host']}:{config['redis']['port']}/{config['redis']['db']}"
     )
 
+    # Expose mission and backlog metrics
+    start_http_server(config.get('metrics', {}).get('port', 9108))
+
     # Create orchestrator and sensor
     orchestrator = CognitiveSwarmOrchestrator(config)
     github_sensor = GitHubMonitorSensor(config, redis_client)
 
     # Run services concurrently
     logger.info("Starting all services...")
-    await asyncio.gather(
-        orchestrator.listen_for_events(),
-        github_sensor.run()
-    )
+    try:
+        await asyncio.gather(
+            orchestrator.listen_for_events(),
+            github_sensor.run()
+        )
+    finally:
+        await orchestrator.aclose()
 
 if __name__ == "__main__":
     # Ensure required environment variables are set
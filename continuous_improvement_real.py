@@ -5,15 +5,31 @@ Actually analyzes code and generates actionable improvements
 """
 
 import ast
+import functools
+import hashlib
+import itertools
 import json
+import os
 import re
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 import requests
 
+# Directories never descended into while walking the repository
+EXCLUDED_DIRS = {
+    ".git", ".hg", ".svn", "venv", ".venv", "env", "node_modules", "__pycache__",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", "build", "dist",
+    "site-packages", ".improvement_cache",
+}
+
+# Below this many files to analyze, process start-up costs more than it saves
+MIN_FILES_FOR_POOL = 16
+
 
 @dataclass
 class CodeIssue:
@@ -41,210 +57,393 @@ class Improvement:
     implementation: str
 
 
+# ============================================================================
+# Rule framework
+# ============================================================================
+
+# Fields that hold nested statements; walking only these skips every expression subtree
+STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# Node classes that live below statements (expressions and their helpers)
+EXPRESSION_TYPES = (ast.expr, ast.expr_context, ast.keyword, ast.arg, ast.arguments, ast.comprehension,
+                    ast.boolop, ast.operator, ast.unaryop, ast.cmpop, ast.alias, ast.withitem)
+
+
+class FileContext:
+    """Per-file state shared by all rules during one traversal"""
+
+    def __init__(self, file_path: Path, lines: List[str]):
+        self.file = str(file_path)
+        self.lines = lines
+        self.issues: List[CodeIssue] = []
+        # Enclosing nodes of the node being visited, outermost first
+        self.ancestors: List[ast.AST] = []
+
+    def snippet(self, lineno: int) -> str:
+        return self.lines[lineno - 1].strip() if 0 < lineno <= len(self.lines) else ""
+
+    def report(self, lineno: int, severity: str, category: str, issue: str, suggestion: str,
+               snippet: Optional[str] = None):
+        self.issues.append(CodeIssue(
+            file=self.file,
+            line=lineno,
+            severity=severity,
+            category=category,
+            issue=issue,
+            suggestion=suggestion,
+            code_snippet=self.snippet(lineno) if snippet is None else snippet
+        ))
+
+
+class Rule:
+    """
+    Base class for analysis rules
+
+    A rule declares the node types it cares about by defining
+    ``visit_<NodeType>(self, node, ctx)`` handlers. StaticAnalyzer builds one
+    dispatch table from all rules and walks each tree once.
+    """
+
+    def handlers(self) -> Dict[type, Callable]:
+        """Map AST node classes to this rule's bound handlers"""
+        table = {}
+        for name in dir(self):
+            if name.startswith("visit_"):
+                table[getattr(ast, name[len("visit_"):])] = getattr(self, name)
+        return table
+
+
+class EvalExecRule(Rule):
+    """Calls to the eval()/exec() builtins"""
+
+    MESSAGES = {
+        "eval": ("Use of eval() is dangerous", "Use ast.literal_eval() or safer alternatives"),
+        "exec": ("Use of exec() is dangerous", "Refactor to avoid dynamic code execution"),
+    }
+
+    def visit_Call(self, node: ast.Call, ctx: FileContext):
+        if isinstance(node.func, ast.Name) and node.func.id in self.MESSAGES:
+            issue, suggestion = self.MESSAGES[node.func.id]
+            ctx.report(node.lineno, "critical", "security", issue, suggestion)
+
+
+class ShellTrueRule(Rule):
+    """Calls passing shell=True (subprocess and friends)"""
+
+    def visit_Call(self, node: ast.Call, ctx: FileContext):
+        for keyword in node.keywords:
+            if keyword.arg == "shell" and isinstance(keyword.value, ast.Constant) and keyword.value.value is True:
+                ctx.report(node.lineno, "high", "security", "subprocess with shell=True is dangerous",
+                           "Use shell=False and pass args as list")
+
+
+class HardcodedSecretRule(Rule):
+    """String literals assigned to secret-looking names or keyword arguments"""
+
+    SECRET_NAME = re.compile(r"(password|secret|api_key|token)$", re.IGNORECASE)
+
+    def _check(self, name: Optional[str], value: ast.AST, lineno: int, ctx: FileContext):
+        if (name and self.SECRET_NAME.search(name)
+                and isinstance(value, ast.Constant) and isinstance(value.value, str) and value.value):
+            ctx.report(lineno, "high", "security", "Possible hardcoded secret",
+                       "Use environment variables or secret management",
+                       snippet=ctx.snippet(lineno)[:50] + "...")
+
+    @staticmethod
+    def _target_name(target: ast.AST) -> Optional[str]:
+        if isinstance(target, ast.Name):
+            return target.id
+        if isinstance(target, ast.Attribute):
+            return target.attr
+        return None
+
+    def visit_Assign(self, node: ast.Assign, ctx: FileContext):
+        for target in node.targets:
+            self._check(self._target_name(target), node.value, node.lineno, ctx)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign, ctx: FileContext):
+        self._check(self._target_name(node.target), node.value, node.lineno, ctx)
+
+    def visit_keyword(self, node: ast.keyword, ctx: FileContext):
+        self._check(node.arg, node.value, node.value.lineno, ctx)
+
+
+class ListConcatInLoopRule(Rule):
+    """``name += ...`` inside ``for ... in range(...)`` loops"""
+
+    @staticmethod
+    def _is_range_loop(node: ast.AST) -> bool:
+        return (isinstance(node, ast.For) and isinstance(node.iter, ast.Call)
+                and isinstance(node.iter.func, ast.Name) and node.iter.func.id == "range")
+
+    def visit_AugAssign(self, node: ast.AugAssign, ctx: FileContext):
+        if not (isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name)):
+            return
+        # Reported against every enclosing range() loop, as each one repeats the concatenation
+        for loop in ctx.ancestors:
+            if self._is_range_loop(loop):
+                ctx.report(loop.lineno, "medium", "performance", "List concatenation in loop is slow",
+                           "Use list comprehension or append()")
+
+
+class FunctionQualityRule(Rule):
+    """Public functions without docstrings, long bodies and long parameter lists"""
+
+    MAX_BODY = 50
+    MAX_PARAMS = 5
+
+    def visit_FunctionDef(self, node: ast.FunctionDef, ctx: FileContext):
+        if not ast.get_docstring(node) and not node.name.startswith('_'):
+            ctx.report(node.lineno, "low", "quality", f"Function '{node.name}' missing docstring",
+                       "Add docstring to explain function purpose")
+
+        if len(node.body) > self.MAX_BODY:
+            ctx.report(node.lineno, "medium", "quality",
+                       f"Function '{node.name}' is too long ({len(node.body)} lines)",
+                       "Consider breaking into smaller functions")
+
+        if len(node.args.args) > self.MAX_PARAMS:
+            ctx.report(node.lineno, "low", "quality",
+                       f"Function '{node.name}' has too many parameters ({len(node.args.args)})",
+                       "Consider using a config object or kwargs")
+
+
+class BareExceptRule(Rule):
+    """``except:`` clauses without an exception type"""
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler, ctx: FileContext):
+        if node.type is None:
+            ctx.report(node.lineno, "medium", "quality", "Bare except clause catches all exceptions",
+                       "Catch specific exceptions")
+
+
+DEFAULT_RULES = (
+    EvalExecRule,
+    ShellTrueRule,
+    HardcodedSecretRule,
+    ListConcatInLoopRule,
+    FunctionQualityRule,
+    BareExceptRule,
+)
+
+
 class StaticAnalyzer:
     """Real static code analysis"""
 
+    # Bump whenever rules change so cached results are invalidated
+    VERSION = "2"
+
+    def __init__(self, rules: Optional[List[Rule]] = None):
+        self.rules = [rule() for rule in DEFAULT_RULES] if rules is None else list(rules)
+
+        # One dispatch table for every rule: node class -> handlers, in rule order
+        self.dispatch: Dict[type, List] = {}
+        for rule in self.rules:
+            for node_type, handler in rule.handlers().items():
+                self.dispatch.setdefault(node_type, []).append(handler)
+
+        # Without expression-level handlers, expression subtrees never need visiting
+        self.statements_only = not any(issubclass(t, EXPRESSION_TYPES) for t in self.dispatch)
+        self._fields: Dict[type, Tuple[str, ...]] = {}
+
+    @property
+    def rule_classes(self) -> Tuple[type, ...]:
+        """Rule classes in use; worker processes rebuild the analyzer from these"""
+        return tuple(type(rule) for rule in self.rules)
+
+    @property
+    def cache_version(self) -> str:
+        """Cache key for results: VERSION plus the rule set, so other rules never reuse them"""
+        return f"{self.VERSION}:{','.join(rule.__qualname__ for rule in self.rule_classes)}"
+
     def analyze_python_file(self, file_path: Path) -> List[CodeIssue]:
         """Analyze Python file for issues"""
-        issues = []
-
         try:
-            with open(file_path) as f:
-                content = f.read()
-                lines = content.split('\n')
-
-            # Parse AST
-            try:
-                tree = ast.parse(content)
-            except SyntaxError as e:
-                return [CodeIssue(
-                    file=str(file_path),
-                    line=e.lineno or 0,
-                    severity="critical",
-                    category="quality",
-                    issue="Syntax error",
-                    suggestion="Fix syntax error",
-                    code_snippet=lines[e.lineno-1] if e.lineno else ""
-                )]
-
-            # Check for common issues
-            issues.extend(self._check_security(content, lines, file_path))
-            issues.extend(self._check_performance(tree, lines, file_path))
-            issues.extend(self._check_code_quality(tree, lines, file_path))
-
+            return self.analyze_path(file_path)
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
+            return []
 
-        return issues
-
-    def _check_security(self, content: str, lines: List[str], file_path: Path) -> List[CodeIssue]:
-        """Check for security issues"""
-        issues = []
-
-        # Check for eval/exec
-        for i, line in enumerate(lines, 1):
-            if re.search(r'\beval\s*\(', line):
-                issues.append(CodeIssue(
-                    file=str(file_path),
-                    line=i,
-                    severity="critical",
-                    category="security",
-                    issue="Use of eval() is dangerous",
-                    suggestion="Use ast.literal_eval() or safer alternatives",
-                    code_snippet=line.strip()
-                ))
-
-            if re.search(r'\bexec\s*\(', line):
-                issues.append(CodeIssue(
-                    file=str(file_path),
-                    line=i,
-                    severity="critical",
-                    category="security",
-                    issue="Use of exec() is dangerous",
-                    suggestion="Refactor to avoid dynamic code execution",
-                    code_snippet=line.strip()
-                ))
-
-            # Check for shell=True
-            if 'shell=True' in line:
-                issues.append(CodeIssue(
-                    file=str(file_path),
-                    line=i,
-                    severity="high",
-                    category="security",
-                    issue="subprocess with shell=True is dangerous",
-                    suggestion="Use shell=False and pass args as list",
-                    code_snippet=line.strip()
-                ))
-
-            # Check for hardcoded secrets
-            if re.search(r'(password|secret|api_key|token)\s*=\s*["\'][^"\']+["\']', line, re.IGNORECASE):
-                issues.append(CodeIssue(
-                    file=str(file_path),
-                    line=i,
-                    severity="high",
-                    category="security",
-                    issue="Possible hardcoded secret",
-                    suggestion="Use environment variables or secret management",
-                    code_snippet=line.strip()[:50] + "..."
-                ))
-
-        return issues
+    def analyze_path(self, file_path: Path) -> List[CodeIssue]:
+        """Like analyze_python_file, but unreadable files raise instead of returning no issues"""
+        with open(file_path) as f:
+            content = f.read()
+        lines = content.split('\n')
 
-    def _check_performance(self, tree: ast.AST, lines: List[str], file_path: Path) -> List[CodeIssue]:
-        """Check for performance issues"""
-        issues = []
-
-        class PerformanceVisitor(ast.NodeVisitor):
-            def __init__(self, issues_list, lines_list, file_path_obj):
-                self.issues = issues_list
-                self.lines = lines_list
-                self.file_path = file_path_obj
-
-            def visit_For(self, node):
-                # Check for list concatenation in loop
-                if isinstance(node.iter, ast.Call):
-                    if isinstance(node.iter.func, ast.Name) and node.iter.func.id == 'range':
-                        # Look for list += in body
-                        for stmt in ast.walk(node):
-                            if isinstance(stmt, ast.AugAssign) and isinstance(stmt.op, ast.Add):
-                                if isinstance(stmt.target, ast.Name):
-                                    self.issues.append(CodeIssue(
-                                        file=str(self.file_path),
-                                        line=node.lineno,
-                                        severity="medium",
-                                        category="performance",
-                                        issue="List concatenation in loop is slow",
-                                        suggestion="Use list comprehension or append()",
-                                        code_snippet=self.lines[node.lineno-1].strip() if node.lineno <= len(self.lines) else ""
-                                    ))
-
-                self.generic_visit(node)
-
-            def visit_Call(self, node):
-                # Check for inefficient string formatting
-                if isinstance(node.func, ast.Attribute):
-                    if node.func.attr == 'format' and isinstance(node.func.value, ast.Str):
-                        # Old style string formatting
-                        pass  # Could suggest f-strings
-
-                self.generic_visit(node)
-
-        visitor = PerformanceVisitor(issues, lines, file_path)
-        visitor.visit(tree)
+        # Parse AST
+        try:
+            tree = ast.parse(content)
+        except SyntaxError as e:
+            return [CodeIssue(
+                file=str(file_path),
+                line=e.lineno or 0,
+                severity="critical",
+                category="quality",
+                issue="Syntax error",
+                suggestion="Fix syntax error",
+                code_snippet=lines[e.lineno-1] if e.lineno else ""
+            )]
+
+        return self.analyze_tree(tree, lines, file_path)
+
+    def analyze_tree(self, tree: ast.AST, lines: List[str], file_path: Path) -> List[CodeIssue]:
+        """Run every rule over ``tree`` in a single traversal"""
+        ctx = FileContext(file_path, lines)
+        self._walk(tree, ctx)
+        return ctx.issues
+
+    def _child_fields(self, node_type: type) -> Tuple[str, ...]:
+        fields = self._fields.get(node_type)
+        if fields is None:
+            fields = node_type._fields
+            if self.statements_only:
+                fields = tuple(f for f in fields if f in STATEMENT_FIELDS)
+            self._fields[node_type] = fields
+        return fields
+
+    def _walk(self, node: ast.AST, ctx: FileContext):
+        node_type = type(node)
+        handlers = self.dispatch.get(node_type)
+        if handlers:
+            for handler in handlers:
+                handler(node, ctx)
+
+        fields = self._child_fields(node_type)
+        if not fields:
+            return
+
+        ctx.ancestors.append(node)
+        for field in fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self._walk(item, ctx)
+            elif isinstance(value, ast.AST):
+                self._walk(value, ctx)
+        ctx.ancestors.pop()
+
+
+def iter_python_files(root: Path, excluded_dirs: Set[str] = EXCLUDED_DIRS) -> Iterator[Path]:
+    """
+    Walk ``root`` for Python sources, pruning excluded and test directories
+
+    Exclusions are applied to directory names during the walk, so virtualenvs
+    and node_modules are never listed. Test files and directories are skipped
+    based on their path relative to ``root``.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if d not in excluded_dirs and not d.endswith(".egg-info") and "test" not in d
+        )
+        base = Path(dirpath)
+        for name in sorted(filenames):
+            if name.endswith(".py") and "test" not in name:
+                yield base / name
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_analyzer(rule_classes: Tuple[type, ...]) -> StaticAnalyzer:
+    """One analyzer per rule set per worker process"""
+    return StaticAnalyzer(rules=[rule() for rule in rule_classes])
+
+
+def _analyze_file(
+    path: str,
+    known_hash: Optional[str],
+    rule_classes: Tuple[type, ...] = DEFAULT_RULES,
+    analyzer: Optional[StaticAnalyzer] = None
+) -> Tuple[str, Optional[str], Optional[List[dict]]]:
+    """
+    Worker: hash a file and analyze it unless its content matches ``known_hash``
+
+    Pool workers build their analyzer from ``rule_classes`` (which must be
+    importable to pickle); the inline path passes ``analyzer`` directly.
+    Returns (path, sha256, issues); issues is None when the content is unchanged,
+    and sha256 is None when the file could not be read or decoded.
+    """
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if digest == known_hash:
+            return path, digest, None
+        issues = (analyzer or _worker_analyzer(rule_classes)).analyze_path(Path(path))
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return path, None, []
+    return path, digest, [asdict(issue) for issue in issues]
 
-        return issues
 
-    def _check_code_quality(self, tree: ast.AST, lines: List[str], file_path: Path) -> List[CodeIssue]:
-        """Check code quality issues"""
-        issues = []
-
-        class QualityVisitor(ast.NodeVisitor):
-            def __init__(self, issues_list, lines_list, file_path_obj):
-                self.issues = issues_list
-                self.lines = lines_list
-                self.file_path = file_path_obj
-
-            def visit_FunctionDef(self, node):
-                # Check for missing docstring
-                docstring = ast.get_docstring(node)
-                if not docstring and not node.name.startswith('_'):
-                    self.issues.append(CodeIssue(
-                        file=str(self.file_path),
-                        line=node.lineno,
-                        severity="low",
-                        category="quality",
-                        issue=f"Function '{node.name}' missing docstring",
-                        suggestion="Add docstring to explain function purpose",
-                        code_snippet=self.lines[node.lineno-1].strip() if node.lineno <= len(self.lines) else ""
-                    ))
-
-                # Check function length
-                if len(node.body) > 50:
-                    self.issues.append(CodeIssue(
-                        file=str(self.file_path),
-                        line=node.lineno,
-                        severity="medium",
-                        category="quality",
-                        issue=f"Function '{node.name}' is too long ({len(node.body)} lines)",
-                        suggestion="Consider breaking into smaller functions",
-                        code_snippet=self.lines[node.lineno-1].strip() if node.lineno <= len(self.lines) else ""
-                    ))
-
-                # Check parameter count
-                if len(node.args.args) > 5:
-                    self.issues.append(CodeIssue(
-                        file=str(self.file_path),
-                        line=node.lineno,
-                        severity="low",
-                        category="quality",
-                        issue=f"Function '{node.name}' has too many parameters ({len(node.args.args)})",
-                        suggestion="Consider using a config object or kwargs",
-                        code_snippet=self.lines[node.lineno-1].strip() if node.lineno <= len(self.lines) else ""
-                    ))
-
-                self.generic_visit(node)
-
-            def visit_Try(self, node):
-                # Check for bare except
-                for handler in node.handlers:
-                    if handler.type is None:
-                        self.issues.append(CodeIssue(
-                            file=str(self.file_path),
-                            line=handler.lineno,
-                            severity="medium",
-                            category="quality",
-                            issue="Bare except clause catches all exceptions",
-                            suggestion="Catch specific exceptions",
-                            code_snippet=self.lines[handler.lineno-1].strip() if handler.lineno <= len(self.lines) else ""
-                        ))
-
-                self.generic_visit(node)
-
-        visitor = QualityVisitor(issues, lines, file_path)
-        visitor.visit(tree)
+@dataclass
+class ScanStats:
+    """Throughput and cache effectiveness of one codebase scan"""
+    files: int = 0
+    cache_hits: int = 0
+    analyzed: int = 0
+    errors: int = 0
+    workers: int = 1
+    seconds: float = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cache_hits / self.files if self.files else 0.0
+
+
+class AnalysisCache:
+    """
+    On-disk cache of per-file analysis results
+
+    Entries are keyed by path relative to the repository and validated against
+    (mtime, size, analyzer version); when mtime or size changed, the content
+    hash decides whether the file really needs re-analysis.
+    """
+
+    def __init__(self, path: Path, version: Optional[str] = None):
+        self.path = Path(path)
+        self.version = version or StaticAnalyzer.VERSION
+        self.entries: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """Load entries, discarding the cache if unreadable or from another analyzer version"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.version:
+            self.entries = data.get("files", {})
+
+    def lookup(self, key: str, stat: os.stat_result) -> Tuple[Optional[List[dict]], Optional[str]]:
+        """Return (cached issues, None) on a stat match, else (None, known content hash)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, None
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["issues"], None
+        return None, entry["sha256"]
+
+    def store(self, key: str, stat: os.stat_result, digest: str, issues: List[dict]):
+        self.entries[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "issues": issues,
+        }
 
-        return issues
+    def save(self, keep: Set[str]):
+        """Persist entries for ``keep`` (files seen this scan) atomically"""
+        self.entries = {k: v for k, v in self.entries.items() if k in keep}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": self.version, "files": self.entries}, f)
+        os.replace(tmp, self.path)
 
 
 class ImprovementGenerator:
@@ -326,29 +525,100 @@ Be concise and specific."""
 class ContinuousImprover:
     """Main improvement system"""
 
-    def __init__(self, repo_path: Path, ollama_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        repo_path: Path,
+        ollama_url: str = "http://localhost:11434",
+        workers: Optional[int] = None,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+        analyzer: Optional[StaticAnalyzer] = None
+    ):
         self.repo_path = Path(repo_path)
-        self.analyzer = StaticAnalyzer()
+        self.analyzer = analyzer or StaticAnalyzer()
         self.generator = ImprovementGenerator(ollama_url)
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = None
+        if use_cache:
+            self.cache = AnalysisCache(
+                cache_path or self.repo_path / ".improvement_cache" / "analysis.json",
+                version=self.analyzer.cache_version,
+            )
+        self.last_scan_stats = ScanStats()
 
     def analyze_codebase(self) -> List[CodeIssue]:
         """Analyze entire codebase"""
         print("\n🔍 Analyzing codebase...")
+        start = time.perf_counter()
+
+        results: Dict[str, List[dict]] = {}
+        pending: List[Tuple[str, str, os.stat_result, Optional[str]]] = []
+        stats = ScanStats()
+
+        for py_file in iter_python_files(self.repo_path):
+            key = py_file.relative_to(self.repo_path).as_posix()
+            stat = py_file.stat()
+            stats.files += 1
+
+            cached, known_hash = self.cache.lookup(key, stat) if self.cache else (None, None)
+            if cached is not None:
+                results[key] = cached
+                stats.cache_hits += 1
+            else:
+                pending.append((key, str(py_file), stat, known_hash))
+
+        for (key, _, stat, known_hash), (_, digest, issues) in zip(pending, self._analyze_files(pending, stats)):
+            if digest is None:
+                # Failed files are never cached, so they are retried and reported on every scan
+                stats.errors += 1
+                results[key] = issues
+                if self.cache:
+                    self.cache.entries.pop(key, None)
+                continue
+            if issues is None:
+                # Touched but unchanged: refresh the stat key, keep cached issues
+                issues = self.cache.entries[key]["issues"]
+                stats.cache_hits += 1
+            else:
+                stats.analyzed += 1
+            results[key] = issues
+            if self.cache:
+                self.cache.store(key, stat, digest, issues)
+
+        if self.cache:
+            self.cache.save(keep=set(results))
+
+        issues = [
+            CodeIssue(**{**issue, "file": str(self.repo_path / key)})
+            for key in sorted(results)
+            for issue in results[key]
+        ]
+
+        stats.seconds = time.perf_counter() - start
+        self.last_scan_stats = stats
+        print(
+            f"  {stats.files} files in {stats.seconds:.2f}s ({stats.files_per_sec:.0f} files/sec, "
+            f"{stats.workers} workers), cache hits {stats.cache_hits} ({stats.hit_rate:.0%}), "
+            f"analyzed {stats.analyzed}, errors {stats.errors}"
+        )
 
-        issues = []
-        py_files = list(self.repo_path.rglob("*.py"))
+        return issues
 
-        for py_file in py_files:
-            # Skip test files and venv
-            if 'test' in str(py_file) or 'venv' in str(py_file) or '.venv' in str(py_file):
-                continue
+    def _analyze_files(self, pending, stats: ScanStats) -> List[Tuple[str, Optional[str], Optional[List[dict]]]]:
+        """Analyze files in a process pool (inline for small batches), preserving order"""
+        paths = [path for _, path, _, _ in pending]
+        hashes = [known_hash for _, _, _, known_hash in pending]
 
-            print(f"  Analyzing {py_file.name}...", end=" ")
-            file_issues = self.analyzer.analyze_python_file(py_file)
-            issues.extend(file_issues)
-            print(f"({len(file_issues)} issues)")
+        workers = min(self.workers, len(paths))
+        if workers <= 1 or len(paths) < MIN_FILES_FOR_POOL:
+            stats.workers = 1
+            return [_analyze_file(path, known, analyzer=self.analyzer) for path, known in zip(paths, hashes)]
 
-        return issues
+        stats.workers = workers
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rule_sets = itertools.repeat(self.analyzer.rule_classes)
+            return list(pool.map(_analyze_file, paths, hashes, rule_sets, chunksize=chunksize))
 
     def generate_improvements(self, issues: List[CodeIssue], max_improvements: int = 10) -> List[Improvement]:
         """Generate improvement suggestions"""
@@ -459,6 +729,9 @@ def main():
     parser.add_argument("--model", default="codellama", help="Ollama model")
     parser.add_argument("--report", default="improvement_report.md", help="Output report")
     parser.add_argument("--json", help="Save JSON output")
+    parser.add_argument("--workers", type=int, help="Analysis processes (default: CPU count)")
+    parser.add_argument("--cache-path", help="Analysis cache file (default: <repo>/.improvement_cache/analysis.json)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyze every file")
 
     args = parser.parse_args()
 
@@ -470,7 +743,13 @@ def main():
         return 1
 
     # Run improvement cycle
-    improver = ContinuousImprover(Path(args.repo_path), args.ollama_url)
+    improver = ContinuousImprover(
+        Path(args.repo_path),
+        args.ollama_url,
+        workers=args.workers,
+        cache_path=Path(args.cache_path) if args.cache_path else None,
+        use_cache=not args.no_cache
+    )
     results = improver.run_improvement_cycle()
 
     # Save report
@@ -4,6 +4,8 @@ PR Error-Fixing Agent using Ollama
 Production-ready version with proper library structure
 """
 
+import json
+import os
 import re
 import subprocess
 import sys
@@ -21,26 +23,42 @@ from security import SecurityError, SecurityValidator
 class OllamaAgent:
     """Agent that uses Ollama models for code analysis and fixing"""
 
-    def __init__(self, model: str = "codellama", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model: str = "codellama",
+        base_url: str = "http://localhost:11434",
+        keep_alive: Optional[str] = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    ):
         self.model = model
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
+        self.keep_alive = keep_alive
+        # One pooled session so repeated queries reuse the same TCP connection
+        self.session = requests.Session()
 
     def query(self, prompt: str, temperature: float = 0.2) -> str:
-        """Query Ollama with a prompt"""
+        """Query Ollama with a prompt, streaming the response"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {"temperature": temperature},
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": temperature
-                },
-                timeout=120
-            )
-            response.raise_for_status()
-            return response.json()["response"]
+            parts = []
+            with self.session.post(self.api_url, json=payload, timeout=120, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if "error" in data:
+                        raise RuntimeError(data["error"])
+                    parts.append(data.get("response", ""))
+            return "".join(parts)
         except Exception as e:
             print(f"Error querying Ollama: {e}")
             return ""
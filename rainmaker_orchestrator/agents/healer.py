@@ -1,11 +1,17 @@
+import asyncio
+import hashlib
+import inspect
 import json
 import logging
+import os
 import re
 import shlex
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
-from rainmaker_orchestrator.clients.kimi import KimiClient
+from rainmaker_orchestrator.agents.hotfix_cache import HotfixCache, normalize_error
+from rainmaker_orchestrator.clients.kimi import AsyncKimiClient
 from rainmaker_orchestrator.core import RainmakerOrchestrator
+from rainmaker_orchestrator.feedback import estimate_tokens
 
 logger: logging.Logger = logging.getLogger("healer")
 
@@ -24,26 +30,48 @@ class SelfHealingAgent:
         r"eval\(",  # Dynamic code execution
     ]
 
-    def __init__(self, kimi_client: Any = None, orchestrator: Any = None) -> None:
+    def __init__(
+        self,
+        kimi_client: Any = None,
+        orchestrator: Any = None,
+        max_concurrency: Optional[int] = None,
+        hotfix_cache: Optional[HotfixCache] = None,
+    ) -> None:
         """
         Initialize the self-healing agent.
 
         Args:
-            kimi_client: Optional KimiClient instance. If not provided, creates a new one.
+            kimi_client: Optional AsyncKimiClient (or legacy KimiClient) instance. If not provided, creates a new AsyncKimiClient.
             orchestrator: Optional RainmakerOrchestrator instance. If not provided, creates a new one.
+            max_concurrency: Maximum concurrent hotfix generations; defaults to HEALER_MAX_CONCURRENCY (4).
+            hotfix_cache: Optional HotfixCache. If not provided, one is created from HEALER_CACHE_TTL_SECONDS
+                (14400), HEALER_CACHE_MAX_ENTRIES (1024) and HEALER_CACHE_MAX_DISTANCE (3).
         """
         self.kimi_client = kimi_client or self._init_kimi_client()
         self.orchestrator = orchestrator or self._init_orchestrator()
+        self.max_concurrency = max_concurrency or int(os.getenv("HEALER_MAX_CONCURRENCY", "4"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.hotfix_cache = hotfix_cache or HotfixCache(
+            ttl=float(os.getenv("HEALER_CACHE_TTL_SECONDS", "14400")),
+            max_entries=int(os.getenv("HEALER_CACHE_MAX_ENTRIES", "1024")),
+            max_distance=int(os.getenv("HEALER_CACHE_MAX_DISTANCE", "3")),
+        )
         logger.info("Self-Healing Agent initialized")
 
-    def _init_kimi_client(self) -> KimiClient:
+    def _init_kimi_client(self) -> AsyncKimiClient:
         """
-        Initialize a new KimiClient instance.
+        Initialize a new AsyncKimiClient instance.
 
         Returns:
-            KimiClient: A new KimiClient instance
+            AsyncKimiClient: A new pooled async Kimi client
         """
-        return KimiClient()
+        return AsyncKimiClient()
+
+    async def aclose(self) -> None:
+        """Close the Kimi client's pooled connections, if it holds any."""
+        close = getattr(self.kimi_client, "aclose", None)
+        if close is not None:
+            await close()
 
     def _init_orchestrator(self) -> RainmakerOrchestrator:
         """
@@ -133,38 +161,88 @@ class SelfHealingAgent:
         """
         return f"Attempt {attempt + 1} failed:\n{error}\n\nPlease fix and try again."
 
-    def handle_alert(self, alert_payload: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def error_fingerprint(service: str, error_log: str) -> str:
         """
-        Handle an incoming alert and generate a hotfix.
+        Compute a stable fingerprint for a distinct error in a service.
 
-        Receives a Prometheus Alert Manager webhook payload, analyzes the error,
-        and generates an AI-powered hotfix blueprint.
+        Alertmanager's own `fingerprint` is derived from the full label set, so the same
+        exception firing on several instances gets several fingerprints. Hashing the
+        service and normalized error text (timestamps, addresses and ids stripped)
+        instead lets those alerts share one hotfix.
 
-        Args:
-            alert_payload: Dictionary containing alert information:
-                - description: Error description or log
-                - service: Name of the affected service
-                - alerts: List of alerts (optional format)
+        Parameters:
+            service (str): Name of the affected service.
+            error_log (str): Error description or log.
 
         Returns:
-            Dictionary with status and hotfix information:
-            - status: 'hotfix_generated', 'hotfix_failed', 'acknowledged', 'ignored'
-            - blueprint: Generated hotfix code (if successful)
-            - error: Error message (if failed)
+            str: Hex digest identifying the (service, error) pair.
         """
-        # Check for multiple alerts in payload
-        alerts = alert_payload.get('alerts', [])
-        if not alerts and 'description' not in alert_payload and 'service' not in alert_payload:
-            return {"status": "ignored", "reason": "No alerts, description or service in payload"}
+        normalized = normalize_error(error_log)
+        return hashlib.sha256(f"{service}\x00{normalized}".encode()).hexdigest()[:16]
 
-        error_log = alert_payload.get('description')
-        if not error_log:
-            error_log = 'No description provided'
-        service_name = alert_payload.get('service', 'Unknown service')
+    @staticmethod
+    def group_alerts(alert_payload: Dict[str, Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Group the firing alerts of an Alertmanager payload by service and error fingerprint.
 
-        if not alerts:
-            # Handle single alert from direct description
-            prompt = f"""
+        Service is taken from the alert's `service` (or `job`) label, falling back to the
+        payload's `service`; the error log from the `description` (or `summary`) annotation,
+        falling back to the payload's `description`. Resolved alerts are skipped.
+
+        Parameters:
+            alert_payload (Dict[str, Any]): Webhook payload containing an `alerts` list.
+
+        Returns:
+            Dict[Tuple[str, str], Dict[str, Any]]: (service, fingerprint) -> {"service", "error_log", "alerts"}.
+        """
+        default_service = alert_payload.get('service', 'Unknown service')
+        default_log = alert_payload.get('description') or 'No description provided'
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for alert in alert_payload.get('alerts', []):
+            if not isinstance(alert, dict) or alert.get('status') == 'resolved':
+                continue
+            labels = alert.get('labels') or {}
+            annotations = alert.get('annotations') or {}
+            service = labels.get('service') or labels.get('job') or default_service
+            error_log = annotations.get('description') or annotations.get('summary') or default_log
+            key = (service, SelfHealingAgent.error_fingerprint(service, error_log))
+            group = groups.setdefault(key, {"service": service, "error_log": error_log, "alerts": []})
+            group["alerts"].append(alert)
+        return groups
+
+    async def _generate(self, prompt: str) -> Optional[str]:
+        """Call Kimi in hotfix mode, off the event loop when the client is synchronous."""
+        generate = self.kimi_client.generate
+        if inspect.iscoroutinefunction(generate):
+            return await generate(prompt, mode="hotfix")
+        return await asyncio.to_thread(generate, prompt, mode="hotfix")
+
+    async def generate_hotfix(self, service_name: str, error_log: str) -> Dict[str, Any]:
+        """
+        Generate a hotfix blueprint for one error, bounded by the agent's concurrency limit.
+
+        Repeat and near-duplicate errors are answered from the hotfix cache without calling Kimi.
+
+        Parameters:
+            service_name (str): Name of the affected service.
+            error_log (str): Error description or log.
+
+        Returns:
+            Dict[str, Any]: {"status": "hotfix_generated", "blueprint": ..., "cached": bool} (plus "cache_match"
+            on hits) or {"status": "hotfix_failed", "error": ...}.
+        """
+        cached = self.hotfix_cache.get(service_name, error_log)
+        if cached is not None:
+            logger.info(f"Reusing cached hotfix for {service_name} ({cached.match} match)")
+            return {
+                "status": "hotfix_generated",
+                "blueprint": cached.blueprint,
+                "cached": True,
+                "cache_match": cached.match,
+            }
+
+        prompt = f"""
             CRITICAL ALERT in service: {service_name}
             Error Log: {error_log}
 
@@ -174,24 +252,74 @@ class SelfHealingAgent:
             3. Do not refactor unrelated code.
             """
 
+        async with self._semaphore:
             try:
                 # Trigger Kimi with "Hotfix" priority
-                blueprint = self.kimi_client.generate(prompt, mode="hotfix")
+                blueprint = await self._generate(prompt)
 
                 if blueprint is None:
                     logger.error(f"Failed to generate hotfix for {service_name} due to Kimi client error.")
                     return {"status": "hotfix_failed", "error": "Blueprint generation failed"}
 
+                self.hotfix_cache.put(
+                    service_name, error_log, blueprint, tokens=estimate_tokens(prompt) + estimate_tokens(blueprint)
+                )
                 # In a real implementation, this would involve deploying the hotfix
                 logger.info(f"Generated hotfix for {service_name}: {blueprint}")
-                return {"status": "hotfix_generated", "blueprint": blueprint}
+                return {"status": "hotfix_generated", "blueprint": blueprint, "cached": False}
             except Exception as e:
                 logger.exception(f"Exception while handling alert for {service_name}")
                 return {"status": "hotfix_failed", "error": str(e)}
-        else:
-            # Handle multiple alerts (legacy format)
-            return {
-                "status": "acknowledged",
-                "alert_count": len(alerts),
-                "message": "Self-healing protocol initiated for multiple alerts"
+
+    async def handle_alert(self, alert_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle an incoming alert and generate a hotfix.
+
+        Receives a Prometheus Alert Manager webhook payload, analyzes the error,
+        and generates an AI-powered hotfix blueprint. Multi-alert payloads are grouped
+        by service and error fingerprint and one hotfix per group is generated
+        concurrently, at most `max_concurrency` at a time.
+
+        Args:
+            alert_payload: Dictionary containing alert information:
+                - description: Error description or log
+                - service: Name of the affected service
+                - alerts: List of Alertmanager alerts (optional format)
+
+        Returns:
+            Dictionary with status and hotfix information:
+            - status: 'hotfix_generated', 'hotfix_failed', 'processed', 'ignored'
+            - blueprint: Generated hotfix code (single alert, if successful)
+            - error: Error message (single alert, if failed)
+            - alert_count, group_count, results: Per-group outcomes (multi-alert payloads)
+        """
+        # Check for multiple alerts in payload
+        alerts = alert_payload.get('alerts', [])
+        if not alerts and 'description' not in alert_payload and 'service' not in alert_payload:
+            return {"status": "ignored", "reason": "No alerts, description or service in payload"}
+
+        if not alerts:
+            # Handle single alert from direct description
+            error_log = alert_payload.get('description') or 'No description provided'
+            service_name = alert_payload.get('service', 'Unknown service')
+            return await self.generate_hotfix(service_name, error_log)
+
+        groups = self.group_alerts(alert_payload)
+        outcomes = await asyncio.gather(
+            *(self.generate_hotfix(group["service"], group["error_log"]) for group in groups.values())
+        )
+        results: List[Dict[str, Any]] = [
+            {
+                "service": service,
+                "fingerprint": fingerprint,
+                "alert_count": len(group["alerts"]),
+                **outcome,
             }
+            for ((service, fingerprint), group), outcome in zip(groups.items(), outcomes)
+        ]
+        return {
+            "status": "processed",
+            "alert_count": len(alerts),
+            "group_count": len(groups),
+            "results": results,
+        }
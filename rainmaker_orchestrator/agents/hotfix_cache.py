@@ -0,0 +1,232 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge
+
+logger: logging.Logger = logging.getLogger("hotfix_cache")
+
+hotfix_cache_requests = Counter(
+    "rainmaker_hotfix_cache_requests_total", "Hotfix cache lookups by result", ["result"]
+)
+hotfix_cache_saved_tokens = Counter(
+    "rainmaker_hotfix_cache_saved_tokens_total", "Estimated Kimi tokens not spent thanks to cache hits"
+)
+hotfix_cache_entries = Gauge("rainmaker_hotfix_cache_entries", "Blueprints currently cached")
+
+# Volatile tokens that differ between otherwise identical occurrences of an error
+_VOLATILE_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\b"), "<ts>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}\b"), "<date>"),
+    (re.compile(r"\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<time>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<addr>"),
+    (re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b[0-9a-fA-F]{16,}\b"), "<hex>"),
+    (re.compile(r"\b\d{4,}\b"), "<n>"),
+]
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"<\w+>|\w+|[^\w\s]")
+
+SIMHASH_BITS = 64
+_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // _BANDS
+
+
+def normalize_error(error_log: str) -> str:
+    """
+    Strip volatile tokens (timestamps, addresses, UUIDs, IPs, long ids) from an error log.
+
+    Parameters:
+        error_log (str): Raw error description or log.
+
+    Returns:
+        str: Error text with volatile tokens replaced by placeholders and whitespace collapsed.
+    """
+    text = error_log
+    for pattern, placeholder in _VOLATILE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def simhash(text: str, bits: int = SIMHASH_BITS) -> int:
+    """
+    Compute a SimHash over token bigrams of `text`.
+
+    Texts that share most of their bigrams get fingerprints with a small Hamming distance.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    features = [" ".join(tokens[i:i + 2]) for i in range(max(len(tokens) - 1, 1))] if tokens else [""]
+    weights = [0] * bits
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=bits // 8).digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def _bands(value: int) -> List[int]:
+    mask = (1 << _BAND_BITS) - 1
+    return [(value >> (i * _BAND_BITS)) & mask for i in range(_BANDS)]
+
+
+@dataclass
+class CachedHotfix:
+    """A generated blueprint and what it cost to produce."""
+
+    service: str
+    normalized_error: str
+    blueprint: str
+    simhash: int
+    tokens: int
+    expires_at: float
+
+
+@dataclass
+class HotfixLookup:
+    """Result of a cache hit."""
+
+    blueprint: str
+    match: str  # "exact" or "near"
+    distance: int
+    tokens: int
+
+
+class HotfixCache:
+    """
+    TTL + LRU store mapping (service, normalized error) to a generated hotfix blueprint.
+
+    Exact repeats (e.g. Alertmanager re-sending a firing alert every `repeat_interval`)
+    are answered by a dict lookup. Near-duplicates - the same error with a slightly
+    different message - are found through a banded 64-bit SimHash index: fingerprints
+    are split into 4 bands of 16 bits, so any stored error within `max_distance` <= 3
+    bits shares at least one band and is found without scanning the whole cache.
+    """
+
+    def __init__(self, ttl: float = 14400.0, max_entries: int = 1024, max_distance: int = 3) -> None:
+        """
+        Parameters:
+            ttl (float): Seconds a blueprint stays valid.
+            max_entries (int): Maximum cached blueprints; least recently used are evicted.
+            max_distance (int): Maximum SimHash Hamming distance for a near-duplicate hit
+                (0 disables near-duplicate matching).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_distance = min(max_distance, _BANDS - 1)
+        self._entries: "OrderedDict[Tuple[str, str], CachedHotfix]" = OrderedDict()
+        self._bands: Dict[Tuple[str, int, int], Set[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "near_hits": 0, "misses": 0, "saved_tokens": 0}
+
+    @staticmethod
+    def key(service: str, error_log: str) -> Tuple[str, str]:
+        """Return the exact-match key for an error."""
+        return service, normalize_error(error_log)
+
+    def get(self, service: str, error_log: str) -> Optional[HotfixLookup]:
+        """
+        Look up a blueprint for an error.
+
+        Parameters:
+            service (str): Name of the affected service.
+            error_log (str): Raw error description or log.
+
+        Returns:
+            Optional[HotfixLookup]: The cached blueprint, or None on a miss.
+        """
+        key = self.key(service, error_log)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is not None:
+                return self._hit(key, entry, "exact", 0)
+
+            if self.max_distance > 0:
+                fingerprint = simhash(key[1])
+                best: Optional[Tuple[int, Tuple[str, str], CachedHotfix]] = None
+                for index, band in enumerate(_bands(fingerprint)):
+                    for candidate_key in tuple(self._bands.get((service, index, band), ())):
+                        candidate = self._live(candidate_key, now)
+                        if candidate is None:
+                            continue
+                        distance = bin(fingerprint ^ candidate.simhash).count("1")
+                        if distance <= self.max_distance and (best is None or distance < best[0]):
+                            best = (distance, candidate_key, candidate)
+                if best is not None:
+                    return self._hit(best[1], best[2], "near", best[0])
+
+            self._stats["misses"] += 1
+        hotfix_cache_requests.labels(result="miss").inc()
+        return None
+
+    def put(self, service: str, error_log: str, blueprint: str, tokens: int = 0) -> None:
+        """
+        Store a generated blueprint.
+
+        Parameters:
+            service (str): Name of the affected service.
+            error_log (str): Raw error description or log.
+            blueprint (str): Generated hotfix.
+            tokens (int): Estimated tokens spent generating it, credited as savings on each hit.
+        """
+        key = self.key(service, error_log)
+        entry = CachedHotfix(
+            service=service,
+            normalized_error=key[1],
+            blueprint=blueprint,
+            simhash=simhash(key[1]),
+            tokens=tokens,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            for index, band in enumerate(_bands(entry.simhash)):
+                self._bands.setdefault((service, index, band), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            hotfix_cache_entries.set(len(self._entries))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, near-hit, miss, saved-token and entry counters."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def _live(self, key: Tuple[str, str], now: float) -> Optional[CachedHotfix]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now >= entry.expires_at:
+            self._remove(key)
+            hotfix_cache_entries.set(len(self._entries))
+            return None
+        return entry
+
+    def _hit(self, key: Tuple[str, str], entry: CachedHotfix, match: str, distance: int) -> HotfixLookup:
+        self._entries.move_to_end(key)
+        self._stats["hits" if match == "exact" else "near_hits"] += 1
+        self._stats["saved_tokens"] += entry.tokens
+        hotfix_cache_requests.labels(result="hit" if match == "exact" else "near_hit").inc()
+        hotfix_cache_saved_tokens.inc(entry.tokens)
+        return HotfixLookup(blueprint=entry.blueprint, match=match, distance=distance, tokens=entry.tokens)
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for index, band in enumerate(_bands(entry.simhash)):
+            bucket = self._bands.get((entry.service, index, band))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._bands[(entry.service, index, band)]
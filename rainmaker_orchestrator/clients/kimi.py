@@ -1,11 +1,45 @@
 import logging
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from openai import APIError, OpenAI  # type: ignore
+import httpx
+from openai import APIError, AsyncOpenAI, OpenAI  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+HOTFIX_SYSTEM_PROMPT = "You are a senior site reliability engineer. Generate a precise patch for the reported error."
+GENERAL_SYSTEM_PROMPT = "You are Kimi, an expert AI assistant."
+
+
+def _request_kwargs(model: str, prompt: str, mode: str) -> Dict[str, Any]:
+    """Build chat-completion arguments shared by the sync and async clients."""
+    system_prompt = HOTFIX_SYSTEM_PROMPT if mode == "hotfix" else GENERAL_SYSTEM_PROMPT
+    messages: List[Dict[str, str]] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+    return {
+        "model": model,
+        "messages": messages,
+        "temperature": 0.3 if mode == "hotfix" else 0.7,
+        "max_tokens": 1000,
+        "timeout": 30.0,
+    }
+
+
+def _extract_content(response: Any) -> Optional[str]:
+    """Return the first choice's content, or None (with an error log) if the response is empty."""
+    if not response.choices or len(response.choices) == 0:
+        logger.error("Kimi API returned empty choices")
+        return None
+
+    if not response.choices[0].message.content:
+        logger.error("Kimi API returned empty content")
+        return None
+
+    return str(response.choices[0].message.content)
+
+
 class KimiClient:
     """
     API wrapper for Kimi model, using an OpenAI-compatible client.
@@ -29,31 +63,8 @@ class KimiClient:
             Generated content as a string, or None if generation fails
         """
         try:
-            system_prompt = "You are Kimi, an expert AI assistant."
-            if mode == "hotfix":
-                system_prompt = "You are a senior site reliability engineer. Generate a precise patch for the reported error."
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3 if mode == "hotfix" else 0.7,
-                max_tokens=1000,
-                timeout=30.0
-            )
-
-            # Validate response structure
-            if not response.choices or len(response.choices) == 0:
-                logger.error("Kimi API returned empty choices")
-                return None
-
-            if not response.choices[0].message.content:
-                logger.error("Kimi API returned empty content")
-                return None
-
-            return str(response.choices[0].message.content)
+            response = self.client.chat.completions.create(**_request_kwargs(self.model, prompt, mode))
+            return _extract_content(response)
         except APIError as e:
             logger.exception(f"API error during Kimi API call: {e!r}")
             return None
@@ -74,3 +85,69 @@ class KimiClient:
         except Exception as e:
             logger.error(f"Kimi health check failed: {e!r}")
             return False
+
+
+class AsyncKimiClient:
+    """
+    Async API wrapper for the Kimi model, using AsyncOpenAI over a pooled httpx transport.
+
+    One client is meant to be shared for the lifetime of the process so concurrent
+    hotfix generations reuse keep-alive connections instead of blocking a worker each.
+    """
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+    ) -> None:
+        limits = httpx.Limits(
+            max_connections=max_connections or int(os.getenv("KIMI_MAX_CONNECTIONS", "10")),
+            max_keepalive_connections=max_keepalive or int(os.getenv("KIMI_MAX_KEEPALIVE", "5")),
+            keepalive_expiry=60.0,
+        )
+        self._http_client = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(30.0, connect=10.0))
+        self.client = AsyncOpenAI(
+            base_url=os.getenv("KIMI_API_BASE", "http://kimi-linear:8000/v1"),
+            api_key=api_key or os.getenv("KIMI_API_KEY", "EMPTY"),
+            http_client=self._http_client,
+        )
+        self.model = os.getenv("KIMI_MODEL", "moonshot-v1-8k")
+
+    async def generate(self, prompt: str, mode: str = "general") -> Optional[str]:
+        """
+        Generates content using the Kimi model without blocking the event loop.
+
+        Args:
+            prompt: The prompt to send to the model
+            mode: The generation mode ('general' or 'hotfix')
+
+        Returns:
+            Generated content as a string, or None if generation fails
+        """
+        try:
+            response = await self.client.chat.completions.create(**_request_kwargs(self.model, prompt, mode))
+            return _extract_content(response)
+        except APIError as e:
+            logger.exception(f"API error during Kimi API call: {e!r}")
+            return None
+        except Exception as e:
+            logger.exception(f"Unexpected error during Kimi API call: {e!r}")
+            return None
+
+    async def health_check(self) -> bool:
+        """
+        Performs a health check on the Kimi API.
+
+        Returns:
+            True if the API is healthy, False otherwise
+        """
+        try:
+            await self.client.models.list()
+            return True
+        except Exception as e:
+            logger.error(f"Kimi health check failed: {e!r}")
+            return False
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP transport."""
+        await self.client.close()
@@ -19,15 +19,32 @@ class ConfigManager:
             config_file (str): Path to a dotenv file to load environment variables from (default ".env").
         """
         self.config_file: str = config_file
-        # Load .env if it exists (for local development only)
-        if os.path.exists(config_file):
+        self._load_file()
+
+    def _load_file(self, override: bool = False) -> None:
+        """
+        Load the dotenv file into the environment if it exists (for local development only).
+
+        Parameters:
+            override (bool): Whether values from the file replace variables that are already set.
+        """
+        if os.path.exists(self.config_file):
             try:
                 from dotenv import load_dotenv
-                load_dotenv(config_file)
-                logger.info(f"Configuration loaded from {config_file}")
+                load_dotenv(self.config_file, override=override)
+                logger.info(f"Configuration loaded from {self.config_file}")
             except ImportError:
                 logger.warning("python-dotenv not available, using environment variables only")
 
+    def reload(self) -> None:
+        """
+        Re-read the dotenv file, letting its values replace previously loaded ones.
+
+        Components that cache resolved configuration (such as the judge client)
+        should be reloaded after calling this.
+        """
+        self._load_file(override=True)
+
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
         Retrieve a configuration value from the environment by key.
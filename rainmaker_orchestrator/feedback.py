@@ -0,0 +1,205 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+logger: logging.Logger = logging.getLogger("feedback")
+
+try:
+    import tiktoken  # type: ignore
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+
+    def estimate_tokens(text: str) -> int:
+        """Count tokens with tiktoken's cl100k_base encoding."""
+        return len(_ENCODING.encode(text))
+
+except Exception:  # tiktoken missing or its encoding data unavailable offline
+
+    def estimate_tokens(text: str) -> int:
+        """Approximate token count (~4 characters per token) when tiktoken is unavailable."""
+        return (len(text) + 3) // 4
+
+
+_FRAME_RE = re.compile(r'^\s*File "(?P<file>[^"]+)", line (?P<line>\d+), in (?P<func>.+)$')
+_EXCEPTION_RE = re.compile(r"^(?:[\w.]+)(?:Error|Exception|Exit|Interrupt|Warning)\b.*$|^[\w.]+:\s.+$")
+
+
+@dataclass
+class Frame:
+    location: str
+    source: Optional[str] = None
+
+    def render(self) -> str:
+        return f"{self.location}\n    {self.source}" if self.source else self.location
+
+
+def parse_traceback(stderr: str) -> tuple:
+    """
+    Split Python stderr into traceback frames and the final exception line.
+
+    Returns:
+        tuple: (frames, exception_line). `frames` is empty when stderr holds no traceback;
+        `exception_line` falls back to the last non-empty line.
+    """
+    lines = stderr.splitlines()
+    frames: List[Frame] = []
+    exception_line = ""
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if _FRAME_RE.match(line):
+            source = None
+            if i + 1 < len(lines) and lines[i + 1].startswith("    ") and not _FRAME_RE.match(lines[i + 1]):
+                source = lines[i + 1].strip()
+                i += 1
+            frames.append(Frame(location=line.strip(), source=source))
+        i += 1
+
+    fallback = ""
+    for line in reversed(lines):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("^") or _FRAME_RE.match(line):
+            continue
+        if _EXCEPTION_RE.match(stripped):
+            exception_line = stripped
+            break
+        fallback = fallback or stripped
+    return frames, exception_line or fallback
+
+
+def compact_error(stderr: str, max_frames: int = 5, max_tail_lines: int = 10) -> str:
+    """
+    Reduce an execution error to its essentials.
+
+    Consecutive repeated frames (deep recursion) collapse into one frame plus a repeat
+    count, only the last `max_frames` frames are kept, and the exception line is always
+    preserved. Non-traceback stderr is cut to its last `max_tail_lines` lines.
+
+    Parameters:
+        stderr (str): Raw stderr from the failed run.
+        max_frames (int): Number of innermost frames to keep.
+        max_tail_lines (int): Lines kept when stderr contains no traceback.
+
+    Returns:
+        str: Compacted error text.
+    """
+    frames, exception_line = parse_traceback(stderr)
+    if not frames:
+        tail = [line for line in stderr.splitlines() if line.strip()][-max_tail_lines:]
+        return "\n".join(tail)
+
+    deduped: List[str] = []
+    repeats = 0
+    previous: Optional[str] = None
+    for frame in frames:
+        rendered = frame.render()
+        if rendered == previous:
+            repeats += 1
+            continue
+        if repeats:
+            deduped.append(f"  [Previous frame repeated {repeats} more times]")
+            repeats = 0
+        deduped.append(rendered)
+        previous = rendered
+    if repeats:
+        deduped.append(f"  [Previous frame repeated {repeats} more times]")
+
+    kept = deduped[-max_frames:]
+    omitted = len(deduped) - len(kept)
+    parts = ["Traceback (most recent call last):"]
+    if omitted:
+        parts.append(f"  ... {omitted} earlier frames omitted ...")
+    parts.extend(kept)
+    parts.append(exception_line)
+    return "\n".join(parts)
+
+
+@dataclass
+class Attempt:
+    number: int
+    kind: str
+    detail: str
+    summary: str
+
+
+class FeedbackCompactor:
+    """
+    Builds bounded retry prompts for the self-healing loop.
+
+    The latest failure is included as a compacted traceback; earlier failures are folded
+    into a one-line-per-attempt digest of fixed maximum size. The feedback appended to the
+    base context never exceeds `token_budget` tokens, so the prompt stays roughly constant
+    in size no matter how many retries happen or how large the tracebacks are.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        max_frames: int = 5,
+        digest_chars: int = 600,
+        summary_chars: int = 160,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        self.token_budget = token_budget
+        self.max_frames = max_frames
+        self.digest_chars = digest_chars
+        self.summary_chars = summary_chars
+        self.count_tokens = count_tokens
+        self.attempts: List[Attempt] = []
+
+    def add_attempt(self, kind: str, error: str) -> None:
+        """
+        Record a failed attempt.
+
+        Parameters:
+            kind (str): Failure label, e.g. "Execution Error" or "JSON Parse Error".
+            error (str): Raw error text (stderr or exception message).
+        """
+        detail = compact_error(error, max_frames=self.max_frames)
+        _, exception_line = parse_traceback(error)
+        summary = (exception_line or "Unknown error")[: self.summary_chars]
+        self.attempts.append(Attempt(len(self.attempts) + 1, kind, detail, summary))
+
+    def _digest(self) -> str:
+        lines = [f"Attempt {a.number} - {a.kind}: {a.summary}" for a in self.attempts[:-1]]
+        digest = "\n".join(lines)
+        if len(digest) > self.digest_chars:
+            # Keep the most recent summaries; older ones are the least useful
+            digest = "..." + digest[-(self.digest_chars - 3):]
+            digest = digest[digest.find("\n") + 1:] if "\n" in digest else digest
+        return digest
+
+    def _truncate_to_budget(self, text: str, budget: int) -> str:
+        if budget <= 0:
+            return ""
+        if self.count_tokens(text) <= budget:
+            return text
+        # Keep the tail: the exception line and innermost frames matter most
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.count_tokens("..." + text[mid:]) <= budget:
+                hi = mid
+            else:
+                lo = mid + 1
+        return "..." + text[lo:]
+
+    def feedback(self) -> str:
+        """Return the compacted feedback block for all recorded attempts, within the token budget."""
+        if not self.attempts:
+            return ""
+        latest = self.attempts[-1]
+        latest_block = f"Attempt {latest.number} - {latest.kind}:\n{latest.detail}"
+        digest = self._digest()
+        digest_block = f"Earlier attempts:\n{digest}" if digest else ""
+
+        latest_block = self._truncate_to_budget(latest_block, self.token_budget)
+        remaining = self.token_budget - self.count_tokens(latest_block)
+        digest_block = self._truncate_to_budget(digest_block, remaining - 2) if digest_block else ""
+        return "\n\n".join(block for block in (digest_block, latest_block) if block)
+
+    def render(self, base_context: str) -> str:
+        """Return the base context followed by the bounded feedback block."""
+        feedback = self.feedback()
+        return f"{base_context}\n\n{feedback}" if feedback else base_context
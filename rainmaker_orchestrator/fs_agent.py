@@ -1,24 +1,58 @@
+import os
 import subprocess
-from typing import Dict, Any
+from typing import Any, Dict, Optional
+
+from rainmaker_orchestrator.sandbox import ExecutionLimits, SandboxExecutor
+
 
 class FileSystemAgent:
     """Agent for interacting with the file system and executing scripts."""
 
-    def __init__(self, workspace_path: str):
+    def __init__(
+        self,
+        workspace_path: str,
+        limits: Optional[ExecutionLimits] = None,
+        max_concurrency: int = 4,
+    ):
         self.workspace_path = workspace_path
+        self.executor = SandboxExecutor(workspace_path, limits=limits, max_concurrency=max_concurrency)
+
+    def resolve_path(self, filename: str) -> str:
+        """Resolve a filename inside the workspace, rejecting paths that escape it."""
+        root = os.path.realpath(self.workspace_path)
+        path = os.path.realpath(os.path.join(root, filename))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"Path escapes workspace: {filename}")
+        return path
 
     def write_file(self, filename: str, content: str) -> None:
-        """Write content to a file."""
-        with open(filename, 'w') as f:
+        """Write content to a file in the workspace."""
+        path = self.resolve_path(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
             f.write(content)
 
     def execute_script(self, filename: str) -> Dict[str, Any]:
-        """Execute a Python script and return the result."""
+        """Execute a workspace Python script synchronously and return the result."""
         try:
-            result = subprocess.run(['python3', filename], capture_output=True, text=True)
+            result = subprocess.run(
+                ['python3', self.resolve_path(filename)],
+                capture_output=True,
+                text=True,
+                timeout=self.executor.limits.wall_clock_seconds,
+            )
             if result.returncode == 0:
                 return {"status": "success", "stdout": result.stdout}
             else:
                 return {"status": "error", "stderr": result.stderr}
         except Exception as e:
             return {"status": "error", "stderr": str(e)}
+
+    async def execute_script_async(self, filename: str, task_id: str = "task") -> Dict[str, Any]:
+        """Execute a workspace script in an isolated, resource-limited sandbox without blocking the event loop."""
+        try:
+            with open(self.resolve_path(filename)) as f:
+                code = f.read()
+        except (OSError, ValueError) as e:
+            return {"status": "error", "stderr": str(e)}
+        return await self.executor.run_code(code, script_name=filename, task_id=task_id)
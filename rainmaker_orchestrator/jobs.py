@@ -0,0 +1,409 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger: logging.Logger = logging.getLogger("jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+job_queue_depth = Gauge("rainmaker_job_queue_depth", "Jobs waiting to run", ["kind"])
+job_wait_seconds = Histogram(
+    "rainmaker_job_wait_seconds",
+    "Time from enqueue to start",
+    ["kind"],
+    buckets=[0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0],
+)
+job_run_seconds = Histogram(
+    "rainmaker_job_run_seconds",
+    "Job execution time",
+    ["kind"],
+    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+)
+jobs_total = Counter("rainmaker_jobs_total", "Jobs by outcome", ["kind", "status"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+@dataclass
+class Job:
+    """A persisted unit of background work."""
+
+    id: str
+    kind: str
+    idempotency_key: Optional[str]
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"],
+            kind=row["kind"],
+            idempotency_key=row["idempotency_key"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public view of the job, as returned by `GET /jobs/{id}`."""
+        wait = (self.started_at - self.created_at) if self.started_at else None
+        run = (self.finished_at - self.started_at) if self.finished_at and self.started_at else None
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_seconds": round(wait, 3) if wait is not None else None,
+            "run_seconds": round(run, 3) if run is not None else None,
+        }
+
+
+class JobStore:
+    """
+    SQLite-backed persistent job queue.
+
+    Jobs survive restarts: anything left `running` by a crashed process is put back
+    on the queue by `recover()`. Writes are serialized with a lock so the store can be
+    driven from worker threads via `asyncio.to_thread`.
+    """
+
+    def __init__(self, path: str = "jobs.db", idempotency_ttl: float = 3600.0) -> None:
+        """
+        Open (and create if needed) the job database.
+
+        Parameters:
+            path (str): SQLite file path, or ":memory:" for an ephemeral queue.
+            idempotency_ttl (float): Seconds a finished job keeps its idempotency key;
+                a repeat enqueue within this window returns the existing job.
+        """
+        self.path = path
+        self.idempotency_ttl = idempotency_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> Tuple[Job, bool]:
+        """
+        Add a job unless an equivalent one is active or recently finished.
+
+        Parameters:
+            kind (str): Handler name.
+            payload (Dict[str, Any]): JSON-serializable job input.
+            idempotency_key (Optional[str]): Deduplication key (e.g. "hubspot:<objectId>").
+
+        Returns:
+            Tuple[Job, bool]: The job and whether it was newly created.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if idempotency_key is not None:
+                    row = self._conn.execute(
+                        "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                    ).fetchone()
+                    if row is not None:
+                        existing = Job.from_row(row)
+                        active = existing.status in (QUEUED, RUNNING)
+                        if active or (existing.finished_at or 0) > now - self.idempotency_ttl:
+                            self._conn.execute("COMMIT")
+                            return existing, False
+                        # Expired: release the key so a fresh run can claim it
+                        self._conn.execute("UPDATE jobs SET idempotency_key = NULL WHERE id = ?", (existing.id,))
+
+                job_id = uuid.uuid4().hex
+                self._conn.execute(
+                    "INSERT INTO jobs (id, kind, idempotency_key, payload, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, idempotency_key, json.dumps(payload), QUEUED, now),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = self.get(job_id)
+        assert job is not None
+        return job, True
+
+    def claim(self) -> Optional[Job]:
+        """Atomically move the oldest queued job to `running` and return it."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (RUNNING, now, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """Record a terminal status for a job."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+
+    def retry(self, job_id: str, error: str) -> None:
+        """Put a failed job back on the queue, keeping its original position."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, started_at = NULL WHERE id = ?",
+                (QUEUED, error, job_id),
+            )
+
+    def recover(self) -> int:
+        """Requeue jobs left `running` by a previous process. Returns the number requeued."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+            )
+        if cursor.rowcount:
+            logger.warning(f"Requeued {cursor.rowcount} interrupted jobs")
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def depth(self) -> Dict[str, int]:
+        """Number of queued jobs per kind."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*) AS n FROM jobs WHERE status = ? GROUP BY kind", (QUEUED,)
+            ).fetchall()
+        return {row["kind"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TokenBucket:
+    """Asyncio token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+@dataclass
+class JobHandler:
+    """
+    How to run one kind of job.
+
+    Attributes:
+        run (Callable): Coroutine taking the job payload and returning a result dict.
+            A result with "status" == "error" counts as a failure.
+        provider (Callable): Returns the upstream provider name used for rate limiting.
+        cost (int): Rate-limit tokens consumed per job (e.g. judge calls per flow).
+    """
+
+    run: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    provider: Callable[[], str] = lambda: "default"
+    cost: int = 1
+
+
+class JobWorkerPool:
+    """
+    Fixed-size pool of asyncio workers draining a `JobStore`.
+
+    Concurrency is capped at `concurrency` jobs, and each provider has its own token
+    bucket so bursts of webhooks cannot exceed upstream rate limits.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 4,
+        rate_limits_per_minute: Optional[Dict[str, float]] = None,
+        default_rate_per_minute: float = 60.0,
+        max_attempts: int = 2,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.store = store
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.rate_limits_per_minute = rate_limits_per_minute or {}
+        self.default_rate_per_minute = default_rate_per_minute
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+    def _bucket(self, provider: str) -> TokenBucket:
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            per_minute = self.rate_limits_per_minute.get(provider, self.default_rate_per_minute)
+            bucket = TokenBucket(rate=per_minute / 60.0, capacity=max(1.0, per_minute / 6.0))
+            self._buckets[provider] = bucket
+        return bucket
+
+    async def submit(
+        self, kind: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Tuple[Job, bool]:
+        """Persist a job and wake an idle worker."""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        job, created = await asyncio.to_thread(self.store.enqueue, kind, payload, idempotency_key)
+        if created:
+            self._wakeup.set()
+        await self._update_depth()
+        return job, created
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _update_depth(self) -> None:
+        depth = await asyncio.to_thread(self.store.depth)
+        for kind in self.handlers:
+            job_queue_depth.labels(kind=kind).set(depth.get(kind, 0))
+
+    def start(self) -> None:
+        """Recover interrupted jobs and start the workers."""
+        self.store.recover()
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        self._wakeup.set()
+        logger.info(f"Job worker pool started with {self.concurrency} workers")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers. Jobs that are mid-run stay `running` in the store and are
+        requeued by `recover()` on the next start.
+        """
+        self._stopping = True
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            # Clear before claiming so a submit that races with an empty claim still wakes us
+            self._wakeup.clear()
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await asyncio.to_thread(self.store.finish, job.id, FAILED, None, f"Unknown job kind '{job.kind}'")
+            jobs_total.labels(kind=job.kind, status=FAILED).inc()
+            return
+
+        await self._update_depth()
+        try:
+            provider = handler.provider()
+        except Exception:
+            provider = "default"
+        await self._bucket(provider).acquire(handler.cost)
+
+        started = time.time()
+        job_wait_seconds.labels(kind=job.kind).observe(started - job.created_at)
+        error: Optional[str] = None
+        result: Optional[Dict[str, Any]] = None
+        try:
+            result = await handler.run(job.payload)
+            if isinstance(result, dict) and result.get("status") == "error":
+                error = str(result.get("message", "Job returned error status"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) raised: {e}")
+            error = str(e)
+        finally:
+            job_run_seconds.labels(kind=job.kind).observe(time.time() - started)
+
+        if error is None:
+            await asyncio.to_thread(self.store.finish, job.id, SUCCEEDED, result)
+            jobs_total.labels(kind=job.kind, status=SUCCEEDED).inc()
+        elif job.attempts < self.max_attempts:
+            logger.warning(f"Job {job.id} failed (attempt {job.attempts}/{self.max_attempts}), retrying: {error}")
+            await asyncio.to_thread(self.store.retry, job.id, error)
+            self._wakeup.set()
+        else:
+            await asyncio.to_thread(self.store.finish, job.id, FAILED, result, error)
+            jobs_total.labels(kind=job.kind, status=FAILED).inc()
@@ -0,0 +1,329 @@
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from rainmaker_orchestrator.config import ConfigManager
+
+logger: logging.Logger = logging.getLogger("judge_client")
+
+DEFAULT_ZAI_BASE = "https://api.z.ai/api/paas/v4"
+DEFAULT_MISTRAL_BASE = "https://api.mistral.ai/v1"
+ZAI_MODEL = "glm-4.7"
+MISTRAL_FALLBACK_MODEL = "mistral-large-latest"
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class JudgeEndpoint:
+    """
+    Resolved judge API endpoint.
+
+    Attributes:
+        provider (str): "zai" or "mistral".
+        api_base (str): Base URL without trailing slash.
+        url (str): Full chat-completions URL.
+        headers (Dict[str, str]): Prebuilt request headers including credentials.
+        role_models (Dict[str, str]): Model per judge role (empty means `default_model` for all).
+        default_model (str): Model used when a role has no specific mapping.
+    """
+
+    provider: str
+    api_base: str
+    url: str
+    headers: Dict[str, str] = field(repr=False)
+    role_models: Dict[str, str]
+    default_model: str
+
+    def model_for(self, judge_role: str) -> str:
+        return self.role_models.get(judge_role, self.default_model)
+
+
+def resolve_endpoint(config: ConfigManager, judge_models: Dict[str, str]) -> JudgeEndpoint:
+    """
+    Resolve the judge endpoint from configuration.
+
+    Priority is Z.ai (GLM) first, then Mistral with role-specific models.
+
+    Parameters:
+        config (ConfigManager): Source of API keys and base URLs.
+        judge_models (Dict[str, str]): Role-to-model mapping used for Mistral.
+
+    Returns:
+        JudgeEndpoint: The resolved endpoint.
+
+    Raises:
+        ValueError: If neither ZAI_API_KEY nor MISTRAL_API_KEY is configured.
+    """
+    zai_key: Optional[str] = config.get("ZAI_API_KEY")
+    mistral_key: Optional[str] = config.get("MISTRAL_API_KEY")
+
+    if zai_key:
+        provider, api_key = "zai", zai_key
+        api_base = config.get("ZAI_API_BASE") or DEFAULT_ZAI_BASE
+        role_models: Dict[str, str] = {}
+        default_model = ZAI_MODEL
+    elif mistral_key:
+        provider, api_key = "mistral", mistral_key
+        api_base = config.get("MISTRAL_API_BASE") or DEFAULT_MISTRAL_BASE
+        role_models = dict(judge_models)
+        default_model = MISTRAL_FALLBACK_MODEL
+    else:
+        logger.error("No API keys configured (ZAI_API_KEY or MISTRAL_API_KEY)")
+        raise ValueError("Missing required API credentials")
+
+    api_base = api_base.rstrip("/")
+    return JudgeEndpoint(
+        provider=provider,
+        api_base=api_base,
+        url=f"{api_base}/chat/completions",
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+        role_models=role_models,
+        default_model=default_model,
+    )
+
+
+@dataclass
+class JudgeStats:
+    """Per-judge call counters."""
+
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_latency: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        requests = self.calls - self.cache_hits
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_latency_seconds": round(self.total_latency / requests, 3) if requests else 0.0,
+        }
+
+
+class JudgeClient:
+    """
+    Pooled, memoizing HTTP client for judge chat completions.
+
+    The endpoint and credentials are resolved once and reused until `reload()` is
+    called. One HTTP/2 (when `h2` is installed) connection pool is kept per API
+    base. Identical (model, role, prompt) requests within `cache_ttl` seconds are
+    answered from memory, and concurrent identical requests share one upstream call,
+    so replayed HubSpot webhooks for the same lead do not pay for the judges twice.
+    """
+
+    def __init__(
+        self,
+        config: ConfigManager,
+        judge_models: Dict[str, str],
+        cache_ttl: Optional[float] = None,
+        cache_size: int = 256,
+    ) -> None:
+        """
+        Create the client. Nothing is resolved or connected until the first call.
+
+        Parameters:
+            config (ConfigManager): Configuration source.
+            judge_models (Dict[str, str]): Role-to-model mapping for Mistral.
+            cache_ttl (Optional[float]): Memoization TTL in seconds; defaults to
+                JUDGE_CACHE_TTL_SECONDS (300). 0 disables memoization.
+            cache_size (int): Maximum number of memoized responses.
+        """
+        self.config = config
+        self.judge_models = judge_models
+        self.cache_ttl: float = (
+            float(config.get_int("JUDGE_CACHE_TTL_SECONDS", 300)) if cache_ttl is None else cache_ttl
+        )
+        self.cache_size = cache_size
+        self.timeout = httpx.Timeout(float(config.get_int("JUDGE_HTTP_TIMEOUT_SECONDS", 120)), connect=10.0)
+        self.limits = httpx.Limits(
+            max_connections=config.get_int("JUDGE_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=config.get_int("JUDGE_MAX_KEEPALIVE", 10),
+            keepalive_expiry=60.0,
+        )
+        self._endpoint: Optional[JudgeEndpoint] = None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, JudgeStats] = {}
+
+    @property
+    def endpoint(self) -> JudgeEndpoint:
+        if self._endpoint is None:
+            self._endpoint = resolve_endpoint(self.config, self.judge_models)
+            logger.info(f"Judge endpoint resolved: provider={self._endpoint.provider} base={self._endpoint.api_base}")
+        return self._endpoint
+
+    def _client_for(self, api_base: str) -> httpx.AsyncClient:
+        client = self._clients.get(api_base)
+        if client is None:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=HTTP2_AVAILABLE)
+            self._clients[api_base] = client
+        return client
+
+    async def reload(self) -> None:
+        """
+        Re-resolve the endpoint from configuration and clear memoized responses.
+
+        Pools for API bases that are no longer in use are closed.
+        """
+        self._endpoint = None
+        self._cache.clear()
+        try:
+            active_base: Optional[str] = self.endpoint.api_base
+        except ValueError:
+            active_base = None
+        stale = [base for base in self._clients if base != active_base]
+        for base in stale:
+            await self._clients.pop(base).aclose()
+
+    def _cache_key(self, model: str, judge_role: str, context: str) -> str:
+        return hashlib.sha256(f"{model}\x00{judge_role}\x00{context}".encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return response
+
+    def _cache_put(self, key: str, response: Dict[str, Any]) -> None:
+        self._cache[key] = (time.monotonic() + self.cache_ttl, response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def complete(self, judge_role: str, context: str) -> Dict[str, Any]:
+        """
+        Send a judge prompt and return the parsed chat-completion JSON.
+
+        Parameters:
+            judge_role (str): Judge role used for the system prompt and model selection.
+            context (str): User prompt.
+
+        Returns:
+            Dict[str, Any]: Parsed JSON response. Memoized responses are shared; do not mutate.
+
+        Raises:
+            ValueError: If no API credentials are configured.
+            httpx.HTTPError: If the HTTP request fails.
+        """
+        endpoint = self.endpoint
+        model = endpoint.model_for(judge_role)
+        stats = self._stats.setdefault(judge_role, JudgeStats())
+        stats.calls += 1
+
+        if self.cache_ttl <= 0:
+            return await self._post(endpoint, model, judge_role, context, stats)
+
+        key = self._cache_key(model, judge_role, context)
+        cached = self._cache_get(key)
+        if cached is not None:
+            stats.cache_hits += 1
+            logger.info(f"Judge cache hit: {judge_role}")
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            stats.cache_hits += 1
+        else:
+            # The upstream call is owned by the in-flight map, not by the first caller,
+            # so cancelling one caller (e.g. a step timeout) never cancels the others.
+            inflight = asyncio.ensure_future(self._fetch(key, endpoint, model, judge_role, context, stats))
+            inflight.add_done_callback(functools.partial(self._discard_inflight, key))
+            self._inflight[key] = inflight
+        return await asyncio.shield(inflight)
+
+    async def _fetch(
+        self,
+        key: str,
+        endpoint: JudgeEndpoint,
+        model: str,
+        judge_role: str,
+        context: str,
+        stats: JudgeStats,
+    ) -> Dict[str, Any]:
+        response = await self._post(endpoint, model, judge_role, context, stats)
+        self._cache_put(key, response)
+        return response
+
+    def _discard_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark retrieved so a failure nobody is still awaiting does not log "exception never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def _post(
+        self,
+        endpoint: JudgeEndpoint,
+        model: str,
+        judge_role: str,
+        context: str,
+        stats: JudgeStats,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": f"You are the {judge_role.capitalize()} Judge. Provide output in valid JSON.",
+                },
+                {"role": "user", "content": context},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+        start = time.perf_counter()
+        try:
+            response = await self._client_for(endpoint.api_base).post(
+                endpoint.url, headers=endpoint.headers, json=payload
+            )
+            response.raise_for_status()
+            data: Dict[str, Any] = response.json()
+        except httpx.HTTPError as e:
+            stats.errors += 1
+            logger.error(f"Judge API error ({judge_role}): {str(e)}")
+            raise
+        finally:
+            stats.total_latency += time.perf_counter() - start
+
+        usage = data.get("usage") or {}
+        stats.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+        stats.completion_tokens += int(usage.get("completion_tokens") or 0)
+        logger.info(
+            f"Judge call successful: {judge_role} model={model} "
+            f"latency={time.perf_counter() - start:.2f}s tokens={usage.get('total_tokens', 'n/a')}"
+        )
+        return data
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-judge call, cache, token and latency counters."""
+        return {role: stats.as_dict() for role, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        """Cancel in-flight judge calls and close every pooled HTTP client."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger: logging.Logger = logging.getLogger("judge_dag")
+
+# call_judge(judge_role, prompt) -> raw chat-completion response
+JudgeCall = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class JudgeStep:
+    """
+    One node of a judge DAG.
+
+    Attributes:
+        name (str): Key under which the step's output is stored.
+        judge_role (str): Role passed to the judge call (e.g. "auditor").
+        build_prompt (Callable): Receives a dict with the flow inputs plus the
+            extracted content of every declared dependency and returns the prompt.
+        depends_on (Tuple[str, ...]): Names of steps that must finish first.
+        timeout (float): Per-step wall-clock limit in seconds.
+        critical (bool): If a critical step fails the whole flow fails;
+            non-critical failures are reported alongside partial results.
+    """
+
+    name: str
+    judge_role: str
+    build_prompt: Callable[[Dict[str, Any]], str]
+    depends_on: Tuple[str, ...] = ()
+    timeout: float = 120.0
+    critical: bool = True
+
+
+@dataclass
+class DAGResult:
+    """Outputs, errors and per-step timings from a judge DAG run."""
+
+    outputs: Dict[str, str]
+    errors: Dict[str, str]
+    timings: Dict[str, float]
+    critical_failure: bool
+
+    @property
+    def status(self) -> str:
+        if self.critical_failure:
+            return "error"
+        return "partial" if self.errors else "success"
+
+
+class DependencyFailed(Exception):
+    """Raised for a step whose dependency did not produce output."""
+
+
+def extract_content(response: Dict[str, Any]) -> str:
+    """
+    Pull the message content out of a chat-completion response.
+
+    Parameters:
+        response (Dict[str, Any]): Raw chat-completion JSON.
+
+    Returns:
+        str: The first choice's message content.
+    """
+    return str(response["choices"][0]["message"]["content"])
+
+
+class JudgeDAG:
+    """
+    Runs judge steps as a dependency graph.
+
+    Steps with no unfinished dependencies run concurrently, so end-to-end
+    latency tracks the critical path rather than the sum of all judge calls.
+    """
+
+    def __init__(self, steps: Sequence[JudgeStep]) -> None:
+        """
+        Validate and store the steps.
+
+        Parameters:
+            steps (Sequence[JudgeStep]): DAG nodes; names must be unique and
+                every dependency must name another step.
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles.
+        """
+        self.steps: Dict[str, JudgeStep] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate judge step: {step.name}")
+            self.steps[step.name] = step
+        for step in self.steps.values():
+            missing = [dep for dep in step.depends_on if dep not in self.steps]
+            if missing:
+                raise ValueError(f"Step '{step.name}' depends on unknown steps: {missing}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        visiting: set = set()
+        done: set = set()
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in judge DAG: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.steps[name].depends_on:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+    async def run(self, call_judge: JudgeCall, inputs: Dict[str, Any]) -> DAGResult:
+        """
+        Execute every step, running independent steps concurrently.
+
+        Parameters:
+            call_judge (JudgeCall): Coroutine used to invoke a judge.
+            inputs (Dict[str, Any]): Flow inputs made available to every prompt builder.
+
+        Returns:
+            DAGResult: Extracted outputs, per-step error messages and timings.
+        """
+        loop = asyncio.get_running_loop()
+        futures: Dict[str, asyncio.Future] = {name: loop.create_future() for name in self.steps}
+        outputs: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        timings: Dict[str, float] = {}
+
+        async def run_step(step: JudgeStep) -> None:
+            try:
+                deps: Dict[str, str] = {}
+                for dep in step.depends_on:
+                    dep_output: Optional[str] = await futures[dep]
+                    if dep_output is None:
+                        raise DependencyFailed(f"dependency '{dep}' failed")
+                    deps[dep] = dep_output
+
+                start = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(
+                        call_judge(step.judge_role, step.build_prompt({**inputs, **deps})),
+                        timeout=step.timeout,
+                    )
+                    outputs[step.name] = extract_content(response)
+                finally:
+                    timings[step.name] = round(time.perf_counter() - start, 3)
+                futures[step.name].set_result(outputs[step.name])
+            except Exception as e:
+                message = f"timed out after {step.timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                errors[step.name] = message
+                level = logging.ERROR if step.critical else logging.WARNING
+                logger.log(level, f"Judge step '{step.name}' failed: {message}")
+            except asyncio.CancelledError:
+                errors[step.name] = "cancelled"
+                logger.warning(f"Judge step '{step.name}' was cancelled")
+                raise
+            finally:
+                # Dependents must never wait on a step that ended without a result
+                if not futures[step.name].done():
+                    futures[step.name].set_result(None)
+
+        # A step cancelled from inside the judge call is recorded as a failed step;
+        # cancelling run() itself still propagates through gather.
+        await asyncio.gather(*(run_step(step) for step in self.steps.values()), return_exceptions=True)
+
+        critical_failure = any(self.steps[name].critical for name in errors)
+        return DAGResult(outputs=outputs, errors=errors, timings=timings, critical_failure=critical_failure)
@@ -2,14 +2,17 @@ import json
 import logging
 import os
 import re
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, cast
 
-import httpx
 import openlit  # type: ignore
 from opik import track  # type: ignore
 from rainmaker_orchestrator.fs_agent import FileSystemAgent
 
 from rainmaker_orchestrator.config import ConfigManager
+from rainmaker_orchestrator.feedback import FeedbackCompactor
+from rainmaker_orchestrator.judge_client import JudgeClient
+from rainmaker_orchestrator.judge_dag import JudgeDAG, JudgeStep
+from rainmaker_orchestrator.sandbox import ExecutionLimits
 
 logger: logging.Logger = logging.getLogger("orchestrator")
 
@@ -22,6 +25,55 @@ JUDGE_MODELS: Dict[str, str] = {
 }
 
 
+def build_authority_dag(timeout: float = 120.0) -> JudgeDAG:
+    """
+    Build the 4-Judge authority flow as a dependency graph.
+
+    The auditor and visionary only need the lead, so they run in parallel.
+    The operator and the challenger both consume the visionary's strategy and
+    run in parallel with each other. The critical path is visionary -> operator;
+    the auditor and challenger are non-critical and may fail without failing the flow.
+
+    Parameters:
+        timeout (float): Per-step timeout in seconds.
+
+    Returns:
+        JudgeDAG: The authority flow graph.
+    """
+    return JudgeDAG([
+        JudgeStep(
+            name="audit",
+            judge_role="auditor",
+            build_prompt=lambda ctx: f"Analyze this request for compliance and risk: {json.dumps(ctx['lead_data'])}",
+            timeout=timeout,
+            critical=False,
+        ),
+        JudgeStep(
+            name="strategy",
+            judge_role="visionary",
+            build_prompt=lambda ctx: f"Create a strategic execution plan: {json.dumps(ctx['lead_data'])}",
+            timeout=timeout,
+        ),
+        JudgeStep(
+            name="implementation",
+            judge_role="operator",
+            build_prompt=lambda ctx: f"Generate implementation based on strategy: {ctx['strategy']}",
+            depends_on=("strategy",),
+            timeout=timeout,
+        ),
+        JudgeStep(
+            name="critique",
+            judge_role="challenger",
+            build_prompt=lambda ctx: (
+                f"Challenge this strategy. Identify weaknesses, risks and blind spots: {ctx['strategy']}"
+            ),
+            depends_on=("strategy",),
+            timeout=timeout,
+            critical=False,
+        ),
+    ])
+
+
 class RainmakerOrchestrator:
     """
     Central intelligence for the Authority Engine.
@@ -36,7 +88,7 @@ class RainmakerOrchestrator:
         """
         Create and configure a RainmakerOrchestrator instance with workspace, config, and HTTP client.
         
-        Initializes OpenLIT unless running in CI, creates a FileSystemAgent for workspace operations, a ConfigManager for configuration access, and an asynchronous HTTP client for API calls.
+        Initializes OpenLIT unless running in CI, creates a FileSystemAgent for workspace operations, a ConfigManager for configuration access, and a pooled JudgeClient for judge API calls.
         
         Parameters:
             workspace_path (str): Path to the workspace directory used by the FileSystemAgent.
@@ -56,19 +108,44 @@ class RainmakerOrchestrator:
             except Exception as e:
                 logger.warning(f"OpenLIT init warning: {e}")
 
-        self.fs: FileSystemAgent = FileSystemAgent(workspace_path=workspace_path)
         self.config: ConfigManager = ConfigManager(config_file=config_file)
-        self.client: httpx.AsyncClient = httpx.AsyncClient(timeout=120.0)
+        self.fs: FileSystemAgent = FileSystemAgent(
+            workspace_path=workspace_path,
+            limits=ExecutionLimits(
+                wall_clock_seconds=float(self.config.get_int("SANDBOX_WALL_CLOCK_SECONDS", 30)),
+                cpu_seconds=self.config.get_int("SANDBOX_CPU_SECONDS", 20),
+                memory_bytes=self.config.get_int("SANDBOX_MEMORY_MB", 512) * 1024 * 1024,
+                max_output_bytes=self.config.get_int("SANDBOX_MAX_OUTPUT_KB", 64) * 1024,
+            ),
+            max_concurrency=self.config.get_int("SANDBOX_MAX_CONCURRENCY", 4),
+        )
+        self.judge_client: JudgeClient = JudgeClient(self.config, JUDGE_MODELS)
+        self.authority_dag: JudgeDAG = build_authority_dag(
+            timeout=float(self.config.get_int("JUDGE_TIMEOUT_SECONDS", 120))
+        )
 
     async def aclose(self) -> None:
         """Gracefully close the HTTP client."""
-        await self.client.aclose()
+        await self.judge_client.aclose()
         logger.info("Orchestrator HTTP client closed")
 
+    async def reload_config(self) -> None:
+        """
+        Reload configuration from the config file and environment.
+
+        The judge endpoint and credentials are re-resolved on the next call and
+        memoized judge responses are discarded.
+        """
+        self.config.reload()
+        await self.judge_client.reload()
+        logger.info("Orchestrator configuration reloaded")
+
     @track(name="judge_call")  # type: ignore
     async def _call_judge(self, judge_role: str, context: str) -> Dict[str, Any]:
         """
         Selects an appropriate judge model for the given role, sends the provided context as a chat completion prompt, and returns the parsed JSON response from the judge API.
+
+        Calls go through the shared `JudgeClient`, so identical prompts within JUDGE_CACHE_TTL_SECONDS are served from memory.
         
         Parameters:
             judge_role (str): Role name used to select the judge model (e.g., "visionary", "operator", "auditor", "challenger").
@@ -81,94 +158,47 @@ class RainmakerOrchestrator:
             ValueError: If neither ZAI_API_KEY nor MISTRAL_API_KEY is configured.
             httpx.HTTPError: If the HTTP request to the judge API fails.
         """
-        zai_key: Optional[str] = self.config.get("ZAI_API_KEY")
-        mistral_key: Optional[str] = self.config.get("MISTRAL_API_KEY")
-
-        if not zai_key and not mistral_key:
-            logger.error("No API keys configured (ZAI_API_KEY or MISTRAL_API_KEY)")
-            raise ValueError("Missing required API credentials")
-
-        # Priority: Z.ai (GLM) -> Mistral (Role-specific)
-        if zai_key:
-            api_key: str = zai_key
-            api_base: str = self.config.get("ZAI_API_BASE") or "https://api.z.ai/api/paas/v4"
-            model: str = "glm-4.7"
-        elif mistral_key:
-            api_key = mistral_key
-            api_base = self.config.get("MISTRAL_API_BASE") or "https://api.mistral.ai/v1"
-            model = JUDGE_MODELS.get(judge_role, "mistral-large-latest")
-        else:
-            raise ValueError("No API keys configured")
-
-        headers: Dict[str, str] = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
-        payload: Dict[str, Any] = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": f"You are the {judge_role.capitalize()} Judge. Provide output in valid JSON.",
-                },
-                {"role": "user", "content": context},
-            ],
-            "response_format": {"type": "json_object"},
-        }
-        url: str = f"{api_base.rstrip('/')}/chat/completions"
-
-        try:
-            response: httpx.Response = await self.client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            logger.info(f"Judge call successful: {judge_role}")
-            return response.json()  # type: ignore[no-any-return]
-        except httpx.HTTPError as e:
-            logger.error(f"Judge API error ({judge_role}): {str(e)}")
-            raise
+        return await self.judge_client.complete(judge_role, context)
 
     @track(name="authority_flow")  # type: ignore
     async def run_authority_flow(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Run the 4-Judge Authority Flow to produce audit, strategy, and implementation outputs for a lead.
-        
+        Run the 4-Judge Authority Flow to produce audit, strategy, implementation and critique outputs for a lead.
+
+        Judges run as a dependency graph (see `build_authority_dag`): independent judges are called
+        concurrently and each judge call is bounded by `JUDGE_TIMEOUT_SECONDS`.
+
         Parameters:
             lead_data (Dict[str, Any]): Input lead information used as the basis for auditing, strategy creation, and implementation generation.
-        
+
         Returns:
-            result (Dict[str, Any]): On success, a dict with "status" set to "success" and keys "audit", "strategy", and "implementation" containing each judge's content; on error, a dict with "status" set to "error" and a "message" describing the failure.
+            result (Dict[str, Any]): A dict with "status" set to "success" (all judges answered) or "partial" (a non-critical judge failed),
+            the keys "audit", "strategy", "implementation" and "critique" (None for a failed judge), per-judge "timings" in seconds,
+            and "errors" when any judge failed. If a critical judge fails, "status" is "error" and "message" describes the failure.
         """
         logger.info("⚖️ Initiating Authority Flow...")
 
         try:
-            # 1. Audit
-            audit_res: Dict[str, Any] = await self._call_judge(
-                "auditor",
-                f"Analyze this request for compliance and risk: {json.dumps(lead_data)}",
-            )
-
-            # 2. Vision
-            vision_res: Dict[str, Any] = await self._call_judge(
-                "visionary",
-                f"Create a strategic execution plan: {json.dumps(lead_data)}",
-            )
-
-            # 3. Operation
-            op_res: Dict[str, Any] = await self._call_judge(
-                "operator",
-                f"Generate implementation based on strategy: {json.dumps(vision_res)}",
-            )
-
-            logger.info("Authority Flow completed successfully")
-            return {
-                "status": "success",
-                "audit": str(audit_res["choices"][0]["message"]["content"]),
-                "strategy": str(vision_res["choices"][0]["message"]["content"]),
-                "implementation": str(op_res["choices"][0]["message"]["content"]),
-            }
+            result = await self.authority_dag.run(self._call_judge, {"lead_data": lead_data})
         except Exception as e:
             logger.error(f"Authority Flow error: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+        if result.critical_failure:
+            message = "; ".join(f"{name}: {error}" for name, error in result.errors.items())
+            logger.error(f"Authority Flow error: {message}")
+            return {"status": "error", "message": message, "timings": result.timings}
+
+        logger.info(f"Authority Flow completed with status={result.status}")
+        response: Dict[str, Any] = {
+            "status": result.status,
+            **{name: result.outputs.get(name) for name in self.authority_dag.steps},
+            "timings": result.timings,
+        }
+        if result.errors:
+            response["errors"] = result.errors
+        return response
+
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
         Dispatches a task to the appropriate handler based on its "type" field.
@@ -204,23 +234,32 @@ class RainmakerOrchestrator:
         On each attempt the method:
         - Requests code from the "operator" judge using the current context.
         - Cleans and parses a JSON payload returned by the judge; the JSON must contain a "code" field with the source to write.
-        - Writes the code to `output_filename` and executes it via the FileSystemAgent.
+        - Writes the code to `output_filename` inside the workspace and executes it in the FileSystemAgent's
+          resource-limited sandbox (an isolated per-task directory) without blocking the event loop.
         - If execution returns status "success", returns a payload with that stdout.
-        - If execution fails or parsing/errors occur, appends the error information to the context and retries (up to three attempts).
+        - If execution fails or parsing/errors occur, records the error and retries (up to SELF_HEAL_MAX_RETRIES attempts).
+          Retry prompts are the original context plus compacted feedback: the latest traceback with repeated
+          frames collapsed and only the innermost SELF_HEAL_MAX_FRAMES frames kept, and a fixed-size digest of
+          earlier attempts, all within SELF_HEAL_FEEDBACK_TOKENS tokens, so prompts do not grow per retry.
         
         Returns:
-        - A dict with {"status": "success", "output": <stdout>} when execution succeeds.
+        - A dict with {"status": "success", "output": <stdout>, "final_code_path": <path>, "retries": <n>} when execution succeeds.
         - A dict with {"status": "failed", "message": "Max retries exceeded for self-healing"} if all retries fail.
         """
         filename: str = task["output_filename"]
-        max_retries: int = 3
-        current_context: str = task["context"]
+        task_id: str = re.sub(r"[^\w-]", "_", os.path.splitext(os.path.basename(filename))[0]) or "task"
+        max_retries: int = self.config.get_int("SELF_HEAL_MAX_RETRIES", 3)
+        base_context: str = task["context"]
+        compactor = FeedbackCompactor(
+            token_budget=self.config.get_int("SELF_HEAL_FEEDBACK_TOKENS", 1500),
+            max_frames=self.config.get_int("SELF_HEAL_MAX_FRAMES", 5),
+        )
 
         for attempt in range(max_retries):
             try:
                 model_res: Dict[str, Any] = await self._call_judge(
                     "operator",
-                    current_context,
+                    compactor.render(base_context),
                 )
                 content: str = model_res["choices"][0]["message"]["content"]
 
@@ -235,23 +274,28 @@ class RainmakerOrchestrator:
 
                 # Write and test
                 self.fs.write_file(filename, parsed["code"])
-                exec_result: Dict[str, Any] = self.fs.execute_script(filename)
+                exec_result: Dict[str, Any] = await self.fs.execute_script_async(filename, task_id=task_id)
 
                 if exec_result["status"] == "success":
                     logger.info(f"Self-healing succeeded on attempt {attempt + 1}")
-                    return {"status": "success", "output": exec_result["stdout"]}
+                    return {
+                        "status": "success",
+                        "output": exec_result["stdout"],
+                        "final_code_path": self.fs.resolve_path(filename),
+                        "retries": attempt,
+                    }
 
                 # Feedback loop
                 stderr: str = exec_result.get("stderr", "Unknown error")
-                current_context += f"\n\nAttempt {attempt + 1} - Execution Error: {stderr}"
-                logger.warning(f"Self-healing attempt {attempt + 1} failed: {stderr}")
+                compactor.add_attempt("Execution Error", stderr)
+                logger.warning(f"Self-healing attempt {attempt + 1} failed: {compactor.attempts[-1].summary}")
 
             except json.JSONDecodeError as e:
                 logger.error(f"JSON parse error on attempt {attempt + 1}: {str(e)}")
-                current_context += f"\n\nAttempt {attempt + 1} - JSON Parse Error: {str(e)}"
+                compactor.add_attempt("JSON Parse Error", str(e))
             except Exception as e:
                 logger.error(f"Self-healing error on attempt {attempt + 1}: {str(e)}")
-                current_context += f"\n\nAttempt {attempt + 1} - Error: {str(e)}"
+                compactor.add_attempt("Error", str(e))
 
         logger.error("Max retries exceeded for self-healing")
         return {"status": "failed", "message": "Max retries exceeded for self-healing"}
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: rlimits unavailable, wall-clock limit still applies
+    resource = None  # type: ignore
+
+logger: logging.Logger = logging.getLogger("sandbox")
+
+
+@dataclass(frozen=True)
+class ExecutionLimits:
+    """Per-run resource limits for sandboxed scripts."""
+
+    wall_clock_seconds: float = 30.0
+    cpu_seconds: int = 20
+    memory_bytes: int = 512 * 1024 * 1024
+    file_size_bytes: int = 16 * 1024 * 1024
+    max_output_bytes: int = 64 * 1024
+
+
+def _rlimit_preexec(limits: ExecutionLimits) -> Optional[Callable[[], None]]:
+    if resource is None:
+        return None
+
+    def apply() -> None:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 1))
+        resource.setrlimit(resource.RLIMIT_AS, (limits.memory_bytes, limits.memory_bytes))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limits.file_size_bytes, limits.file_size_bytes))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+    return apply
+
+
+async def _read_capped(stream: asyncio.StreamReader, cap: int) -> Tuple[bytes, bool]:
+    """Read a stream to EOF, keeping at most `cap` bytes but draining the rest so the child never blocks."""
+    kept = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        room = cap - len(kept)
+        if room > 0:
+            kept += chunk[:room]
+        if len(chunk) > room:
+            truncated = True
+    return bytes(kept), truncated
+
+
+class SandboxExecutor:
+    """
+    Runs Python scripts in isolated, resource-limited subprocesses without blocking the event loop.
+
+    Each run gets its own temporary directory under `<workspace>/.runs`, a minimal
+    environment, rlimits on CPU time, address space and file size, a wall-clock
+    timeout that kills the whole process group, and capped stdout/stderr capture.
+    At most `max_concurrency` scripts run at once.
+    """
+
+    def __init__(
+        self,
+        workspace_path: str,
+        limits: Optional[ExecutionLimits] = None,
+        max_concurrency: int = 4,
+        python: str = sys.executable or "python3",
+    ) -> None:
+        self.workspace_path = os.path.abspath(workspace_path)
+        self.runs_path = os.path.join(self.workspace_path, ".runs")
+        self.limits = limits or ExecutionLimits()
+        self.python = python
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_code(self, code: str, script_name: str = "main.py", task_id: str = "task") -> Dict[str, Any]:
+        """
+        Write `code` into a fresh per-task directory and execute it.
+
+        Returns:
+            Dict[str, Any]: {"status": "success", "stdout": ...} or {"status": "error", "stderr": ...},
+            plus "returncode", "timed_out", "truncated" and "duration_seconds".
+        """
+        async with self._semaphore:
+            os.makedirs(self.runs_path, exist_ok=True)
+            run_dir = tempfile.mkdtemp(prefix=f"{task_id}-", dir=self.runs_path)
+            try:
+                script_path = os.path.join(run_dir, os.path.basename(script_name) or "main.py")
+                with open(script_path, "w") as f:
+                    f.write(code)
+                return await self._execute(script_path, run_dir)
+            finally:
+                shutil.rmtree(run_dir, ignore_errors=True)
+
+    async def _execute(self, script_path: str, run_dir: str) -> Dict[str, Any]:
+        limits = self.limits
+        env = {
+            "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+            "HOME": run_dir,
+            "TMPDIR": run_dir,
+            "PYTHONDONTWRITEBYTECODE": "1",
+            "PYTHONUNBUFFERED": "1",
+        }
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.python, "-I", script_path,
+                cwd=run_dir,
+                env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                preexec_fn=_rlimit_preexec(limits),
+                start_new_session=True,
+            )
+        except Exception as e:
+            return {"status": "error", "stderr": str(e), "returncode": None, "timed_out": False,
+                    "truncated": False, "duration_seconds": 0.0}
+
+        readers = asyncio.gather(
+            _read_capped(process.stdout, limits.max_output_bytes),
+            _read_capped(process.stderr, limits.max_output_bytes),
+        )
+        timed_out = False
+        try:
+            (stdout, out_truncated), (stderr, err_truncated) = await asyncio.wait_for(
+                asyncio.shield(readers), timeout=limits.wall_clock_seconds
+            )
+            await process.wait()
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._kill(process)
+            (stdout, out_truncated), (stderr, err_truncated) = await readers
+            await process.wait()
+        except asyncio.CancelledError:
+            self._kill(process)
+            raise
+
+        duration = round(time.perf_counter() - start, 3)
+        stdout_text = stdout.decode("utf-8", errors="replace")
+        stderr_text = stderr.decode("utf-8", errors="replace")
+        if timed_out:
+            stderr_text += f"\nTimeoutError: script exceeded {limits.wall_clock_seconds}s wall-clock limit"
+        elif process.returncode is not None and process.returncode < 0:
+            stderr_text += f"\nKilled by signal {-process.returncode} (resource limit exceeded?)"
+
+        result: Dict[str, Any] = {
+            "returncode": process.returncode,
+            "timed_out": timed_out,
+            "truncated": out_truncated or err_truncated,
+            "duration_seconds": duration,
+        }
+        if process.returncode == 0 and not timed_out:
+            return {"status": "success", "stdout": stdout_text, **result}
+        return {"status": "error", "stdout": stdout_text, "stderr": stderr_text, **result}
+
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process) -> None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, AttributeError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
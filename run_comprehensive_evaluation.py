@@ -186,9 +186,12 @@ Generated: {datetime.now().isoformat()}
         try:
             with open(benchmark_file) as f:
                 data = json.load(f)
-                perf = data.get("performance", {})
+                models = data.get("models") or {"": data}
+                perf = next(iter(models.values())).get("performance", {})
                 report += f"- Pass Rate: {perf.get('passed_tests', 0)/perf.get('total_tests', 1)*100:.1f}%\n"
                 report += f"- Avg Response Time: {perf.get('avg_response_time', 0):.2f}s\n"
+                report += f"- P50 / P95 Response Time: {perf.get('p50_response_time', 0):.2f}s / {perf.get('p95_response_time', 0):.2f}s\n"
+                report += f"- Throughput: {perf.get('tokens_per_sec', 0):.1f} tokens/sec\n"
                 report += f"- Quality Score: {perf.get('avg_quality_score', 0):.2f}/1.00\n"
         except:
             report += "- Benchmark data available in " + benchmark_file + "\n"
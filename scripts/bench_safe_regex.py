@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark SafeRegex on synthetic multi-MB CI logs.
+
+Compares the previous approach (one OS thread per search, applied line by
+line) against the thread-free per-line search and the batch buffer scan.
+
+Usage:
+    python scripts/bench_safe_regex.py --megabytes 8
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pr_fix_agent.analyzer import RE2_AVAILABLE, SafeRegex  # noqa: E402
+
+PATTERNS = {
+    "module": SafeRegex.MODULE_NOT_FOUND,
+    "file": SafeRegex.FILE_NOT_FOUND,
+}
+
+NOISE = [
+    "2026-03-01T12:00:00.000Z ##[group]Run actions/setup-python@v5",
+    "Collecting requests>=2.28.0 (from -r requirements.txt (line 1))",
+    "tests/test_api.py::test_health PASSED                                     [ 12%]",
+    "  Downloading pydantic-2.6.0-py3-none-any.whl (394 kB)",
+]
+ERRORS = [
+    "ModuleNotFoundError: No module named 'yaml'",
+    "FileNotFoundError: 'config/settings.json' not found",
+]
+
+
+def build_log(megabytes: float, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    target = int(megabytes * 1024 * 1024)
+    while size < target:
+        line = rng.choice(ERRORS) if rng.random() < 0.01 else rng.choice(NOISE)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def legacy_search(pattern: str, text: str, timeout: float = 1.0):
+    """Previous SafeRegex.safe_search: a daemon thread per search"""
+    result = [None]
+
+    def search_thread():
+        result[0] = re.search(pattern, text, re.IGNORECASE)
+
+    thread = threading.Thread(target=search_thread, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result[0]
+
+
+def bench(label: str, fn) -> float:
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms   matches={count}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megabytes", type=float, default=8.0)
+    parser.add_argument("--legacy-lines", type=int, default=20000,
+                        help="Lines to run through the thread-per-search path (extrapolated)")
+    args = parser.parse_args()
+
+    log = build_log(args.megabytes)
+    lines = log.split("\n")
+    print(f"log: {len(log) / 1024 / 1024:.1f} MB, {len(lines)} lines, backend: {'re2' if RE2_AVAILABLE else 're'}")
+
+    sample = lines[:args.legacy_lines]
+    legacy = bench(
+        f"legacy threads ({len(sample)} lines)",
+        lambda: sum(1 for line in sample for p in PATTERNS.values() if legacy_search(p, line)),
+    )
+    print(f"{'  extrapolated to full log':<28} {legacy * len(lines) / len(sample) * 1000:10.1f} ms")
+
+    bench(
+        "per-line safe_search",
+        lambda: sum(1 for line in lines for p in PATTERNS.values() if SafeRegex.safe_search(p, line)),
+    )
+    bench(
+        "batch scan (whole buffer)",
+        lambda: sum(len(matches) for matches in SafeRegex.scan(PATTERNS, log).values()),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark StaticAnalyzer over this repository's own Python sources.
+
+Reports parse vs rule-traversal time and files/sec for the single-pass rule
+framework. Pass --baseline with another copy of continuous_improvement_real.py
+(e.g. from `git show <rev>:continuous_improvement_real.py > /tmp/old.py`) to
+compare against it on the same files.
+
+Usage:
+    python scripts/bench_static_analyzer.py --repeat 3
+    python scripts/bench_static_analyzer.py --baseline /tmp/old.py
+"""
+
+import argparse
+import ast
+import contextlib
+import importlib.util
+import io
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from continuous_improvement_real import StaticAnalyzer, iter_python_files  # noqa: E402
+
+
+def load_module(path: Path):
+    spec = importlib.util.spec_from_file_location("baseline_analyzer", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_analyzer(analyzer, files, repeat):
+    best = float("inf")
+    issues = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            issues = sum(len(analyzer.analyze_python_file(f)) for f in files)
+        best = min(best, time.perf_counter() - start)
+    return best, issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repo-path", default=str(ROOT))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="Path to another continuous_improvement_real.py to compare")
+    args = parser.parse_args()
+
+    files = list(iter_python_files(Path(args.repo_path)))
+    sources = [(f, f.read_text()) for f in files]
+    print(f"{len(files)} files, {sum(len(s) for _, s in sources) / 1024:.0f} KB")
+
+    start = time.perf_counter()
+    trees = []
+    for f, source in sources:
+        try:
+            trees.append((f, source.split("\n"), ast.parse(source)))
+        except SyntaxError:
+            continue  # reported as a single issue by the analyzer; nothing to traverse
+    parse = time.perf_counter() - start
+
+    analyzer = StaticAnalyzer()
+    start = time.perf_counter()
+    for f, lines, tree in trees:
+        analyzer.analyze_tree(tree, lines, f)
+    walk = time.perf_counter() - start
+    print(f"{'parse only':<24} {parse * 1000:8.1f} ms")
+    print(f"{'rule traversal only':<24} {walk * 1000:8.1f} ms  ({len(analyzer.rules)} rules, one walk)")
+
+    total, issues = time_analyzer(analyzer, files, args.repeat)
+    print(f"{'single-pass analyzer':<24} {total * 1000:8.1f} ms  {len(files) / total:6.0f} files/sec  issues={issues}")
+
+    if args.baseline:
+        baseline = load_module(Path(args.baseline)).StaticAnalyzer()
+        base_total, base_issues = time_analyzer(baseline, files, args.repeat)
+        print(f"{'baseline analyzer':<24} {base_total * 1000:8.1f} ms  "
+              f"{len(files) / base_total:6.0f} files/sec  issues={base_issues}")
+        print(f"speedup: {base_total / total:.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark webhook forwarding against a local stub server.
+
+Compares the legacy "new client per event" forwarding against the pooled
+ForwardingTarget (circuit breaker + AIMD limiter) while the stub target is
+healthy and while it is degraded (slow responses and 503s).
+
+Usage:
+    python scripts/bench_webhook_forwarding.py --events 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.forwarding import ForwardingTarget, ForwardTargetConfig  # noqa: E402
+
+
+class StubTarget:
+    """Minimal HTTP/1.1 keep-alive server with configurable degradation."""
+
+    def __init__(self, error_rate: float = 0.0, slow_rate: float = 0.0, slow_seconds: float = 0.5):
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.requests = 0
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                header = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in header.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+
+                roll = random.random()
+                if roll < self.slow_rate:
+                    await asyncio.sleep(self.slow_seconds)
+                status = b"503 Service Unavailable" if random.random() < self.error_rate else b"200 OK"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\n{}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_legacy(url: str, events: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    ok = 0
+
+    async def one(i: int) -> None:
+        nonlocal ok
+        async with sem:
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.post(url, json={"id": i})
+                    response.raise_for_status()
+                    ok += 1
+            except Exception:
+                pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(events)))
+    elapsed = time.perf_counter() - start
+    return {"mode": "legacy", "events": events, "ok": ok, "seconds": round(elapsed, 3),
+            "events_per_sec": round(events / elapsed, 1)}
+
+
+async def run_pooled(url: str, events: int, concurrency: int, batch_size: int) -> dict:
+    config = ForwardTargetConfig(
+        name="stub", url=url, timeout=5.0, max_connections=concurrency,
+        batch_size=batch_size, failure_threshold=5, reset_timeout=0.5,
+        latency_target=0.2, max_concurrency=concurrency,
+    )
+    # The SSRF transport blocks loopback, so the benchmark injects a plain pooled client
+    client = httpx.AsyncClient(timeout=5.0, limits=httpx.Limits(max_connections=concurrency))
+    target = ForwardingTarget(config, client=client)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(target.send({"id": i}) for i in range(events)))
+    elapsed = time.perf_counter() - start
+    await target.aclose()
+
+    ok = sum(1 for r in results if r.get("status") == "forwarded")
+    return {"mode": f"pooled(batch={batch_size})", "events": events, "ok": ok,
+            "seconds": round(elapsed, 3), "events_per_sec": round(events / elapsed, 1),
+            **{k: v for k, v in target.snapshot().items() if k != "pending_batch"}}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Webhook forwarding benchmark")
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=20)
+    args = parser.parse_args()
+
+    scenarios = {
+        "healthy": StubTarget(),
+        "degraded": StubTarget(error_rate=0.3, slow_rate=0.2, slow_seconds=0.5),
+    }
+    report = {}
+    for name, stub in scenarios.items():
+        port = await stub.start()
+        url = f"http://127.0.0.1:{port}/webhook"
+        report[name] = [
+            await run_legacy(url, args.events, args.concurrency),
+            await run_pooled(url, args.events, args.concurrency, batch_size=1),
+            await run_pooled(url, args.events, args.concurrency, batch_size=args.batch_size),
+        ]
+        report[name].append({"stub_requests": stub.requests})
+        await stub.stop()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
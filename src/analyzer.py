@@ -3,8 +3,209 @@ Error Analysis Components
 Proper library structure for error parsing and analysis
 """
 
+import os
 import re
-from typing import Dict, List
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Tuple, Union
+
+# Line markers; a marker must be followed by at least one character
+ERROR_MARKERS = [
+    r"Error: ",
+    r"ERROR: ",
+    r"fatal: ",
+    r"Failed ",
+    r"Exception: ",
+    r"\[ERROR\] ",
+    r"ImportError: ",
+    r"SyntaxError: ",
+    r"ModuleNotFoundError: ",
+]
+
+WARNING_MARKERS = [
+    r"Warning: ",
+    r"WARN: ",
+    r"\[WARN\] ",
+    r"DeprecationWarning: ",
+]
+
+# Case-folded union of the markers above, matched against lowercased text.
+# "error: " also covers ImportError/SyntaxError/ModuleNotFoundError and
+# "warning: " covers DeprecationWarning. The marker is matched without
+# consuming the following character, so an error marker cannot hide a warning.
+LINE_MARKERS = re.compile(
+    r"(?P<error>(?:error|exception|fatal): |failed |\[error\] )(?=.)"
+    r"|(?P<warning>(?:warning|warn): |\[warn\] )(?=.)"
+)
+
+# GitHub Actions prefixes every line with a timestamp; ignore it when deduplicating
+GHA_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z\s+")
+
+LogSource = Union[str, "os.PathLike[str]", IO, Iterable[Union[str, bytes]]]
+
+
+def _decode(chunk: Union[str, bytes]) -> str:
+    return chunk.decode("utf-8", "replace") if isinstance(chunk, bytes) else chunk
+
+
+def _iter_chunks(source: LogSource, chunk_size: int) -> Iterator[str]:
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif isinstance(source, os.PathLike):
+        with open(source, encoding="utf-8", errors="replace") as f:
+            yield from _iter_chunks(f, chunk_size)
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield _decode(chunk)
+    else:
+        # Coalesce small pieces (e.g. individual lines) into chunk_size reads
+        pieces: List[str] = []
+        size = 0
+        for chunk in source:
+            chunk = _decode(chunk)
+            pieces.append(chunk)
+            size += len(chunk)
+            if size >= chunk_size:
+                yield "".join(pieces)
+                pieces, size = [], 0
+        if pieces:
+            yield "".join(pieces)
+
+
+def iter_line_blocks(source: LogSource, chunk_size: int = 1 << 20, max_line_length: int = 8192) -> Iterator[List[str]]:
+    """
+    Yield the complete lines of each chunk read from a log
+
+    The log is read ``chunk_size`` characters at a time and lines longer than
+    ``max_line_length`` are truncated, so memory stays bounded regardless of
+    log size or pathological single-line output.
+
+    Args:
+        source: Log content (str), path (os.PathLike), file object, or iterable
+            of str/bytes chunks (e.g. lines with their newlines)
+        chunk_size: Characters per read
+        max_line_length: Longest line kept; the remainder is discarded
+
+    Returns:
+        Iterator of line lists, without trailing newlines
+    """
+    partial = ""
+    skipping = False
+
+    for chunk in _iter_chunks(source, chunk_size):
+        if skipping:
+            newline = chunk.find("\n")
+            if newline == -1:
+                continue
+            chunk = chunk[newline:]
+            skipping = False
+
+        lines = (partial + chunk).split("\n")
+        partial = lines.pop()
+        if lines:
+            yield [line[:max_line_length].rstrip("\r") for line in lines]
+
+        if len(partial) > max_line_length:
+            partial = partial[:max_line_length]
+            skipping = True
+
+    if partial:
+        yield [partial.rstrip("\r")]
+
+
+def iter_log_lines(source: LogSource, chunk_size: int = 1 << 20, max_line_length: int = 8192) -> Iterator[str]:
+    """
+    Yield log lines one at a time (see iter_line_blocks)
+
+    Args:
+        source: Log content, path, file object or iterable of chunks
+        chunk_size: Characters per read
+        max_line_length: Longest line kept
+
+    Returns:
+        Iterator of lines without trailing newlines
+    """
+    for block in iter_line_blocks(source, chunk_size, max_line_length):
+        yield from block
+
+
+def classify_block(lines: List[str]) -> List[Tuple[int, bool, bool]]:
+    """
+    Find error/warning lines in a block with one regex pass over the whole block
+
+    Args:
+        lines: Lines of one block
+
+    Returns:
+        (index, is_error, is_warning) for each matching line, in order
+    """
+    text = "\n".join(lines)
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Some characters change length when lowercased; offsets no longer map to lines
+        return [(i, *classify_line(line)) for i, line in enumerate(lines) if any(classify_line(line))]
+
+    found: Dict[int, List[bool]] = {}
+    index = 0
+    position = 0
+    for match in LINE_MARKERS.finditer(lowered):
+        index += lowered.count("\n", position, match.start())
+        position = match.start()
+        kinds = found.setdefault(index, [False, False])
+        kinds[match.lastgroup == "warning"] = True
+    return [(i, is_error, is_warning) for i, (is_error, is_warning) in found.items()]
+
+
+def classify_line(line: str) -> Tuple[bool, bool]:
+    """
+    Classify a single log line with the combined marker pattern
+
+    Args:
+        line: Log line
+
+    Returns:
+        (is_error, is_warning)
+    """
+    is_error = is_warning = False
+    for match in LINE_MARKERS.finditer(line.lower()):
+        if match.lastgroup == "error":
+            is_error = True
+        else:
+            is_warning = True
+    return is_error, is_warning
+
+
+@dataclass
+class LogFinding:
+    """A distinct error or warning line with its occurrence count and context"""
+    kind: str
+    message: str
+    line_number: int
+    last_line_number: int
+    count: int = 1
+    context_before: List[str] = field(default_factory=list)
+    context_after: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class LogParseResult:
+    """Deduplicated findings from a single streaming pass over a log"""
+    errors: List[LogFinding] = field(default_factory=list)
+    warnings: List[LogFinding] = field(default_factory=list)
+    lines_read: int = 0
+    total_errors: int = 0
+    total_warnings: int = 0
+    dropped: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
 
 
 class PRErrorAnalyzer:
@@ -18,31 +219,30 @@ class PRErrorAnalyzer:
             agent: Ollama agent for AI-powered analysis
         """
         self.agent = agent
-        self.error_patterns = [
-            r"Error: (.+)",
-            r"ERROR: (.+)",
-            r"fatal: (.+)",
-            r"Failed (.+)",
-            r"Exception: (.+)",
-            r"\[ERROR\] (.+)",
-            r"ImportError: (.+)",
-            r"SyntaxError: (.+)",
-            r"ModuleNotFoundError: (.+)",
-        ]
-
-        self.warning_patterns = [
-            r"Warning: (.+)",
-            r"WARN: (.+)",
-            r"\[WARN\] (.+)",
-            r"DeprecationWarning: (.+)",
-        ]
-
-    def parse_github_actions_log(self, log_content: str) -> Dict[str, List[str]]:
+        self.error_patterns = [f"{marker}(.+)" for marker in ERROR_MARKERS]
+        self.warning_patterns = [f"{marker}(.+)" for marker in WARNING_MARKERS]
+
+    @staticmethod
+    def classify_line(line: str) -> Tuple[bool, bool]:
+        """
+        Classify a log line with the combined marker pattern
+
+        Args:
+            line: Log line
+
+        Returns:
+            (is_error, is_warning)
+        """
+        return classify_line(line)
+
+    def parse_github_actions_log(self, log_content: LogSource) -> Dict[str, List[str]]:
         """
         Parse GitHub Actions log to extract errors and warnings
 
+        Every occurrence is returned; use parse_log_stream() for large logs.
+
         Args:
-            log_content: Raw log content
+            log_content: Raw log content (or any source accepted by iter_line_blocks)
 
         Returns:
             Dict with 'errors' and 'warnings' lists
@@ -50,26 +250,97 @@ class PRErrorAnalyzer:
         errors = []
         warnings = []
 
-        for line in log_content.split('\n'):
-            # Check errors
-            for pattern in self.error_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    errors.append(line.strip())
-                    break
-
-            # Check warnings
-            for pattern in self.warning_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    warnings.append(line.strip())
-                    break
+        for block in iter_line_blocks(log_content):
+            for index, is_error, is_warning in classify_block(block):
+                if is_error:
+                    errors.append(block[index].strip())
+                if is_warning:
+                    warnings.append(block[index].strip())
 
         return {
             "errors": errors,
             "warnings": warnings
         }
 
+    def parse_log_stream(
+        self,
+        source: LogSource,
+        context_lines: int = 3,
+        max_findings: int = 1000,
+        chunk_size: int = 1 << 20,
+        max_line_length: int = 8192
+    ) -> LogParseResult:
+        """
+        Parse a log in one streaming pass with context and deduplication
+
+        Each chunk is classified with a single regex pass, so per-line Python
+        work is only done for matching lines. A ring buffer holds the last
+        ``context_lines`` lines of the previous chunk for before-context, and
+        findings near the end of a chunk collect their after-context from the
+        next one. Repeated errors (ignoring the GitHub Actions timestamp prefix)
+        increment a count instead of being stored again. At most
+        ``max_findings`` distinct findings are kept; later distinct ones are
+        only counted in ``dropped``. Memory is therefore bounded by the limits
+        and chunk size, not by log size.
+
+        Args:
+            source: Log content, path, file object or iterable of chunks
+            context_lines: Lines of context to capture before/after each finding
+            max_findings: Maximum distinct errors + warnings retained
+            chunk_size: Characters per read
+            max_line_length: Longest line kept
+
+        Returns:
+            LogParseResult with deduplicated errors and warnings
+        """
+        result = LogParseResult()
+        seen: Dict[Tuple[str, str], LogFinding] = {}
+        tail: Deque[str] = deque(maxlen=context_lines)
+        pending: List[LogFinding] = []
+
+        for block in iter_line_blocks(source, chunk_size, max_line_length):
+            if pending:
+                for finding in pending:
+                    finding.context_after.extend(block[:context_lines - len(finding.context_after)])
+                pending = [f for f in pending if len(f.context_after) < context_lines]
+
+            for index, is_error, is_warning in classify_block(block):
+                number = result.lines_read + index + 1
+                message = GHA_TIMESTAMP.sub("", block[index].strip())
+
+                for kind, matched in (("error", is_error), ("warning", is_warning)):
+                    if not matched:
+                        continue
+                    if kind == "error":
+                        result.total_errors += 1
+                    else:
+                        result.total_warnings += 1
+
+                    finding = seen.get((kind, message))
+                    if finding is not None:
+                        finding.count += 1
+                        finding.last_line_number = number
+                    elif len(seen) < max_findings:
+                        finding = LogFinding(kind, message, number, number)
+                        if context_lines:
+                            start = index - context_lines
+                            before = block[max(0, start):index]
+                            if start < 0:
+                                before = list(tail)[start:] + before
+                            finding.context_before = before
+                            finding.context_after = block[index + 1:index + 1 + context_lines]
+                            if len(finding.context_after) < context_lines:
+                                pending.append(finding)
+                        seen[(kind, message)] = finding
+                        (result.errors if kind == "error" else result.warnings).append(finding)
+                    else:
+                        result.dropped += 1
+
+            tail.extend(block[-context_lines:] if context_lines else ())
+            result.lines_read += len(block)
+
+        return result
+
     def analyze_error(self, error: str) -> Dict[str, str]:
         """
         Analyze specific error using AI agent
@@ -195,15 +466,24 @@ Be concise and specific."""
         Returns:
             List of context lines
         """
-        lines = log_content.split('\n')
-
-        try:
-            error_index = lines.index(error_line)
-            start = max(0, error_index - context_lines)
-            end = min(len(lines), error_index + context_lines + 1)
-            return lines[start:end]
-        except ValueError:
-            return []
+        before: Deque[str] = deque(maxlen=context_lines)
+        context: List[str] = []
+        after = None
+
+        # Stream to the first occurrence instead of splitting the whole log
+        for line in iter_log_lines(log_content):
+            if after is not None:
+                if after >= context_lines:
+                    break
+                context.append(line)
+                after += 1
+            elif line == error_line or line.strip() == error_line:
+                context = list(before) + [line]
+                after = 0
+            else:
+                before.append(line)
+
+        return context
 
 
 class ErrorStatistics:
@@ -6,7 +6,7 @@ Production-ready components for error analysis, security validation, and automat
 from .analyzer import PRErrorAnalyzer, PRErrorFixer
 from .models import ModelSelector, ModelSpec
 from .observability import BudgetExceededError, CostTracker, LLMCost, ObservableOllamaAgent
-from .ollama_agent import OllamaAgent, OllamaQueryError
+from .ollama_agent import AsyncOllamaAgent, OllamaAgent, OllamaQueryError, QueryMetrics
 from .orchestrator import CodeReviewOrchestrator
 from .security import InputValidator, RateLimiter, SecurityError, SecurityValidator
 
@@ -20,7 +20,9 @@ __all__ = [
     'PRErrorAnalyzer',
     'PRErrorFixer',
     'OllamaAgent',
+    'AsyncOllamaAgent',
     'OllamaQueryError',
+    'QueryMetrics',
     # Observability
     'CostTracker',
     'LLMCost',
@@ -4,15 +4,19 @@ FIXES: Multiple conflicting OllamaAgent implementations
 CONSOLIDATES: ollama_agent.py and observability.py versions
 """
 
+import functools
+import json
 import os
 import threading
 import time
+from collections import deque
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 import requests
 import structlog
+from requests.adapters import HTTPAdapter
 
 logger = structlog.get_logger()
 
@@ -43,11 +47,34 @@ class LLMCost:
         return asdict(self)
 
 
+@functools.lru_cache(maxsize=1)
+def _load_tokenizer():
+    """Load tiktoken's cl100k_base encoding once; None if unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # tiktoken missing or its encoding data unavailable offline
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with a cached tokenizer, falling back to ~4 chars per token"""
+    if not text:
+        return 0
+    encoding = _load_tokenizer()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
 class CostTracker:
     """
     Track and enforce LLM usage budgets
 
-    Thread-safe implementation
+    Thread-safe implementation. Per-model totals are maintained incrementally,
+    so get_report() is O(models) regardless of how many calls were recorded.
+    Raw LLMCost records are kept in a ring buffer of ``max_records`` entries
+    (None = unbounded, 0 = disabled).
     """
 
     # Cost per 1M tokens (approximate for Ollama - adjust for your setup)
@@ -59,23 +86,43 @@ class CostTracker:
         "claude-3": 15.0,
     }
 
-    def __init__(self, budget_usd: float = 10.0):
+    def __init__(self, budget_usd: float = 10.0, max_records: Optional[int] = None):
         self.budget_usd = budget_usd
         self.total_cost = 0.0
-        self.costs: List[LLMCost] = []
+        self.total_calls = 0
+        self.total_tokens = 0
+        self.costs: Deque[LLMCost] = deque(maxlen=max_records)
+        self._by_model: Dict[str, Dict[str, Any]] = {}
         self._lock = threading.Lock()
 
+    @property
+    def budget_remaining(self) -> float:
+        # A single float read needs no lock
+        return self.budget_usd - self.total_cost
+
+    def is_over_budget(self) -> bool:
+        """Lock-free budget check for callers deciding whether to start a query"""
+        return self.total_cost > self.budget_usd
+
     def record_usage(
         self,
         model: str,
         prompt: str,
-        response: str
+        response: str,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None
     ) -> LLMCost:
-        """Record usage with cost calculation"""
-
-        # Estimate tokens (rough approximation: 1 token ≈ 4 chars)
-        prompt_tokens = len(prompt) // 4
-        completion_tokens = len(response) // 4
+        """
+        Record usage with cost calculation
+
+        Token counts reported by the server (Ollama's prompt_eval_count /
+        eval_count) are used when given; otherwise the text is tokenized.
+        """
+        # Tokenize and price outside the lock; only the counter updates are serialized
+        if prompt_tokens is None:
+            prompt_tokens = count_tokens(prompt)
+        if completion_tokens is None:
+            completion_tokens = count_tokens(response)
         total_tokens = prompt_tokens + completion_tokens
 
         # Calculate cost
@@ -93,17 +140,36 @@ class CostTracker:
 
         with self._lock:
             self.costs.append(cost)
+            self.total_calls += 1
+            self.total_tokens += total_tokens
             self.total_cost += estimated_cost
 
-            if self.total_cost > self.budget_usd:
-                logger.warning(
-                    "budget_exceeded",
-                    total_cost=self.total_cost,
-                    budget=self.budget_usd
-                )
-                raise BudgetExceededError(
-                    f"Budget exceeded: ${self.total_cost:.2f} > ${self.budget_usd:.2f}"
-                )
+            usage = self._by_model.get(model)
+            if usage is None:
+                usage = self._by_model[model] = {
+                    "calls": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "tokens": 0,
+                    "cost": 0.0
+                }
+            usage["calls"] += 1
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+            usage["tokens"] += total_tokens
+            usage["cost"] += estimated_cost
+
+            total_cost = self.total_cost
+
+        if total_cost > self.budget_usd:
+            logger.warning(
+                "budget_exceeded",
+                total_cost=total_cost,
+                budget=self.budget_usd
+            )
+            raise BudgetExceededError(
+                f"Budget exceeded: ${total_cost:.2f} > ${self.budget_usd:.2f}"
+            )
 
         logger.info(
             "llm_cost_recorded",
@@ -117,7 +183,7 @@ class CostTracker:
     def get_report(self) -> Dict[str, Any]:
         """Generate usage report"""
         with self._lock:
-            if not self.costs:
+            if not self.total_calls:
                 return {
                     "total_calls": 0,
                     "total_tokens": 0,
@@ -125,27 +191,13 @@ class CostTracker:
                     "budget_remaining": self.budget_usd
                 }
 
-            total_tokens = sum(c.total_tokens for c in self.costs)
-
-            by_model: Dict[str, Dict[str, Any]] = {}
-            for cost in self.costs:
-                if cost.model not in by_model:
-                    by_model[cost.model] = {
-                        "calls": 0,
-                        "tokens": 0,
-                        "cost": 0.0
-                    }
-                by_model[cost.model]["calls"] += 1
-                by_model[cost.model]["tokens"] += cost.total_tokens
-                by_model[cost.model]["cost"] += cost.estimated_cost
-
             return {
-                "total_calls": len(self.costs),
-                "total_tokens": total_tokens,
+                "total_calls": self.total_calls,
+                "total_tokens": self.total_tokens,
                 "total_cost": self.total_cost,
                 "budget_limit": self.budget_usd,
                 "budget_remaining": self.budget_usd - self.total_cost,
-                "usage_by_model": by_model
+                "usage_by_model": {model: dict(usage) for model, usage in self._by_model.items()}
             }
 
 
@@ -158,6 +210,165 @@ class OllamaQueryError(Exception):
     pass
 
 
+# ============================================================================
+# Streaming & Latency Metrics
+# ============================================================================
+
+# How long Ollama keeps a model loaded after a request ("10m", "1h", "-1" = forever)
+DEFAULT_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+CODE_FENCE = "```"
+
+
+@dataclass
+class QueryMetrics:
+    """Latency and token counts for a single Ollama generation"""
+    model: str
+    first_token_seconds: Optional[float]
+    total_seconds: float
+    prompt_eval_count: Optional[int] = None
+    eval_count: Optional[int] = None
+    streamed: bool = False
+    aborted_early: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class StreamAccumulator:
+    """
+    Accumulate Ollama's NDJSON generate stream chunk by chunk
+
+    Fences are counted incrementally (including fences split across chunks),
+    so detecting a closed code block costs O(chunk) rather than rescanning
+    the accumulated text on every line.
+    """
+
+    def __init__(self, stop_at_code_block: bool = False):
+        self.stop_at_code_block = stop_at_code_block
+        self.parts: List[str] = []
+        self.first_token_at: Optional[float] = None
+        self.final: Dict[str, Any] = {}
+        self.aborted_early = False
+        self._fences = 0
+        self._tail = ""
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    @property
+    def done(self) -> bool:
+        return bool(self.final) or self.aborted_early
+
+    def feed(self, line) -> bool:
+        """
+        Consume one NDJSON line; returns True when the caller should abort early
+
+        The final ``done`` line only records stats: the caller keeps reading so
+        the response is drained and its connection returns to the pool.
+        """
+        data = json.loads(line)
+        if "error" in data:
+            raise OllamaQueryError(f"Ollama error: {data['error']}")
+
+        chunk = data.get("response", "")
+        if chunk:
+            if self.first_token_at is None:
+                self.first_token_at = time.perf_counter()
+            self.parts.append(chunk)
+            if self.stop_at_code_block and self._closes_code_block(chunk):
+                self.aborted_early = True
+                return True
+
+        if data.get("done"):
+            self.final = data
+        return False
+
+    def _closes_code_block(self, chunk: str) -> bool:
+        window = self._tail + chunk
+        self._fences += window.count(CODE_FENCE)
+        # Carry up to two trailing backticks that are not part of a counted fence
+        last = window.rfind(CODE_FENCE)
+        keep_from = max(len(window) - 2, last + len(CODE_FENCE) if last != -1 else 0)
+        self._tail = window[keep_from:]
+        return self._fences >= 2
+
+
+def build_payload(
+    model: str,
+    prompt: str,
+    temperature: float,
+    stream: bool,
+    keep_alive: Optional[str]
+) -> Dict[str, Any]:
+    """Build an /api/generate request body"""
+    payload: Dict[str, Any] = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream,
+        "options": {"temperature": temperature},
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def build_metrics(
+    model: str,
+    start: float,
+    data: Dict[str, Any],
+    first_token_at: Optional[float] = None,
+    streamed: bool = False,
+    aborted_early: bool = False
+) -> QueryMetrics:
+    """Build QueryMetrics from timestamps and Ollama's final response object"""
+    return QueryMetrics(
+        model=model,
+        first_token_seconds=(first_token_at - start) if first_token_at is not None else None,
+        total_seconds=time.perf_counter() - start,
+        prompt_eval_count=data.get("prompt_eval_count"),
+        eval_count=data.get("eval_count"),
+        streamed=streamed,
+        aborted_early=aborted_early,
+    )
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize_latency(metrics: Iterable[QueryMetrics]) -> Dict[str, Any]:
+    """p50/p95 first-token and total latency over recorded queries"""
+    metrics = list(metrics)
+    if not metrics:
+        return {"calls": 0}
+
+    totals = [m.total_seconds for m in metrics]
+    first_tokens = [m.first_token_seconds for m in metrics if m.first_token_seconds is not None]
+    summary: Dict[str, Any] = {
+        "calls": len(metrics),
+        "aborted_early": sum(1 for m in metrics if m.aborted_early),
+        "total_p50": _percentile(totals, 0.5),
+        "total_p95": _percentile(totals, 0.95),
+    }
+    if first_tokens:
+        summary["first_token_p50"] = _percentile(first_tokens, 0.5)
+        summary["first_token_p95"] = _percentile(first_tokens, 0.95)
+    return summary
+
+
+def build_session(pool_maxsize: int = 8) -> requests.Session:
+    """requests.Session with a keep-alive connection pool sized for concurrent callers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 # ============================================================================
 # Canonical OllamaAgent
 # ============================================================================
@@ -172,18 +383,33 @@ class OllamaAgent:
     - ✅ Cost tracking & budget enforcement
     - ✅ Proper error handling (raises exceptions)
     - ✅ Thread-safe
+    - ✅ Pooled keep-alive connections (one Session per agent)
+    - ✅ Streaming NDJSON with optional early abort after a code block
+    - ✅ First-token / total latency metrics
     """
 
     def __init__(
         self,
         model: str = "codellama",
         base_url: str = "http://localhost:11434",
-        cost_tracker: Optional[CostTracker] = None
+        cost_tracker: Optional[CostTracker] = None,
+        keep_alive: Optional[str] = DEFAULT_KEEP_ALIVE,
+        stream: bool = True,
+        stop_at_code_block: bool = False,
+        session: Optional[requests.Session] = None,
+        pool_maxsize: int = 8,
+        metrics_window: int = 256
     ):
         self.model = model
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.cost_tracker = cost_tracker or CostTracker()
+        self.keep_alive = keep_alive
+        self.stream = stream
+        self.stop_at_code_block = stop_at_code_block
+        self.session = session or build_session(pool_maxsize)
+        self.metrics: Deque[QueryMetrics] = deque(maxlen=metrics_window)
+        self.last_metrics: Optional[QueryMetrics] = None
 
         # Initialize OpenLIT if available
         if OPENLIT_AVAILABLE:
@@ -201,11 +427,14 @@ class OllamaAgent:
         prompt: str,
         temperature: float = 0.2,
         timeout: int = 120,
-        trace_id: Optional[str] = None
+        trace_id: Optional[str] = None,
+        stop_at_code_block: Optional[bool] = None
     ) -> str:
         """Query with full observability and tracing"""
         start_time = time.time()
         trace_id = trace_id or str(time.time())
+        if stop_at_code_block is None:
+            stop_at_code_block = self.stop_at_code_block
 
         logger.info(
             "ollama_query_start",
@@ -215,6 +444,12 @@ class OllamaAgent:
         )
 
         try:
+            # Fail fast without taking the tracker lock once the budget is spent
+            if self.cost_tracker.is_over_budget():
+                raise BudgetExceededError(
+                    f"Budget exhausted: ${self.cost_tracker.total_cost:.2f} > ${self.cost_tracker.budget_usd:.2f}"
+                )
+
             if OPENLIT_AVAILABLE:
                 with openlit.trace(
                     name="ollama_query",
@@ -225,23 +460,28 @@ class OllamaAgent:
                         "trace_id": trace_id
                     }
                 ):
-                    response_text = self._make_request(prompt, temperature, timeout)
+                    response_text, metrics = self._generate(prompt, temperature, timeout, stop_at_code_block)
             else:
-                response_text = self._make_request(prompt, temperature, timeout)
+                response_text, metrics = self._generate(prompt, temperature, timeout, stop_at_code_block)
 
-            duration = time.time() - start_time
+            self._record_metrics(metrics)
 
             # Record usage
             self.cost_tracker.record_usage(
                 model=self.model,
                 prompt=prompt,
-                response=response_text
+                response=response_text,
+                prompt_tokens=metrics.prompt_eval_count,
+                completion_tokens=metrics.eval_count
             )
 
             logger.info(
                 "ollama_query_success",
                 model=self.model,
-                duration=duration,
+                duration=time.time() - start_time,
+                first_token_seconds=metrics.first_token_seconds,
+                total_seconds=metrics.total_seconds,
+                aborted_early=metrics.aborted_early,
                 response_length=len(response_text)
             )
 
@@ -260,23 +500,203 @@ class OllamaAgent:
 
     def _make_request(self, prompt: str, temperature: float, timeout: int) -> str:
         """Make HTTP request to Ollama"""
-        response = requests.post(
-            self.api_url,
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "temperature": temperature
-            },
-            timeout=timeout
+        response_text, _ = self._generate(prompt, temperature, timeout, self.stop_at_code_block)
+        return response_text
+
+    def _generate(
+        self,
+        prompt: str,
+        temperature: float,
+        timeout: int,
+        stop_at_code_block: bool = False
+    ) -> Tuple[str, QueryMetrics]:
+        """Run one generation over the pooled session, streaming if enabled"""
+        payload = build_payload(self.model, prompt, temperature, self.stream, self.keep_alive)
+        start = time.perf_counter()
+
+        if not self.stream:
+            response = self.session.post(self.api_url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+            if "response" not in data:
+                raise OllamaQueryError(f"Invalid response format: {data}")
+            return data["response"], build_metrics(self.model, start, data)
+
+        accumulator = StreamAccumulator(stop_at_code_block)
+        # Leaving the context early closes the connection, which stops generation server-side
+        with self.session.post(self.api_url, json=payload, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line and accumulator.feed(line):
+                    break
+
+        if not accumulator.done:
+            raise OllamaQueryError("Ollama stream ended before completion")
+
+        return accumulator.text, build_metrics(
+            self.model, start, accumulator.final,
+            first_token_at=accumulator.first_token_at,
+            streamed=True,
+            aborted_early=accumulator.aborted_early
+        )
+
+    def _record_metrics(self, metrics: QueryMetrics) -> None:
+        # deque.append is atomic, so concurrent queries need no extra lock
+        self.metrics.append(metrics)
+        self.last_metrics = metrics
+
+    def latency_summary(self) -> Dict[str, Any]:
+        """p50/p95 first-token and total latency over the recent metrics window"""
+        return summarize_latency(self.metrics)
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.session.close()
+
+
+class AsyncOllamaAgent:
+    """
+    asyncio Ollama agent over a pooled httpx.AsyncClient
+
+    Mirrors OllamaAgent (streaming, early abort, keep_alive, cost tracking and
+    latency metrics) for callers that fan out many queries on one event loop.
+    Requires httpx (``pip install pr-fix-agent[async]``).
+    """
+
+    def __init__(
+        self,
+        model: str = "codellama",
+        base_url: str = "http://localhost:11434",
+        cost_tracker: Optional[CostTracker] = None,
+        keep_alive: Optional[str] = DEFAULT_KEEP_ALIVE,
+        stream: bool = True,
+        stop_at_code_block: bool = False,
+        client: Any = None,
+        max_connections: int = 8,
+        metrics_window: int = 256
+    ):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("AsyncOllamaAgent requires httpx: pip install 'pr-fix-agent[async]'") from e
+
+        self.model = model
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api/generate"
+        self.cost_tracker = cost_tracker or CostTracker()
+        self.keep_alive = keep_alive
+        self.stream = stream
+        self.stop_at_code_block = stop_at_code_block
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.metrics: Deque[QueryMetrics] = deque(maxlen=metrics_window)
+        self.last_metrics: Optional[QueryMetrics] = None
+
+    async def query(
+        self,
+        prompt: str,
+        temperature: float = 0.2,
+        timeout: int = 120,
+        trace_id: Optional[str] = None,
+        stop_at_code_block: Optional[bool] = None
+    ) -> str:
+        """Query Ollama without blocking the event loop"""
+        start_time = time.time()
+        trace_id = trace_id or str(time.time())
+        if stop_at_code_block is None:
+            stop_at_code_block = self.stop_at_code_block
+
+        logger.info(
+            "ollama_query_start",
+            model=self.model,
+            prompt_length=len(prompt),
+            trace_id=trace_id
+        )
+
+        try:
+            if self.cost_tracker.is_over_budget():
+                raise BudgetExceededError(
+                    f"Budget exhausted: ${self.cost_tracker.total_cost:.2f} > ${self.cost_tracker.budget_usd:.2f}"
+                )
+
+            response_text, metrics = await self._generate(prompt, temperature, timeout, stop_at_code_block)
+            self.metrics.append(metrics)
+            self.last_metrics = metrics
+
+            self.cost_tracker.record_usage(
+                model=self.model,
+                prompt=prompt,
+                response=response_text,
+                prompt_tokens=metrics.prompt_eval_count,
+                completion_tokens=metrics.eval_count
+            )
+
+            logger.info(
+                "ollama_query_success",
+                model=self.model,
+                duration=time.time() - start_time,
+                first_token_seconds=metrics.first_token_seconds,
+                total_seconds=metrics.total_seconds,
+                aborted_early=metrics.aborted_early,
+                response_length=len(response_text)
+            )
+
+            return response_text
+
+        except Exception as e:
+            logger.error(
+                "ollama_query_failed",
+                model=self.model,
+                error=str(e),
+                duration=time.time() - start_time
+            )
+            if isinstance(e, (BudgetExceededError, OllamaQueryError)):
+                raise
+            raise OllamaQueryError(str(e)) from e
+
+    async def _generate(
+        self,
+        prompt: str,
+        temperature: float,
+        timeout: int,
+        stop_at_code_block: bool = False
+    ) -> Tuple[str, QueryMetrics]:
+        payload = build_payload(self.model, prompt, temperature, self.stream, self.keep_alive)
+        start = time.perf_counter()
+
+        if not self.stream:
+            response = await self.client.post(self.api_url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+            if "response" not in data:
+                raise OllamaQueryError(f"Invalid response format: {data}")
+            return data["response"], build_metrics(self.model, start, data)
+
+        accumulator = StreamAccumulator(stop_at_code_block)
+        async with self.client.stream("POST", self.api_url, json=payload, timeout=timeout) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line and accumulator.feed(line):
+                    break
+
+        if not accumulator.done:
+            raise OllamaQueryError("Ollama stream ended before completion")
+
+        return accumulator.text, build_metrics(
+            self.model, start, accumulator.final,
+            first_token_at=accumulator.first_token_at,
+            streamed=True,
+            aborted_early=accumulator.aborted_early
         )
-        response.raise_for_status()
-        data = response.json()
 
-        if "response" not in data:
-            raise OllamaQueryError(f"Invalid response format: {data}")
+    def latency_summary(self) -> Dict[str, Any]:
+        """p50/p95 first-token and total latency over the recent metrics window"""
+        return summarize_latency(self.metrics)
 
-        return data["response"]
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self.client.aclose()
 
 
 class MockOllamaAgent:
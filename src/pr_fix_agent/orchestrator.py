@@ -5,11 +5,16 @@ Issue Fixed: Complete LLM-powered code review pipeline
 
 import argparse
 import json
+import os
 import subprocess
 import sys
-from dataclasses import asdict, dataclass
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import structlog
 
@@ -49,12 +54,13 @@ class FixProposal:
 
 @dataclass
 class CodeFix:
-    """Code fix from coding model"""
+    """Code fix from coding model (one per file; `proposals` lists every finding it addresses)"""
     proposal: FixProposal
     file_path: str
     original_code: str
     fixed_code: str
     explanation: str
+    proposals: List[FixProposal] = field(default_factory=list)
 
 
 @dataclass
@@ -69,6 +75,72 @@ class TestResult:
     failures: List[str]
 
 
+@dataclass
+class StageTiming:
+    """Timing for one pipeline stage"""
+    calls: int = 0
+    busy_seconds: float = 0.0  # Sum of individual call durations
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+        }
+
+
+class PipelineTimings:
+    """Thread-safe per-stage timing collector"""
+
+    def __init__(self):
+        self.stages: Dict[str, StageTiming] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, start: float, end: float):
+        with self._lock:
+            timing = self.stages.setdefault(stage, StageTiming())
+            timing.calls += 1
+            timing.busy_seconds += end - start
+            timing.first_start = start if timing.first_start is None else min(timing.first_start, start)
+            timing.last_end = end if timing.last_end is None else max(timing.last_end, end)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            total = (self.finished or time.perf_counter()) - self.started
+            return {
+                "total_seconds": round(total, 3),
+                "stages": {name: timing.to_dict() for name, timing in self.stages.items()},
+            }
+
+
+def extract_code_block(text: str) -> str:
+    """Return the contents of fenced code blocks in `text`, or `text` unchanged if there are none"""
+    if "```" not in text:
+        return text
+    code_lines = []
+    in_block = False
+    for line in text.split('\n'):
+        if line.startswith("```"):
+            in_block = not in_block
+            continue
+        if in_block:
+            code_lines.append(line)
+    return '\n'.join(code_lines) if code_lines else text
+
+
 # ============================================================================
 # Multi-Agent Orchestrator
 # ============================================================================
@@ -82,39 +154,73 @@ class CodeReviewOrchestrator:
         self,
         reasoning_model: str = "deepseek-r1:1.5b",
         coding_model: str = "qwen2.5-coder:1.5b",
-        cost_tracker: Optional[CostTracker] = None
+        cost_tracker: Optional[CostTracker] = None,
+        max_parallel_per_model: Optional[int] = None
     ):
         self.cost_tracker = cost_tracker or CostTracker(budget_usd=10.0)
 
+        # Ollama serves OLLAMA_NUM_PARALLEL concurrent requests per loaded model
+        self.max_parallel_per_model = max_parallel_per_model or int(os.getenv("OLLAMA_NUM_PARALLEL", "2"))
+        self._model_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._model_slots_lock = threading.Lock()
+        self.last_timings: Dict[str, Any] = {}
+
         # Initialize agents
         self.reasoning_agent = ObservableOllamaAgent(
             model=reasoning_model,
             cost_tracker=self.cost_tracker
         )
 
+        # Coding answers are a single fenced file; stop generating once it closes
         self.coding_agent = ObservableOllamaAgent(
             model=coding_model,
-            cost_tracker=self.cost_tracker
+            cost_tracker=self.cost_tracker,
+            stop_at_code_block=True
         )
 
         logger.info(
             "orchestrator_initialized",
             reasoning_model=reasoning_model,
-            coding_model=coding_model
+            coding_model=coding_model,
+            max_parallel_per_model=self.max_parallel_per_model
         )
 
-    def _generate_fix_proposals(self, findings: List[CodeReviewFinding]) -> List[FixProposal]:
-        """Use reasoning model to analyze findings and propose fixes"""
-        proposals = []
-        for finding in findings:
-            prompt = self._create_reasoning_prompt(finding)
+    def _slots_for(self, model: str) -> threading.BoundedSemaphore:
+        """Per-model concurrency limit, shared by every stage that uses the model"""
+        with self._model_slots_lock:
+            if model not in self._model_slots:
+                self._model_slots[model] = threading.BoundedSemaphore(self.max_parallel_per_model)
+            return self._model_slots[model]
+
+    def _timed_query(self, stage: str, agent: Any, prompt: str, temperature: float,
+                     timings: PipelineTimings) -> str:
+        with self._slots_for(agent.model):
+            start = time.perf_counter()
             try:
-                analysis = self.reasoning_agent.query(prompt, temperature=0.1)
-                proposal = self._parse_reasoning_response(finding, analysis)
-                proposals.append(proposal)
-            except Exception as e:
-                logger.error("reasoning_failed", file=finding.file, error=str(e))
-        return proposals
+                return agent.query(prompt, temperature=temperature)
+            finally:
+                timings.record(stage, start, time.perf_counter())
+
+    def _propose(self, finding: CodeReviewFinding, timings: PipelineTimings) -> Optional[FixProposal]:
+        prompt = self._create_reasoning_prompt(finding)
+        try:
+            analysis = self._timed_query("reasoning", self.reasoning_agent, prompt, 0.1, timings)
+            return self._parse_reasoning_response(finding, analysis)
+        except Exception as e:
+            logger.error("reasoning_failed", file=finding.file, error=str(e))
+            return None
+
+    def _stage_pool(self, name: str) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_parallel_per_model, thread_name_prefix=name)
+
+    def _generate_fix_proposals(self, findings: List[CodeReviewFinding]) -> List[FixProposal]:
+        """Use reasoning model to analyze findings and propose fixes (concurrently, in input order)"""
+        timings = PipelineTimings()
+        with self._stage_pool("reasoning") as pool:
+            results = list(pool.map(lambda finding: self._propose(finding, timings), findings))
+        timings.finish()
+        self._report_timings(timings)
+        return [proposal for proposal in results if proposal is not None]
 
     def _create_reasoning_prompt(self, finding: CodeReviewFinding) -> str:
         return f"""Analyze this code review finding and provide root cause and fix approach.
@@ -135,46 +241,110 @@ Snippet: {finding.code_snippet}
             test_requirements=["Verify with existing tests"]
         )
 
-    def _implement_fixes(self, proposals: List[FixProposal], repo_path: Path) -> List[CodeFix]:
-        """Use coding model to implement fixes"""
-        fixes = []
+    @staticmethod
+    def _group_by_file(proposals: List[FixProposal]) -> "OrderedDict[str, List[FixProposal]]":
+        groups: "OrderedDict[str, List[FixProposal]]" = OrderedDict()
         for proposal in proposals:
-            file_path = repo_path / proposal.finding.file
-            if not file_path.exists():
-                logger.warning("file_not_found", file=str(file_path))
-                continue
-            original_code = file_path.read_text()
-            prompt = self._create_coding_prompt(proposal, original_code)
-            try:
-                fixed_code = self.coding_agent.query(prompt, temperature=0.2)
-                # Simple markdown cleanup
-                if "```" in fixed_code:
-                    lines = fixed_code.split('\n')
-                    code_lines = []
-                    in_block = False
-                    for line in lines:
-                        if line.startswith("```"):
-                            in_block = not in_block
-                            continue
-                        if in_block:
-                            code_lines.append(line)
-                    if code_lines:
-                        fixed_code = '\n'.join(code_lines)
-
-                fixes.append(CodeFix(
-                    proposal=proposal,
-                    file_path=str(file_path),
-                    original_code=original_code,
-                    fixed_code=fixed_code,
-                    explanation="Automated fix implementation"
-                ))
-            except Exception as e:
-                logger.error("coding_failed", file=proposal.finding.file, error=str(e))
-        return fixes
+            groups.setdefault(proposal.finding.file, []).append(proposal)
+        return groups
+
+    def _implement_file(self, file: str, proposals: List[FixProposal], repo_path: Path,
+                        timings: PipelineTimings) -> Optional[CodeFix]:
+        """Fix every finding in one file with a single coding call"""
+        file_path = repo_path / file
+        if not file_path.exists():
+            logger.warning("file_not_found", file=str(file_path))
+            return None
+        original_code = file_path.read_text()
+        if len(proposals) == 1:
+            prompt = self._create_coding_prompt(proposals[0], original_code)
+        else:
+            prompt = self._create_file_coding_prompt(proposals, original_code)
+        try:
+            fixed_code = self._timed_query("coding", self.coding_agent, prompt, 0.2, timings)
+            return CodeFix(
+                proposal=proposals[0],
+                file_path=str(file_path),
+                original_code=original_code,
+                fixed_code=extract_code_block(fixed_code),
+                explanation="Automated fix implementation",
+                proposals=list(proposals)
+            )
+        except Exception as e:
+            logger.error("coding_failed", file=file, error=str(e))
+            return None
+
+    def _implement_fixes(self, proposals: List[FixProposal], repo_path: Path) -> List[CodeFix]:
+        """Use coding model to implement fixes: one call per file, files in parallel"""
+        timings = PipelineTimings()
+        groups = self._group_by_file(proposals)
+        with self._stage_pool("coding") as pool:
+            futures = [
+                pool.submit(self._implement_file, file, group, repo_path, timings)
+                for file, group in groups.items()
+            ]
+            fixes = [future.result() for future in futures]
+        timings.finish()
+        self._report_timings(timings)
+        return [fix for fix in fixes if fix is not None]
+
+    def run_pipeline(self, findings: List[CodeReviewFinding], repo_path: Path) -> Dict[str, Any]:
+        """
+        Propose and implement fixes as an overlapped two-stage pipeline.
+
+        Findings are grouped by file and all reasoning calls are queued up front. As soon
+        as every proposal for a file is ready, that file's single coding call is queued,
+        so coding for one file overlaps reasoning for the next. Each model is limited to
+        `max_parallel_per_model` concurrent requests.
+
+        Returns:
+            Dict with "proposals", "fixes" and per-stage "timings".
+        """
+        timings = PipelineTimings()
+        groups: "OrderedDict[str, List[CodeReviewFinding]]" = OrderedDict()
+        for finding in findings:
+            groups.setdefault(finding.file, []).append(finding)
+
+        proposals_by_file: Dict[str, List[FixProposal]] = {}
+        coding_futures: List[Future] = []
+        with self._stage_pool("reasoning") as reasoning_pool, \
+                self._stage_pool("coding") as coding_pool:
+            reasoning_futures = {
+                file: [reasoning_pool.submit(self._propose, finding, timings) for finding in group]
+                for file, group in groups.items()
+            }
+            for file, futures in reasoning_futures.items():
+                file_proposals = [p for p in (future.result() for future in futures) if p is not None]
+                proposals_by_file[file] = file_proposals
+                if file_proposals:
+                    coding_futures.append(
+                        coding_pool.submit(self._implement_file, file, file_proposals, repo_path, timings)
+                    )
+            fixes = [fix for fix in (future.result() for future in coding_futures) if fix is not None]
+
+        timings.finish()
+        self._report_timings(timings)
+        proposals = [p for file in groups for p in proposals_by_file[file]]
+        return {"proposals": proposals, "fixes": fixes, "timings": self.last_timings}
+
+    def _report_timings(self, timings: PipelineTimings):
+        self.last_timings = timings.to_dict()
+        logger.info("pipeline_timings", **self.last_timings)
 
     def _create_coding_prompt(self, proposal: FixProposal, code: str) -> str:
         return f"Fix the following Python code:\n```python\n{code}\n```\nReason: {proposal.fix_approach}\nFinding: {proposal.finding.issue}"
 
+    def _create_file_coding_prompt(self, proposals: List[FixProposal], code: str) -> str:
+        findings = "\n".join(
+            f"{i}. Lines {p.finding.line_start}-{p.finding.line_end}: {p.finding.issue}\n   Reason: {p.fix_approach}"
+            for i, p in enumerate(proposals, 1)
+        )
+        return (
+            f"Fix the following Python code:\n```python\n{code}\n```\n"
+            f"Address all of these findings and return the complete fixed file "
+            f"as a single ```python code block:\n{findings}"
+        )
+
     def _apply_and_test(self, fixes: List[CodeFix], repo_path: Path) -> TestResult:
         """Apply fixes and run tests"""
         for fix in fixes:
@@ -229,9 +399,44 @@ Snippet: {finding.code_snippet}
         return body
 
 
+def load_findings(findings_dir: Path) -> List[CodeReviewFinding]:
+    """Load findings from Bandit/Ruff-style JSON reports in `findings_dir`"""
+    findings = []
+    if findings_dir.exists():
+        for f_path in findings_dir.glob("*.json"):
+            try:
+                with open(f_path) as f:
+                    data = json.load(f)
+                    if isinstance(data, list):
+                        for issue in data:
+                            findings.append(CodeReviewFinding(
+                                file=issue.get('filename', 'unknown'),
+                                line_start=issue.get('line_number', 1),
+                                line_end=issue.get('line_number', 1),
+                                severity=issue.get('issue_severity', 'medium').lower(),
+                                category='security',
+                                issue=issue.get('issue_text', 'Potential security issue'),
+                                suggestion=issue.get('suggestion', 'Follow best practices')
+                            ))
+                    elif isinstance(data, dict) and 'results' in data:
+                        for issue in data['results']:
+                            findings.append(CodeReviewFinding(
+                                file=issue.get('filename', issue.get('path', 'unknown')),
+                                line_start=issue.get('line_number', issue.get('location', {}).get('row', 1)),
+                                line_end=issue.get('line_number', issue.get('location', {}).get('row', 1)),
+                                severity='high',
+                                category='lint',
+                                issue=issue.get('issue_text', issue.get('message', 'Issue found')),
+                                suggestion='Fix as recommended'
+                            ))
+            except Exception as e:
+                logger.warning("parsing_finding_failed", path=str(f_path), error=str(e))
+    return findings
+
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument('--mode', required=True, choices=['reasoning', 'coding', 'generate-pr'])
+    parser.add_argument('--mode', required=True, choices=['reasoning', 'coding', 'pipeline', 'generate-pr'])
     parser.add_argument('--findings', help='Path to findings directory')
     parser.add_argument('--proposals', help='Path to proposals JSON')
     parser.add_argument('--test-results', help='Path to test results JSON')
@@ -247,43 +452,18 @@ def main():
     )
     repo_path = Path.cwd()
 
-    if args.mode == 'reasoning':
-        findings = []
-        findings_dir = Path(args.findings or "analysis-results")
-        if findings_dir.exists():
-            for f_path in findings_dir.glob("*.json"):
-                try:
-                    with open(f_path) as f:
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            for issue in data:
-                                findings.append(CodeReviewFinding(
-                                    file=issue.get('filename', 'unknown'),
-                                    line_start=issue.get('line_number', 1),
-                                    line_end=issue.get('line_number', 1),
-                                    severity=issue.get('issue_severity', 'medium').lower(),
-                                    category='security',
-                                    issue=issue.get('issue_text', 'Potential security issue'),
-                                    suggestion=issue.get('suggestion', 'Follow best practices')
-                                ))
-                        elif isinstance(data, dict) and 'results' in data:
-                             for issue in data['results']:
-                                findings.append(CodeReviewFinding(
-                                    file=issue.get('filename', issue.get('path', 'unknown')),
-                                    line_start=issue.get('line_number', issue.get('location', {}).get('row', 1)),
-                                    line_end=issue.get('line_number', issue.get('location', {}).get('row', 1)),
-                                    severity='high',
-                                    category='lint',
-                                    issue=issue.get('issue_text', issue.get('message', 'Issue found')),
-                                    suggestion='Fix as recommended'
-                                ))
-                except Exception as e:
-                    logger.warning("parsing_finding_failed", path=str(f_path), error=str(e))
-
+    if args.mode in ('reasoning', 'pipeline'):
+        findings = load_findings(Path(args.findings or "analysis-results"))
         if not findings:
             logger.info("no_findings_found")
 
-        proposals = orch._generate_fix_proposals(findings)
+        if args.mode == 'pipeline':
+            result = orch.run_pipeline(findings, repo_path)
+            proposals = result["proposals"]
+            if args.apply:
+                orch._apply_and_test(result["fixes"], repo_path)
+        else:
+            proposals = orch._generate_fix_proposals(findings)
         with open(args.output or "proposals.json", 'w') as f:
             json.dump([asdict(p) for p in proposals], f, indent=2)
 
@@ -1,5 +1,9 @@
+import json
 import os
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -13,3 +17,99 @@ def client():
 
     from app.main import app
     return TestClient(app)
+
+
+class StubOllama:
+    """
+    Minimal /api/generate server that streams scripted chunks as NDJSON
+
+    ``delay`` is slept before each response and ``chunk_delay`` after each
+    streamed line; ``serial`` handles one request at a time. ``done_stats``
+    replaces the eval statistics sent with the final (or non-streamed) line,
+    and ``error`` replaces that line with an Ollama error object.
+    """
+
+    def __init__(self, chunks, error=None, delay=0.0, chunk_delay=0.0, serial=False, done_stats=None):
+        self.chunks = list(chunks)
+        self.error = error
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.done_stats = {"prompt_eval_count": 7, "eval_count": len(self.chunks)} if done_stats is None \
+            else done_stats
+        self.gate = threading.Lock() if serial else None
+        self.payloads = []
+        self.clients = set()
+        self.chunks_sent = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.payloads.append(body)
+                stub.clients.add(self.client_address)
+                if stub.gate:
+                    with stub.gate:
+                        self.respond(body)
+                else:
+                    self.respond(body)
+
+            def respond(self, body):
+                time.sleep(stub.delay)
+                if not body.get("stream", True):
+                    data = json.dumps({"response": "".join(stub.chunks), "done": True, **stub.done_stats}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                lines = [{"response": chunk, "done": False} for chunk in stub.chunks]
+                lines.append({"error": stub.error} if stub.error else {"response": "", "done": True, **stub.done_stats})
+                try:
+                    for line in lines:
+                        data = (json.dumps(line) + "\n").encode()
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                        self.wfile.flush()
+                        stub.chunks_sent += 1
+                        time.sleep(stub.chunk_delay)
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def prompts(self):
+        return [payload["prompt"] for payload in self.payloads]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def ollama_stub():
+    """Factory for StubOllama servers, shut down after the test"""
+    servers = []
+
+    def make(chunks, **kwargs):
+        server = StubOllama(chunks, **kwargs)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.close()
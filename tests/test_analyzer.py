@@ -8,7 +8,7 @@ from unittest.mock import Mock
 import pytest
 
 # ✅ CORRECT: Import from pr_fix_agent (the actual package name)
-from pr_fix_agent.analyzer import PRErrorAnalyzer
+from pr_fix_agent.analyzer import PRErrorAnalyzer, SafeRegex, UnsafePatternError, check_pattern
 
 
 class TestPRErrorAnalyzerReal:
@@ -46,5 +46,64 @@ Code changes: Add to requirements.txt""")
         assert result == "Root cause: THE ISSUE IS HERE"
 
 
+class TestSafeRegex:
+    """ReDoS screening, compile cache and batch scanning"""
+
+    @pytest.mark.parametrize("pattern", [
+        r"(a+)+$",
+        r"(\w+\s?)*",
+        r"(x*)*",
+        r"(a|ab)+",
+        r"(\d|[0-5]x)+",
+        r"(.*a){12}x",
+        r"(\d|[0-5]x){2,5}",
+        r"(.)\1",
+        r"foo(?=bar)",
+    ])
+    def test_dangerous_patterns_rejected(self, pattern):
+        with pytest.raises(UnsafePatternError):
+            check_pattern(pattern)
+
+    @pytest.mark.parametrize("pattern", [
+        SafeRegex.FILE_NOT_FOUND,
+        SafeRegex.MODULE_NOT_FOUND,
+        r"(?:ab|cd)+",
+        r"(?:\d\d\d\.){3}\d{1,3}",
+        r"(?:a+b)?c",
+        r"[A-Z]\w+(?:Error|Exception)",
+    ])
+    def test_safe_patterns_accepted(self, pattern):
+        check_pattern(pattern)
+
+    def test_safe_search_is_case_insensitive_and_cached(self):
+        match = SafeRegex.safe_search(SafeRegex.MODULE_NOT_FOUND, "no MODULE named 'yaml'")
+
+        assert match.group(1) == "yaml"
+        assert SafeRegex.compile(SafeRegex.MODULE_NOT_FOUND) is SafeRegex.compile(SafeRegex.MODULE_NOT_FOUND)
+
+    def test_safe_search_rejects_unsafe_pattern(self):
+        with pytest.raises(UnsafePatternError):
+            SafeRegex.safe_search(r"(a+)+b", "a" * 30)
+
+    def test_scan_whole_buffer(self):
+        log = "\n".join([
+            "ok",
+            "ModuleNotFoundError: No module named 'requests'",
+            "FileNotFoundError: 'config.yaml' not found",
+            "ok",
+            "ModuleNotFoundError: No module named 'numpy'",
+        ] * 1000)
+
+        results = SafeRegex.scan(
+            {"module": SafeRegex.MODULE_NOT_FOUND, "file": SafeRegex.FILE_NOT_FOUND},
+            log,
+        )
+
+        assert len(results["module"]) == 2000
+        assert {m.group(1) for m in results["module"]} == {"requests", "numpy"}
+        assert [m.group(1) for m in results["file"][:1]] == ["config.yaml"]
+        assert len(SafeRegex.search_all(SafeRegex.MODULE_NOT_FOUND, log, max_matches=3)) == 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
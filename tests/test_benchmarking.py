@@ -0,0 +1,200 @@
+"""
+Tests for the OllamaBenchmarker harness: warmup, repetitions, statistics and concurrency sweep
+"""
+
+import json
+from itertools import combinations
+
+import pytest
+
+import benchmarking_real as bench
+
+RESPONSE = ['```python\ndef add_numbers(a, b):\n', '    """Add"""\n    return a + b\n```']
+
+# Ollama's eval statistics: 40 tokens in 0.5s (80 tok/s) after a 2s model load
+EVAL_STATS = {"eval_count": 40, "eval_duration": 500_000_000, "load_duration": 2_000_000_000}
+
+
+@pytest.fixture
+def stub(ollama_stub):
+    return ollama_stub(RESPONSE, delay=0.01, done_stats=EVAL_STATS)
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0]
+
+    assert bench.percentile(values, 50) == 2.5
+    assert bench.percentile(values, 100) == 4.0
+    assert bench.percentile([], 95) == 0.0
+
+
+def test_summary_is_reproducible_and_ci_brackets_estimate():
+    values = [0.9, 1.0, 1.1, 1.2, 5.0, 1.05, 0.95, 1.15]
+
+    summary = bench.summarize(values)
+
+    assert summary == bench.summarize(values)
+    assert summary["n"] == 8 and summary["max"] == 5.0
+    low, high = summary["p50_ci95"]
+    assert low <= summary["p50"] <= high
+    assert summary["p50"] < summary["p95"] <= summary["p99"] <= 5.0
+    assert bench.summarize([None]) == {"n": 0}
+
+
+def test_generation_uses_server_eval_stats(stub):
+    benchmarker = bench.OllamaBenchmarker(stub.url)
+
+    result = benchmarker.generate("m", "p")
+
+    assert result.text == "".join(RESPONSE)
+    assert result.eval_count == 40 and result.tokens_per_sec == pytest.approx(80.0)
+    assert result.load_duration == pytest.approx(2.0)
+    assert 0 < result.ttft <= result.elapsed
+    assert benchmarker.query_timed("m", "p")[2] == 40
+
+
+def test_suite_warms_up_and_repeats_each_case(stub):
+    benchmarker = bench.OllamaBenchmarker(stub.url, repetitions=3, warmup_runs=2)
+    cases = bench.BENCHMARK_CASES[:2]
+
+    metrics = benchmarker.run_benchmark_suite("m", cases)
+
+    assert stub.prompts[:2] == ["Reply with OK."] * 2
+    assert len(stub.prompts) == 2 + 3 * len(cases)
+    assert [m.repetition for m in metrics] == [0, 1, 2, 0, 1, 2]
+    assert benchmarker.warmup_stats["m"]["runs"] == 2
+
+    perf = benchmarker.calculate_performance(metrics)
+    assert perf.total_tests == 6 and perf.tokens_per_sec == pytest.approx(80.0)
+    assert 0 < perf.p50_ttft <= perf.p50_response_time <= perf.p99_response_time
+
+    cases_summary = benchmarker.summarize_cases(metrics)
+    assert set(cases_summary) == {"simple_function", "class_creation"}
+    assert cases_summary["simple_function"]["latency_seconds"]["n"] == 3
+
+
+def test_concurrency_sweep_finds_saturation(ollama_stub):
+    # A server that handles one request at a time
+    server = ollama_stub(RESPONSE, delay=0.1, serial=True, done_stats=EVAL_STATS)
+    benchmarker = bench.OllamaBenchmarker(server.url, max_connections=4)
+    sweep = benchmarker.run_concurrency_sweep("m", levels=(1, 2, 4), requests_per_client=2)
+
+    assert [level["requests"] for level in sweep["levels"]] == [2, 4, 8]
+    assert all(level["errors"] == 0 for level in sweep["levels"])
+    # A server that handles one request at a time cannot scale with extra clients
+    rates = [level["requests_per_sec"] for level in sweep["levels"]]
+    assert rates[-1] < 2 * rates[0]
+    assert sweep["saturation_concurrency"] in (1, 2, 4)
+    assert sweep["levels"][-1]["latency_seconds"]["p50"] > sweep["levels"][0]["latency_seconds"]["p50"]
+
+
+@pytest.mark.parametrize("rates, expected", [
+    ([10.0, 19.0, 30.0, 31.0], 4),
+    ([10.0, 10.5, 30.0], 1),
+    ([10.0, 20.0, 40.0, 80.0], 8),
+    ([], None),
+])
+def test_find_saturation(rates, expected):
+    levels = [{"concurrency": c, "requests_per_sec": r} for c, r in zip((1, 2, 4, 8), rates)]
+
+    assert bench.find_saturation(levels) == expected
+
+
+def test_report_is_stable_json(stub, tmp_path):
+    benchmarker = bench.OllamaBenchmarker(stub.url, repetitions=2, warmup_runs=0)
+    results = {"m": benchmarker.benchmark_model("m")}
+    report = benchmarker.build_report(results)
+    path = tmp_path / "report.json"
+
+    bench.save_report(report, path)
+
+    loaded = json.loads(path.read_text())
+    assert loaded["config"]["repetitions"] == 2
+    assert loaded["models"]["m"]["performance"]["total_tests"] == 2 * len(bench.BENCHMARK_CASES)
+    assert loaded["models"]["m"]["concurrency_sweep"] is None
+    text = path.read_text()
+    assert text == json.dumps(loaded, indent=2, sort_keys=True) + "\n"
+
+
+def test_mann_whitney_matches_permutation_test():
+    current = [1.3, 1.1, 1.4, 1.2, 1.25, 1.0]
+    baseline = [1.0, 0.9, 1.05, 1.1, 0.95, 1.0, 0.98]
+
+    u, p = bench.mann_whitney_u(current, baseline)
+
+    exact_u = sum((c > b) + 0.5 * (c == b) for c in current for b in baseline)
+    assert u == exact_u
+    # Exact one-sided p-value by enumerating every relabelling of the pooled samples
+    pooled = current + baseline
+    stats = [sum((pooled[i] > pooled[j]) + 0.5 * (pooled[i] == pooled[j])
+                 for i in idx for j in set(range(len(pooled))) - set(idx))
+             for idx in combinations(range(len(pooled)), len(current))]
+    exact_p = sum(s >= u for s in stats) / len(stats)
+    assert p == pytest.approx(exact_p, abs=0.01)
+    assert bench.mann_whitney_u(baseline, current)[1] > 0.9
+
+
+def make_metrics(model, latency, rate, n=10):
+    return [bench.BenchmarkMetrics(model, "case", latency * (1 + 0.01 * (i % 5)), True, 1.0, 10, 0.0,
+                                   f"2026-01-01T00:00:{i:02d}", ttft=0.1, tokens_per_sec=rate * (1 - 0.01 * (i % 3)))
+            for i in range(n)]
+
+
+def track(tracker, day, latency, rate):
+    benchmarker = bench.OllamaBenchmarker()
+    metrics = make_metrics("m", latency, rate)
+    perf = benchmarker.calculate_performance(metrics)
+    perf.timestamp = f"2026-01-{day:02d}T00:00:00"
+    regressions = tracker.check_regression(perf, metrics)
+    tracker.add_benchmark(perf, metrics)
+    return regressions
+
+
+def test_tracker_flags_latency_and_throughput_regressions(tmp_path):
+    tracker = bench.ProgressTracker(tmp_path / "history.db", baseline_window=3)
+
+    assert track(tracker, 1, 1.0, 50.0) == []
+    assert track(tracker, 2, 1.01, 50.0) == []
+    assert track(tracker, 3, 0.99, 49.5) == []
+    regressions = track(tracker, 4, 1.5, 35.0)
+
+    assert {r.metric for r in regressions} == {"response_time", "tokens_per_sec"}
+    assert all(r.method == "mann-whitney" and r.score < 0.01 for r in regressions)
+    latency = next(r for r in regressions if r.metric == "response_time")
+    assert latency.change == pytest.approx(0.5, abs=0.05)
+
+    history = tracker.get_history("m")
+    assert [h.timestamp[:10] for h in history] == ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"]
+    assert [h.timestamp[:10] for h in tracker.get_history("m", limit=2)] == ["2026-01-03", "2026-01-04"]
+    assert tracker.get_history("other") == []
+    tracker.close()
+
+
+def test_small_improvements_are_not_regressions(tmp_path):
+    tracker = bench.ProgressTracker(tmp_path / "history.db")
+    for day in range(1, 4):
+        track(tracker, day, 1.0, 50.0)
+
+    assert track(tracker, 4, 0.8, 60.0) == []
+    assert track(tracker, 5, 1.03, 49.0) == []  # below min_effect
+    tracker.close()
+
+
+def test_legacy_json_history_is_imported_and_uses_mad(tmp_path):
+    legacy = tmp_path / "progress.json"
+    runs = [dict(model="m", total_tests=8, passed_tests=8, failed_tests=0, avg_response_time=t,
+                 p95_response_time=t, avg_quality_score=0.9, total_tokens=100, avg_memory_mb=0.0,
+                 timestamp=f"2026-01-0{i}T00:00:00") for i, t in enumerate([1.0, 1.1, 0.9, 1.05], 1)]
+    legacy.write_text(json.dumps({"benchmarks": runs}))
+
+    tracker = bench.ProgressTracker(legacy)
+
+    assert tracker.db_path == tmp_path / "progress.db"
+    assert len(tracker.get_history("m")) == 4
+    perf = bench.ModelPerformance(**dict(runs[0], avg_response_time=2.0, timestamp="2026-01-05T00:00:00"))
+    regressions = tracker.check_regression(perf)
+    assert [(r.metric, r.method) for r in regressions] == [("response_time", "mad")]
+    tracker.close()
+
+    # Reopening uses the existing store instead of importing again
+    assert len(bench.ProgressTracker(legacy).get_history("m")) == 4
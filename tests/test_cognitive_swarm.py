@@ -0,0 +1,409 @@
+"""
+Tests for the cognitive swarm orchestrator, driven by a stub AsyncOpenAI client.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+SWARM_DIR = os.path.join(os.path.dirname(__file__), "..", "cognitive-swarm")
+
+
+def load_swarm_module():
+    spec = importlib.util.spec_from_file_location("cognitive_swarm_main", os.path.join(SWARM_DIR, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules.setdefault("cognitive_swarm_main", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+swarm = load_swarm_module()
+
+CONFIG = {
+    "redis": {"host": "localhost", "port": 6379, "db": 0, "events_channel": "cognitive_swarm:events"},
+    "ai_client": {"timeout": 5},
+    "swarm": {"max_step_concurrency": 4},
+    "agent_model_map": {
+        "supervisor": "planner",
+        "web_research": "researcher",
+        "code_analysis": "coder",
+        "synthesis_reasoning": "synth",
+    },
+    "notifications": {"slack": {"enabled": False}},
+}
+
+PLAN = {
+    "strategic_question": "What does this release change?",
+    "execution_plan": [
+        {"step": 1, "goal": "Research the release notes", "agent_type": "web_research", "depends_on": []},
+        {"step": 2, "goal": "Analyse the diff", "agent_type": "code_analysis", "depends_on": []},
+        {"step": 3, "goal": "Research competitor reactions", "agent_type": "web_research", "depends_on": []},
+        {"step": 4, "goal": "Assess security impact", "agent_type": "code_analysis", "depends_on": [2]},
+        {"step": 5, "goal": "Synthesize", "agent_type": "synthesis_reasoning", "depends_on": [1, 3, 4]},
+    ],
+}
+
+
+class StubCompletions:
+    def __init__(self, plan, delay=0.05, result_size=2000):
+        self.plan = plan
+        self.delay = delay
+        self.result_size = result_size
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[0]["content"]
+        self.calls.append((model, prompt, time.perf_counter()))
+        if model == "planner":
+            content = json.dumps(self.plan)
+        else:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(self.delay)
+            finally:
+                self.active -= 1
+            content = f"[{model}] " + "x" * self.result_size
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_orchestrator(monkeypatch, plan=PLAN, **stub_kwargs):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    orchestrator = swarm.CognitiveSwarmOrchestrator(CONFIG)
+    completions = StubCompletions(plan, **stub_kwargs)
+    orchestrator.ai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return orchestrator, completions
+
+
+def test_build_step_graph_defaults_synthesis_to_all_steps():
+    graph = swarm.build_step_graph([
+        {"step": 1, "goal": "a", "agent_type": "web_research"},
+        {"step": 2, "goal": "b", "agent_type": "code_analysis"},
+        {"step": 3, "goal": "c", "agent_type": "synthesis_reasoning"},
+    ])
+    assert graph == {1: [], 2: [], 3: [1, 2]}
+
+
+def test_build_step_graph_drops_invalid_edges_and_breaks_cycles():
+    assert swarm.build_step_graph([
+        {"step": 1, "goal": "a", "agent_type": "web_research", "depends_on": [1, 9, "x"]},
+        {"step": 2, "goal": "b", "agent_type": "synthesis_reasoning", "depends_on": ["1"]},
+    ]) == {1: [], 2: [1]}
+
+    cyclic = swarm.build_step_graph([
+        {"step": 1, "goal": "a", "agent_type": "web_research", "depends_on": [2]},
+        {"step": 2, "goal": "b", "agent_type": "web_research", "depends_on": [1]},
+        {"step": 3, "goal": "c", "agent_type": "synthesis_reasoning"},
+    ])
+    assert cyclic == {1: [], 2: [1], 3: [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_plan_runs_as_dag_with_dependency_only_context(monkeypatch):
+    orchestrator, completions = make_orchestrator(monkeypatch, delay=0.1)
+
+    start = time.perf_counter()
+    await orchestrator._handle_event(json.dumps({"source": "github", "event_type": "release"}))
+    elapsed = time.perf_counter() - start
+
+    # Critical path is 2 -> 4 -> 5 (three rounds) instead of five sequential steps
+    assert elapsed < 5 * 0.1
+    assert completions.peak == 3
+
+    prompts = {prompt.split('Your goal is: "')[1].split('"')[0]: prompt for _, prompt, _ in completions.calls[1:]}
+    assert "dependency_results\":{}" in prompts["Research the release notes"]
+    assert "[coder]" in prompts["Assess security impact"]
+    assert "[researcher]" not in prompts["Assess security impact"]
+    synthesis = prompts["Synthesize"]
+    assert all(f'"step_{n}"' in synthesis for n in (1, 3, 4)) and '"step_2"' not in synthesis
+
+
+@pytest.mark.asyncio
+async def test_step_concurrency_is_bounded(monkeypatch):
+    plan = {
+        "strategic_question": "q",
+        "execution_plan": [
+            {"step": i, "goal": f"g{i}", "agent_type": "web_research", "depends_on": []} for i in range(1, 9)
+        ] + [{"step": 9, "goal": "s", "agent_type": "synthesis_reasoning"}],
+    }
+    orchestrator, completions = make_orchestrator(monkeypatch, plan=plan, delay=0.05)
+    orchestrator.max_step_concurrency = 2
+
+    await orchestrator._handle_event(json.dumps({"source": "github", "event_type": "push"}))
+
+    assert completions.peak == 2
+    assert len(completions.calls) == 10
+
+
+@pytest.mark.asyncio
+async def test_malformed_step_does_not_strand_dependents(monkeypatch):
+    orchestrator, _ = make_orchestrator(monkeypatch)
+    plan = [
+        {"step": 1, "agent_type": "web_research"},  # no goal
+        {"step": 2, "goal": "Synthesize", "agent_type": "synthesis_reasoning", "depends_on": [1]},
+    ]
+
+    results = await asyncio.wait_for(orchestrator._execute_plan(plan, {}, "q"), timeout=1.0)
+
+    assert results["step_1"]["goal"] is None
+    assert results["step_1"]["result"].startswith("ERROR: Step 1 failed")
+    assert results["step_2"]["result"].startswith("[synth]")
+
+
+def make_stream_orchestrator(monkeypatch, **swarm_overrides):
+    fakeredis = pytest.importorskip("fakeredis")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    config = {
+        **CONFIG,
+        "redis": {**CONFIG["redis"], "events_stream": "test:events", "consumer_group": "swarm"},
+        "swarm": {
+            "max_inflight_missions": 2,
+            "read_block_seconds": 0.05,
+            "reclaim_interval_seconds": 0.05,
+            "consumer_name": "worker-1",
+            **swarm_overrides,
+        },
+    }
+    orchestrator = swarm.CognitiveSwarmOrchestrator(config)
+    orchestrator.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return orchestrator
+
+
+class RecordingHandler:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.handled = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, event_message):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        self.handled.append(json.loads(event_message)["n"])
+        return True
+
+
+async def run_until(orchestrator, predicate, timeout=5.0):
+    listener = asyncio.create_task(orchestrator.listen_for_events())
+    deadline = time.perf_counter() + timeout
+    while not predicate() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    orchestrator.stop()
+    await asyncio.wait_for(listener, timeout=5.0)
+
+
+@pytest.mark.asyncio
+async def test_stream_events_published_while_offline_are_processed_and_acked(monkeypatch):
+    orchestrator = make_stream_orchestrator(monkeypatch)
+    handler = RecordingHandler(delay=0.02)
+    orchestrator._handle_event = handler
+    for n in range(5):
+        await swarm.publish_event(orchestrator.redis_client, "test:events", {"n": n})
+
+    await run_until(orchestrator, lambda: len(handler.handled) == 5)
+
+    assert sorted(handler.handled) == [0, 1, 2, 3, 4]
+    pending = await orchestrator.redis_client.xpending("test:events", "swarm")
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_inflight_missions_are_bounded(monkeypatch):
+    orchestrator = make_stream_orchestrator(monkeypatch, max_inflight_missions=3)
+    handler = RecordingHandler(delay=0.05)
+    orchestrator._handle_event = handler
+    for n in range(12):
+        await swarm.publish_event(orchestrator.redis_client, "test:events", {"n": n})
+
+    await run_until(orchestrator, lambda: len(handler.handled) == 12)
+
+    assert len(handler.handled) == 12
+    assert handler.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_pending_entries_from_crashed_consumer_are_reclaimed(monkeypatch):
+    orchestrator = make_stream_orchestrator(monkeypatch, reclaim_idle_seconds=0.05)
+    handler = RecordingHandler(delay=0.01)
+    orchestrator._handle_event = handler
+    client = orchestrator.redis_client
+    await client.xgroup_create("test:events", "swarm", id="0", mkstream=True)
+    await swarm.publish_event(client, "test:events", {"n": 42})
+    # A consumer that read the entry and died before acknowledging it
+    await client.xreadgroup("swarm", "crashed-worker", {"test:events": ">"}, count=1)
+    await asyncio.sleep(0.1)
+
+    await run_until(orchestrator, lambda: handler.handled == [42])
+
+    assert handler.handled == [42]
+    pending = await client.xpending("test:events", "swarm")
+    assert pending["pending"] == 0
+
+
+async def start_slack_stub(statuses=None):
+    from aiohttp import web
+
+    received, times = [], []
+
+    async def handler(request):
+        received.append((await request.json())["text"])
+        times.append(time.perf_counter())
+        if statuses:
+            status = statuses.pop(0)
+            if status == 429:
+                received.pop()
+                return web.Response(status=429, headers={"Retry-After": "0.05"})
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_post("/hook", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/hook", received, times
+
+
+def make_slack_orchestrator(monkeypatch, url, window):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", url)
+    config = {
+        **CONFIG,
+        "swarm": {"max_step_concurrency": 4, "max_inflight_missions": 3},
+        "notifications": {"slack": {"enabled": True, "coalesce_window_seconds": window, "rate_per_second": 20}},
+    }
+    return swarm.CognitiveSwarmOrchestrator(config)
+
+
+@pytest.mark.asyncio
+async def test_slack_reports_are_coalesced_over_shared_session(monkeypatch):
+    runner, url, received, _ = await start_slack_stub()
+    orchestrator = make_slack_orchestrator(monkeypatch, url, window=0.1)
+    try:
+        for n in range(3):
+            await orchestrator._send_slack_notification(f"report {n}")
+        session = orchestrator._get_http_session()
+        await asyncio.sleep(0.3)
+
+        assert received == ["report 0\n\nreport 1\n\nreport 2"]
+        assert orchestrator._get_http_session() is session
+        assert session.connector.limit == 6 and session.connector.limit_per_host == 3
+    finally:
+        await orchestrator.aclose()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_slack_outbox_flushes_on_shutdown(monkeypatch):
+    runner, url, received, _ = await start_slack_stub()
+    orchestrator = make_slack_orchestrator(monkeypatch, url, window=30)
+    try:
+        await orchestrator._send_slack_notification("report a")
+        await orchestrator._send_slack_notification("report b")
+        start = time.perf_counter()
+        await orchestrator.aclose()
+
+        assert received == ["report a\n\nreport b"]
+        assert time.perf_counter() - start < 2
+        assert orchestrator._http_session.closed
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_slack_outbox_paces_posts_and_retries_rate_limits():
+    import aiohttp
+
+    runner, url, received, times = await start_slack_stub(statuses=[429])
+    session = aiohttp.ClientSession()
+    outbox = swarm.SlackOutbox(lambda: session, url, window=0.01, rate_per_second=10)
+    outbox.MAX_CHARS = 10
+    try:
+        for text in ("aaaaaaaa", "bbbbbbbb", "cccccccc"):
+            await outbox.enqueue(text)
+        await outbox.aclose()
+
+        assert received == ["aaaaaaaa", "bbbbbbbb", "cccccccc"]
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert all(gap >= 0.08 for gap in gaps)
+    finally:
+        await session.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_slack_post_timeout_does_not_kill_outbox(monkeypatch):
+    import aiohttp
+    from aiohttp import web
+
+    received = []
+
+    async def handler(request):
+        text = (await request.json())["text"]
+        if text == "slow":
+            await asyncio.sleep(1)
+        received.append(text)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_post("/hook", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/hook"
+    session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.1))
+    outbox = swarm.SlackOutbox(lambda: session, url, window=0.01, rate_per_second=100)
+    monkeypatch.setattr(outbox, "MAX_ATTEMPTS", 1)
+    outbox.MAX_CHARS = 4  # one coalescing window, two posts
+    try:
+        await outbox.enqueue("slow")
+        await outbox.enqueue("fast")
+        await asyncio.sleep(0.3)
+        await outbox.aclose()
+
+        assert received == ["fast"]
+    finally:
+        await session.close()
+        await runner.cleanup()
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert swarm.SlackOutbox._retry_after("2.5") == 2.5
+    assert swarm.SlackOutbox._retry_after(None) == 1.0
+    assert swarm.SlackOutbox._retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert swarm.SlackOutbox._retry_after("soon") == 1.0
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_closes_clients_when_outbox_close_fails(monkeypatch):
+    orchestrator = make_slack_orchestrator(monkeypatch, "http://127.0.0.1:9/hook", window=0.01)
+    session = orchestrator._get_http_session()
+    closed = []
+
+    class BrokenOutbox:
+        async def aclose(self):
+            raise RuntimeError("worker crashed")
+
+    async def close_llm():
+        closed.append(True)
+
+    orchestrator._slack_outbox = BrokenOutbox()
+    orchestrator.ai_client = SimpleNamespace(close=close_llm)
+
+    with pytest.raises(RuntimeError):
+        await orchestrator.aclose()
+    assert session.closed and closed == [True]
@@ -0,0 +1,203 @@
+"""
+Tests for ContinuousImprover's parallel, cached codebase scan
+"""
+
+import os
+
+import pytest
+
+import continuous_improvement_real as ci
+
+SOURCE = '''
+def handler(a, b, c, d, e, f):
+    try:
+        return eval(a)
+    except:
+        pass
+'''
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "core.py").write_text(SOURCE)
+    (tmp_path / "pkg" / "clean.py").write_text('def _helper():\n    return 1\n')
+    for skipped in ("venv/lib", "node_modules/x", "tests", "build"):
+        (tmp_path / skipped).mkdir(parents=True)
+        (tmp_path / skipped / "ignored.py").write_text(SOURCE)
+    (tmp_path / "pkg" / "test_core.py").write_text(SOURCE)
+    return tmp_path
+
+
+def make_improver(repo, **kwargs):
+    return ci.ContinuousImprover(repo, cache_path=repo / ".cache" / "analysis.json", **kwargs)
+
+
+def test_walk_prunes_excluded_directories(repo):
+    files = [p.relative_to(repo).as_posix() for p in ci.iter_python_files(repo)]
+
+    assert files == ["pkg/clean.py", "pkg/core.py"]
+
+
+def test_second_scan_is_served_from_cache(repo):
+    first = make_improver(repo)
+    issues = first.analyze_codebase()
+
+    second = make_improver(repo)
+    cached = second.analyze_codebase()
+
+    assert first.last_scan_stats.analyzed == 2
+    assert second.last_scan_stats.cache_hits == 2 and second.last_scan_stats.analyzed == 0
+    assert second.last_scan_stats.hit_rate == 1.0
+    assert cached == issues
+    assert {i.issue for i in issues} >= {"Use of eval() is dangerous", "Bare except clause catches all exceptions"}
+    assert all(i.file == str(repo / "pkg" / "core.py") for i in issues)
+
+
+def test_changed_and_touched_files(repo):
+    make_improver(repo).analyze_codebase()
+    core = repo / "pkg" / "core.py"
+    clean = repo / "pkg" / "clean.py"
+
+    # Same content with a new mtime is a cache hit via the content hash
+    stat = clean.stat()
+    os.utime(clean, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    core.write_text(SOURCE.replace("eval(a)", "a"))
+
+    improver = make_improver(repo)
+    issues = improver.analyze_codebase()
+
+    assert improver.last_scan_stats.cache_hits == 1
+    assert improver.last_scan_stats.analyzed == 1
+    assert "Use of eval() is dangerous" not in {i.issue for i in issues}
+
+
+def test_analyzer_version_and_deleted_files_invalidate(repo, monkeypatch):
+    make_improver(repo).analyze_codebase()
+    (repo / "pkg" / "clean.py").unlink()
+
+    monkeypatch.setattr(ci.StaticAnalyzer, "VERSION", "next")
+    improver = make_improver(repo)
+    improver.analyze_codebase()
+
+    assert improver.last_scan_stats.cache_hits == 0
+    assert list(improver.cache.entries) == ["pkg/core.py"]
+
+
+def test_unreadable_files_are_not_cached(repo, capsys):
+    (repo / "pkg" / "latin1.py").write_bytes(b"name = '\xe9t\xe9'\n")
+
+    for _ in range(2):
+        improver = make_improver(repo)
+        improver.analyze_codebase()
+
+        assert "Error analyzing" in capsys.readouterr().out
+        assert improver.last_scan_stats.errors == 1
+        assert "pkg/latin1.py" not in improver.cache.entries
+    # The readable files are cached; the broken one is retried
+    assert improver.last_scan_stats.cache_hits == 2
+
+
+def test_process_pool_matches_inline(repo, monkeypatch):
+    for i in range(6):
+        (repo / "pkg" / f"mod{i}.py").write_text(SOURCE)
+    inline = make_improver(repo, use_cache=False, workers=1).analyze_codebase()
+
+    monkeypatch.setattr(ci, "MIN_FILES_FOR_POOL", 1)
+    improver = make_improver(repo, use_cache=False, workers=2)
+    pooled = improver.analyze_codebase()
+
+    assert improver.last_scan_stats.workers == 2
+    assert pooled == inline
+
+
+
+def test_custom_rules_reach_workers_and_key_the_cache(repo, monkeypatch):
+    for i in range(4):
+        (repo / "pkg" / f"mod{i}.py").write_text(SOURCE)
+    monkeypatch.setattr(ci, "MIN_FILES_FOR_POOL", 1)
+    bare_except_only = ci.StaticAnalyzer(rules=[ci.BareExceptRule()])
+
+    make_improver(repo).analyze_codebase()
+    improver = make_improver(repo, workers=2, analyzer=bare_except_only)
+    issues = improver.analyze_codebase()
+
+    # Results cached under the default rules are not reused for another rule set
+    assert improver.last_scan_stats.cache_hits == 0 and improver.last_scan_stats.workers == 2
+    assert {i.issue for i in issues} == {"Bare except clause catches all exceptions"}
+    inline = make_improver(repo, use_cache=False, workers=1, analyzer=bare_except_only).analyze_codebase()
+    assert inline == issues
+
+RULES_SOURCE = '''
+import subprocess
+
+API_TOKEN = "abc123"
+note = "never call eval(x) or use shell=True"
+
+def run(cmd):
+    """Run it"""
+    model.eval()
+    subprocess.run(cmd, shell=True)
+    client(password="hunter2")
+    for i in range(3):
+        for j in range(2):
+            total += j
+    return eval(cmd)
+'''
+
+
+def analyze_source(tmp_path, source, analyzer=None):
+    path = tmp_path / "sample.py"
+    path.write_text(source)
+    return (analyzer or ci.StaticAnalyzer()).analyze_python_file(path)
+
+
+def test_security_rules_are_ast_based(tmp_path):
+    issues = analyze_source(tmp_path, RULES_SOURCE)
+    found = sorted((i.line, i.issue) for i in issues)
+
+    assert found == [
+        (4, "Possible hardcoded secret"),
+        (10, "subprocess with shell=True is dangerous"),
+        (11, "Possible hardcoded secret"),
+        (12, "List concatenation in loop is slow"),
+        (13, "List concatenation in loop is slow"),
+        (15, "Use of eval() is dangerous"),
+    ]
+
+
+def test_rules_share_one_traversal(tmp_path):
+    class CountingRule(ci.Rule):
+        def __init__(self):
+            self.seen = []
+
+        def visit_Call(self, node, ctx):
+            self.seen.append(node.lineno)
+
+    first, second = CountingRule(), CountingRule()
+    analyzer = ci.StaticAnalyzer(rules=[first, second])
+    analyze_source(tmp_path, RULES_SOURCE, analyzer)
+
+    assert analyzer.dispatch[ci.ast.Call] == [first.visit_Call, second.visit_Call]
+    assert first.seen == second.seen == [9, 10, 11, 12, 13, 15]
+
+
+def test_statement_only_rules_skip_expression_subtrees(tmp_path, monkeypatch):
+    visited = []
+    analyzer = ci.StaticAnalyzer(rules=[ci.FunctionQualityRule(), ci.BareExceptRule()])
+    original_walk = analyzer._walk
+
+    def tracking_walk(node, ctx):
+        visited.append(type(node))
+        original_walk(node, ctx)
+
+    monkeypatch.setattr(analyzer, "_walk", tracking_walk)
+    issues = analyze_source(tmp_path, SOURCE, analyzer)
+
+    assert analyzer.statements_only
+    assert not any(issubclass(t, ci.ast.expr) for t in visited)
+    assert {i.issue for i in issues} == {
+        "Function 'handler' missing docstring",
+        "Function 'handler' has too many parameters (6)",
+        "Bare except clause catches all exceptions",
+    }
@@ -0,0 +1,89 @@
+"""
+Tests for CostTracker aggregation, token counting and budget enforcement
+"""
+
+import threading
+
+import pytest
+
+from pr_fix_agent import ollama_agent
+from pr_fix_agent.ollama_agent import BudgetExceededError, CostTracker, count_tokens
+
+
+def test_report_uses_running_aggregates():
+    tracker = CostTracker(budget_usd=100.0)
+
+    tracker.record_usage("gpt-4", "p", "r", prompt_tokens=1000, completion_tokens=500)
+    tracker.record_usage("gpt-4", "p", "r", prompt_tokens=500, completion_tokens=0)
+    tracker.record_usage("codellama:34b", "p", "r", prompt_tokens=10, completion_tokens=20)
+
+    report = tracker.get_report()
+    assert report["total_calls"] == 3
+    assert report["total_tokens"] == 2030
+    assert report["total_cost"] == pytest.approx(2000 / 1_000_000 * 30.0)
+    gpt = report["usage_by_model"]["gpt-4"]
+    assert gpt["calls"] == 2 and gpt["prompt_tokens"] == 1500 and gpt["completion_tokens"] == 500
+    assert report["usage_by_model"]["codellama:34b"]["cost"] == 0.0
+
+    # Report is a snapshot, not a view into tracker state
+    gpt["calls"] = 99
+    assert tracker.get_report()["usage_by_model"]["gpt-4"]["calls"] == 2
+
+
+def test_ring_buffer_bounds_raw_records_but_not_totals():
+    tracker = CostTracker(max_records=5)
+
+    for _ in range(20):
+        tracker.record_usage("m", "p", "r", prompt_tokens=1, completion_tokens=1)
+
+    assert len(tracker.costs) == 5
+    assert tracker.get_report()["total_calls"] == 20
+    assert tracker.get_report()["total_tokens"] == 40
+
+
+def test_empty_report():
+    assert CostTracker(budget_usd=3.0).get_report() == {
+        "total_calls": 0,
+        "total_tokens": 0,
+        "total_cost": 0.0,
+        "budget_remaining": 3.0,
+    }
+
+
+def test_fallback_tokenizer_when_counts_missing(monkeypatch):
+    ollama_agent._load_tokenizer.cache_clear()
+    monkeypatch.setattr(ollama_agent, "_load_tokenizer", lambda: None)
+
+    cost = CostTracker().record_usage("m", "a" * 40, "b" * 9)
+
+    assert (cost.prompt_tokens, cost.completion_tokens) == (10, 3)
+    assert count_tokens("") == 0
+
+
+def test_budget_exceeded_raises_and_is_visible_lock_free():
+    tracker = CostTracker(budget_usd=0.01)
+
+    with pytest.raises(BudgetExceededError):
+        tracker.record_usage("gpt-4", "p", "r", prompt_tokens=1000, completion_tokens=0)
+
+    assert tracker.is_over_budget()
+    assert tracker.budget_remaining < 0
+
+
+def test_concurrent_recording_is_consistent():
+    tracker = CostTracker(budget_usd=1e9, max_records=100)
+
+    def worker():
+        for _ in range(500):
+            tracker.record_usage("gpt-4", "p", "r", prompt_tokens=3, completion_tokens=2)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = tracker.get_report()
+    assert report["total_calls"] == 4000
+    assert report["usage_by_model"]["gpt-4"]["tokens"] == 20000
+    assert report["total_cost"] == pytest.approx(20000 / 1_000_000 * 30.0)
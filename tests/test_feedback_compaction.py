@@ -0,0 +1,87 @@
+"""
+Tests for self-healing feedback compaction.
+
+The harness drives the retry loop with a stub operator judge that always returns
+code raising a deep-recursion error, and records the prompt size per attempt.
+"""
+
+import json
+
+import pytest
+
+from rainmaker_orchestrator.feedback import FeedbackCompactor, compact_error, estimate_tokens
+
+
+def _recursion_traceback(depth: int = 900) -> str:
+    frames = ['  File "/ws/main.py", line 2, in recurse\n    return recurse(n + 1)'] * depth
+    return "\n".join(
+        ["Traceback (most recent call last):", '  File "/ws/main.py", line 4, in <module>\n    recurse(0)']
+        + frames
+        + ["RecursionError: maximum recursion depth exceeded"]
+    )
+
+
+def test_compact_error_collapses_repeated_frames():
+    compacted = compact_error(_recursion_traceback(), max_frames=3)
+
+    assert "[Previous frame repeated 899 more times]" in compacted
+    assert compacted.count("return recurse(n + 1)") == 1
+    assert compacted.splitlines()[-1] == "RecursionError: maximum recursion depth exceeded"
+
+
+def test_compact_error_keeps_innermost_frames():
+    stderr = "\n".join(
+        ["Traceback (most recent call last):"]
+        + [f'  File "/ws/mod{i}.py", line {i}, in f{i}\n    call_{i}()' for i in range(10)]
+        + ["KeyError: 'missing'"]
+    )
+    compacted = compact_error(stderr, max_frames=2)
+
+    assert "8 earlier frames omitted" in compacted
+    assert "f9" in compacted and "f8" in compacted and "f0" not in compacted
+    assert compacted.endswith("KeyError: 'missing'")
+
+
+def test_compact_error_without_traceback_keeps_tail():
+    stderr = "\n".join(f"line {i}" for i in range(50))
+    assert compact_error(stderr, max_tail_lines=3) == "line 47\nline 48\nline 49"
+
+
+def test_feedback_respects_token_budget_and_digests_earlier_attempts():
+    compactor = FeedbackCompactor(token_budget=120, max_frames=50)
+    for i in range(6):
+        compactor.add_attempt("Execution Error", _recursion_traceback().replace("RecursionError", f"Error{i}Error"))
+
+    feedback = compactor.feedback()
+    assert estimate_tokens(feedback) <= 120
+    assert feedback.rstrip().endswith("Error5Error: maximum recursion depth exceeded")
+    assert "Attempt 5 - Execution Error: Error4Error" in feedback
+
+
+@pytest.mark.asyncio
+async def test_self_healing_prompt_size_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setenv("CI", "true")
+    monkeypatch.setenv("SELF_HEAL_MAX_RETRIES", "5")
+    monkeypatch.setenv("SELF_HEAL_FEEDBACK_TOKENS", "400")
+    from rainmaker_orchestrator.orchestrator import RainmakerOrchestrator
+
+    orchestrator = RainmakerOrchestrator(workspace_path=str(tmp_path), config_file=str(tmp_path / "missing.env"))
+    prompt_tokens = []
+
+    async def stub_judge(judge_role, context):
+        prompt_tokens.append(estimate_tokens(context))
+        code = "def recurse(n):\n    return recurse(n + 1)\n\nrecurse(0)\n"
+        return {"choices": [{"message": {"content": json.dumps({"code": code})}}]}
+
+    orchestrator._call_judge = stub_judge
+    base_context = "Write a script that prints the first ten primes."
+    result = await orchestrator.execute_task(
+        {"type": "coding_task", "context": base_context, "output_filename": "primes.py"}
+    )
+
+    assert result["status"] == "failed"
+    assert len(prompt_tokens) == 5
+    assert prompt_tokens[0] == estimate_tokens(base_context)
+    # A raw RecursionError traceback is tens of thousands of tokens; compacted prompts stay flat.
+    assert max(prompt_tokens) <= estimate_tokens(base_context) + 400 + 2
+    assert prompt_tokens[-1] - prompt_tokens[1] < 100
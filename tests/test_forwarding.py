@@ -0,0 +1,171 @@
+"""
+Tests for the pooled webhook forwarding subsystem.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.forwarding import (
+    AIMDLimiter,
+    CircuitBreaker,
+    ForwardingTarget,
+    ForwardTargetConfig,
+    WebhookForwarder,
+    load_target_configs,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_target(handler, **overrides):
+    config = ForwardTargetConfig(name="test", url="https://example.com/hook", **overrides)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return ForwardingTarget(config, client=client)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=FakeClock())
+        for _ in range(3):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_allows_single_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 11
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 11
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestAIMDLimiter:
+    @pytest.mark.asyncio
+    async def test_increases_on_fast_success(self):
+        limiter = AIMDLimiter(initial=2, max_limit=8, latency_target=1.0)
+        for _ in range(10):
+            await limiter.acquire()
+            await limiter.release(0.01, True)
+        assert limiter.limit > 2
+
+    @pytest.mark.asyncio
+    async def test_decreases_on_slow_response(self):
+        limiter = AIMDLimiter(initial=8, min_limit=1, latency_target=0.1)
+        await limiter.acquire()
+        await limiter.release(5.0, True)
+        assert limiter.limit == 4
+
+
+class TestForwardingTarget:
+    @pytest.mark.asyncio
+    async def test_forwards_payload(self):
+        target = make_target(lambda request: httpx.Response(200))
+        result = await target.send({"event_type": "jira:issue_updated"})
+        await target.aclose()
+        assert result["status"] == "forwarded"
+        assert target.stats["forwarded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_circuit_rejects_after_server_errors(self):
+        target = make_target(lambda request: httpx.Response(503), failure_threshold=2)
+        await target.send({})
+        await target.send({})
+        result = await target.send({})
+        await target.aclose()
+        assert result["reason"] == "circuit_open"
+        assert target.stats["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_circuit(self):
+        target = make_target(lambda request: httpx.Response(400), failure_threshold=1)
+        await target.send({})
+        await target.aclose()
+        assert target.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_batches_events(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content)
+            return httpx.Response(200)
+
+        target = make_target(handler, batch_size=3, batch_window=1.0)
+        results = await asyncio.gather(*(target.send({"n": i}) for i in range(3)))
+        await target.aclose()
+        assert len(bodies) == 1
+        assert all(r["batch_size"] == 3 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self):
+        target = make_target(lambda request: httpx.Response(200), failure_threshold=1, reset_timeout=0)
+        target.breaker.record_failure()
+        await target.limiter.acquire()
+        target.limiter._limit = 1.0  # probe must wait for a slot
+
+        probe = asyncio.create_task(target.send({}))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        await target.limiter.release(0.0, True)
+
+        result = await target.send({})
+        await target.aclose()
+        assert result["status"] == "forwarded"
+        assert target.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_aclose_waits_for_window_flush(self):
+        started = asyncio.Event()
+        closed_during_flush = []
+
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(0.05)
+            closed_during_flush.append(target._client.is_closed)
+            return httpx.Response(200)
+
+        target = make_target(handler, batch_size=10, batch_window=0.01)
+        pending = asyncio.create_task(target.send({"n": 1}))
+        await started.wait()
+        await target.aclose()
+
+        assert (await pending)["status"] == "forwarded"
+        assert closed_during_flush == [False]
+        assert target._client.is_closed
+
+
+class TestWebhookForwarder:
+    def test_only_configured_targets_loaded(self):
+        configs = load_target_configs({"JIRA_BASE_URL": "https://jira.example.com"})
+        assert set(configs) == {"jira"}
+        assert configs["jira"].auth is None
+
+    @pytest.mark.asyncio
+    async def test_missing_target_reports_config_error(self):
+        result = await WebhookForwarder({}).forward("jira", {})
+        assert result == {"status": "error", "reason": "missing_config"}
@@ -0,0 +1,140 @@
+"""
+Tests for SelfHealingAgent alert handling with stub Kimi clients.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from rainmaker_orchestrator.agents.healer import SelfHealingAgent
+
+
+class StubAsyncKimi:
+    def __init__(self, delay: float = 0.05, blueprint: str = "patch"):
+        self.delay = delay
+        self.blueprint = blueprint
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, prompt, mode="general"):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return self.blueprint
+
+
+class StubSyncKimi:
+    def generate(self, prompt, mode="general"):
+        time.sleep(0.05)
+        return "sync-patch"
+
+
+def _alert(service, description, instance="a", status="firing"):
+    return {
+        "status": status,
+        "labels": {"alertname": "ServiceError", "service": service, "instance": instance},
+        "annotations": {"description": description},
+        "fingerprint": f"{service}-{instance}",
+    }
+
+
+@pytest.mark.asyncio
+async def test_single_alert_generates_hotfix():
+    kimi = StubAsyncKimi()
+    agent = SelfHealingAgent(kimi_client=kimi, orchestrator=object())
+
+    result = await agent.handle_alert({"service": "billing", "description": "KeyError: 'plan'"})
+
+    assert result == {"status": "hotfix_generated", "blueprint": "patch", "cached": False}
+    assert "KeyError: 'plan'" in kimi.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_multi_alert_groups_by_service_and_error():
+    kimi = StubAsyncKimi()
+    agent = SelfHealingAgent(kimi_client=kimi, orchestrator=object())
+    payload = {
+        "alerts": [
+            _alert("billing", "KeyError: 'plan'", instance="a"),
+            _alert("billing", "KeyError:  'plan'", instance="b"),
+            _alert("billing", "TimeoutError", instance="a"),
+            _alert("search", "KeyError: 'plan'", instance="a"),
+            _alert("search", "old error", status="resolved"),
+        ]
+    }
+
+    result = await agent.handle_alert(payload)
+
+    assert result["status"] == "processed"
+    assert result["alert_count"] == 5
+    assert result["group_count"] == 3
+    assert len(kimi.prompts) == 3
+    counts = {(r["service"], r["alert_count"]) for r in result["results"]}
+    assert counts == {("billing", 2), ("billing", 1), ("search", 1)}
+    assert all(r["status"] == "hotfix_generated" for r in result["results"])
+
+
+@pytest.mark.asyncio
+async def test_multi_alert_concurrency_is_bounded():
+    kimi = StubAsyncKimi(delay=0.05)
+    agent = SelfHealingAgent(kimi_client=kimi, orchestrator=object(), max_concurrency=3)
+    payload = {"alerts": [_alert(f"svc{i}", f"error {i}") for i in range(9)]}
+
+    start = time.perf_counter()
+    result = await agent.handle_alert(payload)
+    elapsed = time.perf_counter() - start
+
+    assert result["group_count"] == 9
+    assert kimi.peak == 3
+    assert elapsed < 9 * 0.05
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_reported_per_group():
+    kimi = StubAsyncKimi(blueprint=None)
+    agent = SelfHealingAgent(kimi_client=kimi, orchestrator=object())
+
+    result = await agent.handle_alert({"alerts": [_alert("billing", "boom")]})
+
+    assert result["results"][0]["status"] == "hotfix_failed"
+
+
+@pytest.mark.asyncio
+async def test_sync_client_runs_off_event_loop():
+    agent = SelfHealingAgent(kimi_client=StubSyncKimi(), orchestrator=object(), max_concurrency=4)
+    payload = {"alerts": [_alert(f"svc{i}", f"error {i}") for i in range(4)]}
+
+    start = time.perf_counter()
+    result = await agent.handle_alert(payload)
+
+    assert all(r["blueprint"] == "sync-patch" for r in result["results"])
+    assert time.perf_counter() - start < 4 * 0.05
+
+
+@pytest.mark.asyncio
+async def test_empty_payload_is_ignored():
+    agent = SelfHealingAgent(kimi_client=StubAsyncKimi(), orchestrator=object())
+    assert (await agent.handle_alert({}))["status"] == "ignored"
+
+
+@pytest.mark.asyncio
+async def test_repeat_alert_is_served_from_cache():
+    kimi = StubAsyncKimi()
+    agent = SelfHealingAgent(kimi_client=kimi, orchestrator=object())
+    payload = {"alerts": [_alert("billing", "KeyError: 'plan' at 2026-03-01T12:00:00Z request_id=123456")]}
+    repeat = {"alerts": [_alert("billing", "KeyError: 'plan' at 2026-03-01T16:00:00Z request_id=654321")]}
+
+    first = await agent.handle_alert(payload)
+    second = await agent.handle_alert(repeat)
+
+    assert first["results"][0]["cached"] is False
+    assert second["results"][0]["cached"] is True
+    assert second["results"][0]["blueprint"] == "patch"
+    assert len(kimi.prompts) == 1
+    assert agent.hotfix_cache.stats()["saved_tokens"] > 0
@@ -0,0 +1,69 @@
+"""
+Tests for the hotfix fingerprint cache used by SelfHealingAgent.
+"""
+
+import time
+
+from rainmaker_orchestrator.agents.hotfix_cache import HotfixCache, normalize_error, simhash
+
+ERROR = (
+    "2026-03-01T12:00:01.123Z ERROR request 8f14e45f-ceea-467a-9af1-2c3a5e6b9d01 from 10.0.0.12:5432 failed: "
+    "KeyError: 'plan' in billing.invoice at 0x7f3a2b1c order_id=1234567"
+)
+
+
+def test_normalize_error_strips_volatile_tokens():
+    other = (
+        "2026-03-02T09:14:55Z ERROR request 1b4e28ba-2fa1-11d2-883f-0016d3cca427 from 10.0.0.99:6000 failed: "
+        "KeyError: 'plan' in billing.invoice at 0x7ffee0 order_id=7654321"
+    )
+    assert normalize_error(ERROR) == normalize_error(other)
+    assert "KeyError: 'plan'" in normalize_error(ERROR)
+
+
+def test_exact_repeat_is_a_hit_and_credits_saved_tokens():
+    cache = HotfixCache()
+    assert cache.get("billing", ERROR) is None
+    cache.put("billing", ERROR, "patch", tokens=250)
+
+    repeat = ERROR.replace("12:00:01.123", "16:00:01.456").replace("1234567", "999999999")
+    start = time.perf_counter()
+    hit = cache.get("billing", repeat)
+    elapsed = time.perf_counter() - start
+
+    assert hit is not None and hit.match == "exact" and hit.blueprint == "patch"
+    assert elapsed < 0.01
+    assert cache.stats() == {"hits": 1, "near_hits": 0, "misses": 1, "saved_tokens": 250, "entries": 1}
+
+
+def test_near_duplicate_is_found_by_simhash():
+    cache = HotfixCache(max_distance=3)
+    base = "Traceback: File app.py line 10 in handler KeyError: 'plan' while building invoice for customer " * 3
+    cache.put("billing", base, "patch", tokens=100)
+
+    near = base + " (retry)"
+    assert bin(simhash(normalize_error(base)) ^ simhash(normalize_error(near))).count("1") <= 3
+    hit = cache.get("billing", near)
+
+    assert hit is not None and hit.match == "near"
+    assert cache.get("search", near) is None
+    assert cache.get("billing", "ConnectionRefusedError: upstream unavailable") is None
+
+
+def test_entries_expire_after_ttl():
+    cache = HotfixCache(ttl=0.01)
+    cache.put("billing", ERROR, "patch")
+    time.sleep(0.02)
+
+    assert cache.get("billing", ERROR) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_cleans_index():
+    cache = HotfixCache(max_entries=2)
+    for i in range(3):
+        cache.put("svc", f"distinct failure number {'abc'[i]} " * 5, f"patch-{i}")
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get("svc", "distinct failure number a " * 5) is None
+    assert cache.get("svc", "distinct failure number c " * 5).blueprint == "patch-2"
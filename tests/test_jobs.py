@@ -0,0 +1,101 @@
+"""
+Tests for the persistent authority-flow job queue.
+"""
+
+import asyncio
+
+import pytest
+
+from rainmaker_orchestrator.jobs import (
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    JobHandler,
+    JobStore,
+    JobWorkerPool,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(path=str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+class TestJobStore:
+    def test_idempotency_key_returns_existing_job(self, store):
+        first, created = store.enqueue("authority_flow", {"objectId": 1}, "hubspot:1")
+        second, created_again = store.enqueue("authority_flow", {"objectId": 1}, "hubspot:1")
+
+        assert created and not created_again
+        assert first.id == second.id
+
+    def test_expired_key_allows_new_job(self, tmp_path):
+        store = JobStore(path=str(tmp_path / "jobs.db"), idempotency_ttl=0)
+        job, _ = store.enqueue("authority_flow", {}, "hubspot:1")
+        store.claim()
+        store.finish(job.id, SUCCEEDED, {"status": "success"})
+
+        again, created = store.enqueue("authority_flow", {}, "hubspot:1")
+        assert created
+        assert again.id != job.id
+
+    def test_claim_is_fifo(self, store):
+        first, _ = store.enqueue("authority_flow", {"n": 1})
+        store.enqueue("authority_flow", {"n": 2})
+
+        claimed = store.claim()
+        assert claimed.id == first.id
+        assert claimed.status == RUNNING
+        assert claimed.attempts == 1
+
+    def test_recover_requeues_interrupted_jobs(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        store = JobStore(path=path)
+        job, _ = store.enqueue("authority_flow", {})
+        store.claim()
+        store.close()
+
+        reopened = JobStore(path=path)
+        assert reopened.recover() == 1
+        assert reopened.get(job.id).status == QUEUED
+        assert reopened.depth() == {"authority_flow": 1}
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_bounds_concurrency_and_retries(store):
+    active = 0
+    peak = 0
+
+    async def run(payload):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        if payload.get("fail"):
+            return {"status": "error", "message": "judge unavailable"}
+        return {"status": "success"}
+
+    pool = JobWorkerPool(
+        store,
+        {"authority_flow": JobHandler(run=run)},
+        concurrency=2,
+        default_rate_per_minute=6000,
+        max_attempts=2,
+        poll_interval=0.05,
+    )
+    pool.start()
+    jobs = [(await pool.submit("authority_flow", {"n": i}))[0] for i in range(5)]
+    failing, _ = await pool.submit("authority_flow", {"fail": True})
+    await asyncio.sleep(0.6)
+    await pool.stop()
+
+    assert peak == 2
+    assert all(store.get(job.id).status == SUCCEEDED for job in jobs)
+    failed = store.get(failing.id)
+    assert failed.status == FAILED
+    assert failed.attempts == 2
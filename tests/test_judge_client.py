@@ -0,0 +1,112 @@
+"""
+Tests for the pooled, memoizing judge client.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from rainmaker_orchestrator.config import ConfigManager
+from rainmaker_orchestrator.judge_client import JudgeClient
+
+JUDGE_MODELS = {"operator": "codestral-2501"}
+
+
+@pytest.fixture
+def mistral_env(monkeypatch):
+    monkeypatch.delenv("ZAI_API_KEY", raising=False)
+    monkeypatch.setenv("MISTRAL_API_KEY", "test-key")
+    monkeypatch.setenv("MISTRAL_API_BASE", "https://mistral.test/v1/")
+
+
+def make_client(requests, cache_ttl=60.0, delay=0.0):
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "{}"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        })
+
+    client = JudgeClient(ConfigManager(config_file="/nonexistent.env"), JUDGE_MODELS, cache_ttl=cache_ttl)
+    client._clients["https://mistral.test/v1"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_memoized(mistral_env):
+    requests = []
+    client = make_client(requests)
+
+    await client.complete("operator", "lead 42")
+    await client.complete("operator", "lead 42")
+    await client.aclose()
+
+    assert len(requests) == 1
+    assert requests[0].url == "https://mistral.test/v1/chat/completions"
+    stats = client.stats()["operator"]
+    assert stats["cache_hits"] == 1
+    assert stats["prompt_tokens"] == 10
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_request(mistral_env):
+    requests = []
+    client = make_client(requests, delay=0.05)
+
+    await asyncio.gather(*(client.complete("operator", "lead 7") for _ in range(5)))
+    await client.aclose()
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_caller_does_not_cancel_shared_request(mistral_env):
+    requests = []
+    client = make_client(requests, delay=0.2)
+
+    # The caller that starts the upstream request is the one that gets timed out
+    leader = asyncio.ensure_future(asyncio.wait_for(client.complete("operator", "lead 9"), timeout=0.05))
+    await asyncio.sleep(0.01)
+    first, second = await asyncio.gather(leader, client.complete("operator", "lead 9"), return_exceptions=True)
+    cached = await client.complete("operator", "lead 9")
+    await client.aclose()
+
+    assert isinstance(first, asyncio.TimeoutError)
+    assert second["choices"][0]["message"]["content"] == "{}"
+    assert cached is second
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_memoization(mistral_env):
+    requests = []
+    client = make_client(requests, cache_ttl=0)
+
+    await client.complete("operator", "lead 42")
+    await client.complete("operator", "lead 42")
+    await client.aclose()
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_reload_picks_up_new_credentials(mistral_env, monkeypatch):
+    client = make_client([])
+    assert client.endpoint.provider == "mistral"
+
+    monkeypatch.setenv("ZAI_API_KEY", "zai-key")
+    await client.reload()
+
+    assert client.endpoint.provider == "zai"
+    assert client.endpoint.model_for("operator") == "glm-4.7"
+    assert "https://mistral.test/v1" not in client._clients
+
+
+def test_missing_credentials(monkeypatch):
+    monkeypatch.delenv("ZAI_API_KEY", raising=False)
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+    client = JudgeClient(ConfigManager(config_file="/nonexistent.env"), JUDGE_MODELS)
+    with pytest.raises(ValueError):
+        client.endpoint
@@ -0,0 +1,114 @@
+"""
+Tests for the judge dependency graph used by the authority flow.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from rainmaker_orchestrator.judge_dag import JudgeDAG, JudgeStep
+
+
+def completion(content):
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def make_stub(delays, failures=()):
+    calls = []
+
+    async def call_judge(role, prompt):
+        calls.append((role, prompt))
+        await asyncio.sleep(delays.get(role, 0))
+        if role in failures:
+            raise RuntimeError(f"{role} unavailable")
+        return completion(f"{role}-output")
+
+    return call_judge, calls
+
+
+def authority_like_dag(timeout=1.0):
+    return JudgeDAG([
+        JudgeStep("audit", "auditor", lambda ctx: f"audit {ctx['lead']}", timeout=timeout, critical=False),
+        JudgeStep("strategy", "visionary", lambda ctx: f"plan {ctx['lead']}", timeout=timeout),
+        JudgeStep("implementation", "operator", lambda ctx: f"build {ctx['strategy']}",
+                  depends_on=("strategy",), timeout=timeout),
+        JudgeStep("critique", "challenger", lambda ctx: f"challenge {ctx['strategy']}",
+                  depends_on=("strategy",), timeout=timeout, critical=False),
+    ])
+
+
+@pytest.mark.asyncio
+async def test_latency_follows_critical_path():
+    call_judge, calls = make_stub({"auditor": 0.2, "visionary": 0.2, "operator": 0.2, "challenger": 0.2})
+
+    start = time.perf_counter()
+    result = await authority_like_dag().run(call_judge, {"lead": "acme"})
+    elapsed = time.perf_counter() - start
+
+    assert result.status == "success"
+    assert result.outputs["implementation"] == "operator-output"
+    # Sequential execution would take ~0.8s; the critical path is two calls
+    assert elapsed < 0.6
+    assert ("operator", "build visionary-output") in calls
+
+
+@pytest.mark.asyncio
+async def test_non_critical_failure_returns_partial_results():
+    call_judge, _ = make_stub({}, failures={"challenger"})
+    result = await authority_like_dag().run(call_judge, {"lead": "acme"})
+
+    assert result.status == "partial"
+    assert "critique" in result.errors
+    assert result.outputs["strategy"] == "visionary-output"
+
+
+@pytest.mark.asyncio
+async def test_critical_failure_skips_dependents():
+    call_judge, calls = make_stub({}, failures={"visionary"})
+    result = await authority_like_dag().run(call_judge, {"lead": "acme"})
+
+    assert result.status == "error"
+    assert "dependency 'strategy' failed" in result.errors["implementation"]
+    assert all(role != "operator" for role, _ in calls)
+
+
+@pytest.mark.asyncio
+async def test_step_timeout():
+    call_judge, _ = make_stub({"auditor": 1.0})
+    result = await authority_like_dag(timeout=0.1).run(call_judge, {"lead": "acme"})
+
+    assert result.errors["audit"] == "timed out after 0.1s"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_step_fails_dependents_instead_of_hanging():
+    async def call_judge(role, prompt):
+        if role == "visionary":
+            raise asyncio.CancelledError()
+        return completion(f"{role}-output")
+
+    result = await asyncio.wait_for(authority_like_dag().run(call_judge, {"lead": "acme"}), timeout=1.0)
+
+    assert result.errors["strategy"] == "cancelled"
+    assert "dependency 'strategy' failed" in result.errors["implementation"]
+    assert result.status == "error"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_run_propagates():
+    call_judge, _ = make_stub({"visionary": 1.0})
+    task = asyncio.create_task(authority_like_dag().run(call_judge, {"lead": "acme"}))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def test_rejects_cycles():
+    with pytest.raises(ValueError, match="Cycle"):
+        JudgeDAG([
+            JudgeStep("a", "auditor", str, depends_on=("b",)),
+            JudgeStep("b", "visionary", str, depends_on=("a",)),
+        ])
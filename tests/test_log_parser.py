@@ -0,0 +1,115 @@
+"""
+Tests for the streaming GitHub Actions log parser in src/analyzer.py
+"""
+
+import importlib.util
+import io
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+ANALYZER_PATH = Path(__file__).resolve().parent.parent / "src" / "analyzer.py"
+
+
+@pytest.fixture(scope="module")
+def gha():
+    spec = importlib.util.spec_from_file_location("gha_log_analyzer", ANALYZER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def analyzer(gha):
+    return gha.PRErrorAnalyzer(agent=None)
+
+
+LOG = """\
+2026-03-01T12:00:00.0000000Z ##[group]Run pytest
+2026-03-01T12:00:01.0000000Z collecting
+2026-03-01T12:00:02.0000000Z ModuleNotFoundError: No module named 'yaml'
+2026-03-01T12:00:03.0000000Z during handling
+2026-03-01T12:00:04.0000000Z Warning: cache miss
+2026-03-01T12:00:05.0000000Z retrying
+2026-03-01T12:00:06.0000000Z ModuleNotFoundError: No module named 'yaml'
+2026-03-01T12:00:07.0000000Z Error: Warning: nested markers
+2026-03-01T12:00:08.0000000Z done
+"""
+
+
+def test_stream_dedupes_and_captures_context(analyzer):
+    result = analyzer.parse_log_stream(LOG, context_lines=2)
+
+    assert result.lines_read == 9
+    assert result.total_errors == 3 and result.total_warnings == 2
+    module_error = result.errors[0]
+    assert module_error.message == "ModuleNotFoundError: No module named 'yaml'"
+    assert (module_error.count, module_error.line_number, module_error.last_line_number) == (2, 3, 7)
+    assert module_error.context_before[-1].endswith("collecting")
+    assert [line[29:] for line in module_error.context_after] == ["during handling", "Warning: cache miss"]
+    # A line carrying both markers is reported in both lists
+    assert result.errors[1].message == result.warnings[1].message == "Error: Warning: nested markers"
+    assert result.errors[1].context_after[0].endswith("done")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_chunk_boundaries_do_not_change_results(analyzer, chunk_size):
+    expected = analyzer.parse_log_stream(LOG).to_dict()
+
+    assert analyzer.parse_log_stream(io.StringIO(LOG), chunk_size=chunk_size).to_dict() == expected
+    assert analyzer.parse_log_stream(io.BytesIO(LOG.encode()), chunk_size=chunk_size).to_dict() == expected
+
+
+def test_reads_from_path_and_line_iterator(analyzer, tmp_path):
+    log_file = tmp_path / "job.log"
+    log_file.write_text(LOG)
+    expected = analyzer.parse_log_stream(LOG).to_dict()
+
+    assert analyzer.parse_log_stream(log_file).to_dict() == expected
+    with open(log_file) as f:
+        assert analyzer.parse_log_stream(iter(f)).to_dict() == expected
+
+
+def test_distinct_findings_are_capped(analyzer):
+    log = "\n".join(f"Error: failure {i}" for i in range(50))
+
+    result = analyzer.parse_log_stream(log, max_findings=10)
+
+    assert len(result.errors) == 10
+    assert result.total_errors == 50
+    assert result.dropped == 40
+
+
+def test_long_lines_are_truncated(gha):
+    chunks = ["Error: " + "x" * 100, "y" * 100, "\nnext\n"]
+
+    lines = list(gha.iter_log_lines(chunks, max_line_length=20))
+
+    assert lines == ["Error: " + "x" * 13, "next"]
+
+
+def test_memory_stays_bounded_for_large_stream(analyzer):
+    def generate(lines):
+        for i in range(lines):
+            if i % 50 == 0:
+                yield "2026-03-01T12:00:00Z Error: connection reset by peer\n"
+            else:
+                yield f"2026-03-01T12:00:00Z step {i} output {'.' * 80}\n"
+
+    tracemalloc.start()
+    result = analyzer.parse_log_stream(generate(50_000), context_lines=3, chunk_size=64 * 1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result.lines_read == 50_000
+    assert len(result.errors) == 1 and result.errors[0].count == 1000
+    # ~5MB of log parsed while live data stays a small multiple of the chunk size
+    assert peak < 1_000_000
+
+
+def test_get_error_context_streams_to_first_match(analyzer):
+    log = "a\nb\n  Error: boom\nc\nd\ne"
+
+    assert analyzer.get_error_context(log, "Error: boom", context_lines=1) == ["b", "  Error: boom", "c"]
+    assert analyzer.get_error_context(log, "missing") == []
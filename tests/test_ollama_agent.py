@@ -0,0 +1,113 @@
+"""
+Tests for OllamaAgent connection pooling, NDJSON streaming and latency metrics
+"""
+
+import json
+
+import pytest
+
+from pr_fix_agent.ollama_agent import (
+    AsyncOllamaAgent,
+    OllamaAgent,
+    OllamaQueryError,
+    StreamAccumulator,
+)
+
+CHUNK_DELAY = 0.02
+
+
+@pytest.fixture
+def stub_factory(ollama_stub):
+    def make(chunks, error=None):
+        return ollama_stub(chunks, error=error, chunk_delay=CHUNK_DELAY)
+
+    return make
+
+
+def test_streaming_accumulates_and_records_latency(stub_factory):
+    server = stub_factory(["def ", "fix():", " pass"])
+    agent = OllamaAgent(model="coder", base_url=server.url, keep_alive="10m")
+
+    assert agent.query("fix it", temperature=0.1) == "def fix(): pass"
+
+    payload = server.payloads[0]
+    assert payload["stream"] is True
+    assert payload["keep_alive"] == "10m"
+    assert payload["options"] == {"temperature": 0.1}
+    metrics = agent.last_metrics
+    assert metrics.streamed and not metrics.aborted_early
+    assert 0 < metrics.first_token_seconds < metrics.total_seconds
+    assert metrics.prompt_eval_count == 7 and metrics.eval_count == 3
+    assert agent.latency_summary()["calls"] == 1
+    # Server-reported token counts feed the cost tracker
+    assert agent.cost_tracker.get_report()["total_tokens"] == 10
+    agent.close()
+
+
+def test_session_reuses_one_connection(stub_factory):
+    server = stub_factory(["ok"])
+    agent = OllamaAgent(model="coder", base_url=server.url)
+
+    for _ in range(3):
+        agent.query("hello")
+
+    assert len(server.payloads) == 3
+    assert len(server.clients) == 1
+    agent.close()
+
+
+def test_stream_stops_after_code_block_closes(stub_factory):
+    trailing = [" more explanation"] * 20
+    server = stub_factory(["Here:\n``", "`python\nx = 1\n", "``", "`\n"] + trailing)
+    agent = OllamaAgent(model="coder", base_url=server.url, stop_at_code_block=True)
+
+    text = agent.query("fix it")
+
+    assert text == "Here:\n```python\nx = 1\n```\n"
+    assert agent.last_metrics.aborted_early
+    assert agent.last_metrics.total_seconds < len(trailing) * CHUNK_DELAY
+    assert server.chunks_sent < len(server.chunks)
+    agent.close()
+
+
+def test_non_streaming_mode(stub_factory):
+    server = stub_factory(["a", "b"])
+    agent = OllamaAgent(model="coder", base_url=server.url, stream=False, keep_alive=None)
+
+    assert agent.query("hi") == "ab"
+    assert "keep_alive" not in server.payloads[0]
+    assert agent.last_metrics.first_token_seconds is None
+    agent.close()
+
+
+def test_stream_error_raises(stub_factory):
+    server = stub_factory(["partial"], error="model not found")
+    agent = OllamaAgent(model="missing", base_url=server.url)
+
+    with pytest.raises(OllamaQueryError, match="model not found"):
+        agent.query("hi")
+    agent.close()
+
+
+def test_accumulator_counts_fences_split_across_chunks():
+    accumulator = StreamAccumulator(stop_at_code_block=True)
+    lines = [{"response": "````"}, {"response": "text"}, {"response": "``"}, {"response": "`"}]
+
+    results = [accumulator.feed(json.dumps(line)) for line in lines]
+
+    assert results == [False, False, False, True]
+
+
+@pytest.mark.asyncio
+async def test_async_agent_streams_with_early_abort(stub_factory):
+    pytest.importorskip("httpx")
+    server = stub_factory(["```\n", "y = 2\n", "```", " trailing"] + [" x"] * 20)
+    agent = AsyncOllamaAgent(model="coder", base_url=server.url, stop_at_code_block=True)
+
+    text = await agent.query("fix it")
+
+    assert text == "```\ny = 2\n```"
+    assert agent.last_metrics.aborted_early
+    assert agent.last_metrics.first_token_seconds is not None
+    assert server.payloads[0]["keep_alive"]
+    await agent.aclose()
@@ -0,0 +1,114 @@
+"""
+Tests for the pipelined fix-proposal / implementation executor
+"""
+
+import threading
+import time
+
+import pytest
+
+from pr_fix_agent.orchestrator import CodeReviewFinding, CodeReviewOrchestrator
+
+
+class FakeAgent:
+    """Blocking agent stub that records concurrency and call windows per model"""
+
+    def __init__(self, model, delay, counters):
+        self.model = model
+        self.delay = delay
+        self.counters = counters
+        self.prompts = []
+        self.windows = []
+
+    def query(self, prompt, temperature=0.2):
+        with self.counters["lock"]:
+            active = self.counters.setdefault(self.model, [0, 0])
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        start = time.perf_counter()
+        time.sleep(self.delay)
+        with self.counters["lock"]:
+            self.counters[self.model][0] -= 1
+            self.prompts.append(prompt)
+            self.windows.append((start, time.perf_counter()))
+        return "```python\nfixed = True\n```" if "Fix the following" in prompt else "analysis"
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text(f"# {name}\n")
+    return tmp_path
+
+
+@pytest.fixture
+def findings():
+    return [
+        CodeReviewFinding(file, line, line, "major", "correctness", f"issue {file}:{line}", "fix it")
+        for file in ("a.py", "b.py", "c.py")
+        for line in (1, 2)
+    ]
+
+
+def make_orchestrator(max_parallel=2, reasoning_delay=0.05, coding_delay=0.05, same_model=False):
+    orch = CodeReviewOrchestrator(max_parallel_per_model=max_parallel)
+    counters = {"lock": threading.Lock()}
+    orch.reasoning_agent = FakeAgent("reasoner", reasoning_delay, counters)
+    orch.coding_agent = FakeAgent("reasoner" if same_model else "coder", coding_delay, counters)
+    return orch, counters
+
+
+def test_pipeline_groups_findings_per_file(repo, findings):
+    orch, _ = make_orchestrator()
+
+    result = orch.run_pipeline(findings, repo)
+
+    assert len(result["proposals"]) == 6
+    assert len(orch.reasoning_agent.prompts) == 6
+    assert len(orch.coding_agent.prompts) == 3
+    assert [fix.file_path for fix in result["fixes"]] == [str(repo / f) for f in ("a.py", "b.py", "c.py")]
+    fix_a = result["fixes"][0]
+    assert len(fix_a.proposals) == 2 and fix_a.fixed_code == "fixed = True"
+    coding_prompt = next(p for p in orch.coding_agent.prompts if "# a.py" in p)
+    assert "issue a.py:1" in coding_prompt and "issue a.py:2" in coding_prompt
+
+
+def test_pipeline_overlaps_stages_and_bounds_each_model(repo, findings):
+    orch, counters = make_orchestrator(max_parallel=2, reasoning_delay=0.1, coding_delay=0.1)
+
+    start = time.perf_counter()
+    result = orch.run_pipeline(findings, repo)
+    elapsed = time.perf_counter() - start
+
+    assert counters["reasoner"][1] == 2
+    assert counters["coder"][1] <= 2
+    first_coding_start = min(s for s, _ in orch.coding_agent.windows)
+    last_reasoning_end = max(e for _, e in orch.reasoning_agent.windows)
+    assert first_coding_start < last_reasoning_end
+    # Serial execution would take 9 x 0.1s
+    assert elapsed < 0.6
+
+    timings = result["timings"]
+    assert timings["stages"]["reasoning"]["calls"] == 6
+    assert timings["stages"]["coding"]["calls"] == 3
+    assert timings["stages"]["reasoning"]["busy_seconds"] >= 0.6
+
+
+def test_shared_model_is_bounded_across_stages(repo, findings):
+    orch, counters = make_orchestrator(max_parallel=2, same_model=True)
+
+    orch.run_pipeline(findings, repo)
+
+    assert counters["reasoner"][1] == 2
+
+
+def test_stage_methods_run_concurrently_and_preserve_order(repo, findings):
+    orch, counters = make_orchestrator(max_parallel=3, reasoning_delay=0.05)
+
+    proposals = orch._generate_fix_proposals(findings)
+    fixes = orch._implement_fixes(proposals, repo)
+
+    assert [p.finding.issue for p in proposals] == [f.issue for f in findings]
+    assert counters["reasoner"][1] == 3
+    assert len(fixes) == 3
+    assert orch.last_timings["stages"]["coding"]["calls"] == 3
@@ -0,0 +1,73 @@
+"""
+Tests for the sandboxed script executor used by FileSystemAgent.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from rainmaker_orchestrator.fs_agent import FileSystemAgent
+from rainmaker_orchestrator.sandbox import ExecutionLimits, SandboxExecutor
+
+
+@pytest.mark.asyncio
+async def test_success_runs_in_isolated_directory(tmp_path):
+    executor = SandboxExecutor(str(tmp_path))
+    result = await executor.run_code("import os; print(os.getcwd())", task_id="demo")
+
+    assert result["status"] == "success"
+    run_dir = result["stdout"].strip()
+    assert run_dir.startswith(str(tmp_path / ".runs" / "demo-"))
+    assert not os.path.exists(run_dir)
+
+
+@pytest.mark.asyncio
+async def test_wall_clock_timeout_kills_script(tmp_path):
+    executor = SandboxExecutor(str(tmp_path), limits=ExecutionLimits(wall_clock_seconds=0.5))
+    start = time.perf_counter()
+    result = await executor.run_code("import time; time.sleep(30)")
+
+    assert result["status"] == "error"
+    assert result["timed_out"]
+    assert "wall-clock limit" in result["stderr"]
+    assert time.perf_counter() - start < 5
+
+
+@pytest.mark.asyncio
+async def test_output_is_capped(tmp_path):
+    executor = SandboxExecutor(str(tmp_path), limits=ExecutionLimits(max_output_bytes=1024))
+    result = await executor.run_code("print('x' * 1_000_000)")
+
+    assert result["status"] == "success"
+    assert result["truncated"]
+    assert len(result["stdout"]) == 1024
+
+
+@pytest.mark.asyncio
+async def test_memory_limit(tmp_path):
+    executor = SandboxExecutor(str(tmp_path), limits=ExecutionLimits(memory_bytes=256 * 1024 * 1024))
+    result = await executor.run_code("blob = bytearray(1024 * 1024 * 1024)")
+
+    assert result["status"] == "error"
+    assert "MemoryError" in result["stderr"]
+
+
+@pytest.mark.asyncio
+async def test_scripts_run_in_parallel(tmp_path):
+    executor = SandboxExecutor(str(tmp_path), max_concurrency=4)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(executor.run_code("import time; time.sleep(0.5)") for _ in range(4)))
+
+    assert all(r["status"] == "success" for r in results)
+    assert time.perf_counter() - start < 1.5
+
+
+def test_write_file_is_confined_to_workspace(tmp_path):
+    agent = FileSystemAgent(workspace_path=str(tmp_path))
+    agent.write_file("fib.py", "print(1)")
+
+    assert (tmp_path / "fib.py").read_text() == "print(1)"
+    with pytest.raises(ValueError):
+        agent.write_file("../escape.py", "print(1)")
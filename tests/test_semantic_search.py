@@ -0,0 +1,443 @@
+"""
+Tests for SemanticSearchService embedding cache, batching and retries
+"""
+
+import importlib.util
+import threading
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cohere")
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "vaal-ai-empire" / "services" / "semantic_search_rag.py"
+
+
+@pytest.fixture(scope="module")
+def ssr():
+    spec = importlib.util.spec_from_file_location("semantic_search_rag", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeCohere:
+    """Deterministic embeddings derived from the text; can fail the first N calls"""
+
+    def __init__(self, dim=16, failures=0):
+        self.dim = dim
+        self.failures = failures
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(self.dim).tolist()
+
+    def embed(self, texts, model, input_type):
+        with self._lock:
+            self.calls.append(list(texts))
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("503 Service Unavailable")
+        return type("Response", (), {"embeddings": [self.vector(t) for t in texts]})()
+
+
+@pytest.fixture
+def make_service(ssr, monkeypatch):
+    monkeypatch.setattr(ssr.time, "sleep", lambda seconds: None)
+
+    def factory(fake=None, **kwargs):
+        service = ssr.SemanticSearchService(cohere_key="test", **kwargs)
+        service.co = fake or FakeCohere()
+        return service
+
+    return factory
+
+
+def test_batches_respect_api_limit_and_dedupe(make_service):
+    service = make_service(batch_size=500)
+    texts = [f"doc {i}" for i in range(250)] + ["doc 0", "doc 1"]
+
+    embeddings = service.embed_texts(texts)
+
+    assert embeddings.shape == (252, 16) and embeddings.dtype == np.float32
+    assert sorted(len(call) for call in service.co.calls) == [58, 96, 96]
+    np.testing.assert_array_equal(embeddings[250], embeddings[0])
+    np.testing.assert_allclose(embeddings[7], service.co.vector("doc 7"), rtol=1e-6)
+
+
+def test_rebuild_of_unchanged_corpus_uses_cache(make_service, tmp_path):
+    cache_path = str(tmp_path / "embeddings.db")
+    documents = [{"text": f"article {i}"} for i in range(200)]
+    first = make_service(cache_path=cache_path)
+    first.build_index(documents)
+
+    second = make_service(cache_path=cache_path)
+    documents.append({"text": "a new article"})
+    second.build_index(documents)
+
+    assert len(first.co.calls) == 3
+    assert second.co.calls == [["a new article"]]
+    assert second.embedding_stats == {"api_calls": 1, "cache_hits": 200, "embedded": 1}
+    # Query embeddings are cached separately from document embeddings
+    second.embed_texts(["article 1"], input_type="search_query")
+    assert second.co.calls[-1] == ["article 1"]
+
+
+def test_cache_defaults_to_index_dir(make_service, tmp_path, monkeypatch):
+    monkeypatch.delenv("EMBEDDING_CACHE_PATH", raising=False)
+    index_dir = tmp_path / "index"
+    make_service(index_dir=str(index_dir)).build_index(corpus(20))
+
+    restarted = make_service(index_dir=str(index_dir))
+    restarted.build_index(corpus(20))
+
+    assert (index_dir / "embeddings.db").exists()
+    assert restarted.co.calls == []
+    assert make_service().embedding_cache.path == ":memory:"
+
+
+def test_failures_are_retried_not_randomized(make_service, ssr):
+    service = make_service(FakeCohere(failures=2))
+
+    embeddings = service.embed_texts(["hello"])
+
+    assert len(service.co.calls) == 3
+    np.testing.assert_allclose(embeddings[0], service.co.vector("hello"), rtol=1e-6)
+
+    broken = make_service(FakeCohere(failures=10), max_retries=2)
+    with pytest.raises(ssr.EmbeddingError):
+        broken.embed_texts(["hello"])
+    assert len(broken.co.calls) == 3
+    assert len(broken.embedding_cache) == 0
+
+
+def test_rate_limiter_spaces_calls(ssr, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(ssr.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(ssr.time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    limiter = ssr.RateLimiter(calls_per_minute=60, burst=2)
+
+    for _ in range(5):
+        limiter.acquire()
+
+    # Two calls from the burst, then one per second
+    assert clock[0] == pytest.approx(3.0)
+
+
+def corpus(n, prefix="article"):
+    return [{"text": f"{prefix} {i}", "id": i} for i in range(n)]
+
+
+def test_index_persists_and_loads_without_reembedding(make_service, tmp_path):
+    index_dir = str(tmp_path / "index")
+    service = make_service(index_dir=index_dir)
+    service.build_index(corpus(50))
+
+    restarted = make_service(index_dir=index_dir)
+
+    assert restarted.co.calls == []
+    assert len(restarted) == 50
+    assert isinstance(restarted.embeddings, np.memmap)
+    assert restarted.documents[7] == {"text": "article 7", "id": 7}
+    hits = restarted.search("article 7", top_k=3)
+    assert hits[0]["id"] == 7 and hits[0]["similarity_score"] == pytest.approx(1.0, abs=1e-4)
+    assert restarted.co.calls == [["article 7"]]
+
+
+def test_annoy_index_is_memory_mapped_on_startup(make_service, ssr, tmp_path):
+    pytest.importorskip("annoy")
+    index_dir = tmp_path / "index"
+    make_service(index_dir=str(index_dir)).build_index(corpus(30))
+
+    restarted = make_service(index_dir=str(index_dir))
+
+    version = (index_dir / "CURRENT").read_text()
+    assert (index_dir / version / "annoy.ann").exists()
+    assert isinstance(restarted.search_index, ssr.AnnoyVectorIndex) and len(restarted.search_index) == 30
+    assert [r["id"] for r in restarted.find_similar(3, top_k=2)] != [3]
+
+
+def test_added_documents_are_searchable_before_merge(make_service):
+    service = make_service(merge_threshold=100)
+    service.build_index(corpus(20))
+
+    service.add_documents(corpus(5, prefix="fresh"))
+
+    assert len(service) == 25 and len(service.documents) == 20
+    assert service.search("fresh 3", top_k=1)[0]["text"] == "fresh 3"
+    assert service.search("article 4", top_k=1, include_distances=False) == [{"text": "article 4", "id": 4}]
+    similar = service.find_similar(22, top_k=5)
+    assert len(similar) == 5 and {"text": "fresh 2", "id": 2} not in similar
+
+
+def test_delta_merges_in_background_and_is_persisted(make_service, tmp_path):
+    index_dir = tmp_path / "index"
+    service = make_service(index_dir=str(index_dir), merge_threshold=10)
+    service.build_index(corpus(20))
+    first_version = (index_dir / "CURRENT").read_text()
+
+    service.add_documents(corpus(6, prefix="fresh"))
+    assert service._merge_thread is None
+    service.add_documents(corpus(6, prefix="later"))
+    service._merge_thread.join(timeout=10)
+
+    assert len(service.documents) == 32 and len(service) == 32
+    assert service._delta_documents == []
+    assert (index_dir / "CURRENT").read_text() != first_version
+    assert len(make_service(index_dir=str(index_dir)).documents) == 32
+    assert service.search("later 5", top_k=1)[0]["text"] == "later 5"
+
+
+def test_rebuild_during_merge_is_what_gets_persisted(make_service, tmp_path):
+    index_dir = str(tmp_path / "index")
+    service = make_service(index_dir=index_dir, merge_threshold=100, backend="exact")
+    service.build_index(corpus(5))
+    service.add_documents(corpus(1, prefix="delta"))
+
+    # Hold the merge after it has snapshotted the old index
+    entered, release = threading.Event(), threading.Event()
+    build = service._build_search_index
+
+    def held_build(embeddings):
+        if threading.current_thread().name == "semantic-index-merge":
+            entered.set()
+            release.wait(10)
+        return build(embeddings)
+
+    service._build_search_index = held_build
+    service.merge_delta(wait=False)
+    assert entered.wait(10)
+    service.build_index(corpus(3, prefix="fresh"))
+    release.set()
+    service._merge_thread.join(timeout=10)
+
+    assert [d["text"] for d in service.documents] == ["fresh 0", "fresh 1", "fresh 2"]
+    restarted = make_service(index_dir=index_dir, backend="exact")
+    assert [d["text"] for d in restarted.documents] == ["fresh 0", "fresh 1", "fresh 2"]
+    assert len([p for p in Path(index_dir).iterdir() if p.name.startswith(".staging")]) == 0
+
+
+def test_save_index_requires_index_dir_and_folds_in_delta(make_service, tmp_path):
+    service = make_service()
+    service.build_index(corpus(5))
+    with pytest.raises(ValueError):
+        service.save_index()
+
+    service.index_dir = str(tmp_path / "index")
+    service.add_documents(corpus(2, prefix="fresh"))
+    version = service.save_index()
+
+    assert version == "v000001"
+    assert len(make_service(index_dir=service.index_dir)) == 7
+
+
+def test_top_k_matches_full_sort(ssr):
+    scores = np.random.default_rng(0).standard_normal((4, 500)).astype(np.float32)
+
+    top = ssr.top_k_indices(scores, 10)
+
+    np.testing.assert_array_equal(top, np.argsort(-scores, axis=1, kind="stable")[:, :10])
+    assert ssr.top_k_indices(scores[0], 900).shape == (500,)
+    assert ssr.top_k_indices(scores[0], 0).shape == (0,)
+
+
+def test_embeddings_are_stored_normalized(make_service, ssr):
+    service = make_service(backend="exact")
+    raw = np.random.default_rng(1).standard_normal((30, 8)) * 5
+    raw[3] = 0
+
+    service.index_embeddings(corpus(30), raw)
+
+    assert service.embeddings.dtype == np.float32
+    norms = np.linalg.norm(service.embeddings, axis=1)
+    np.testing.assert_allclose(np.delete(norms, 3), 1.0, rtol=1e-5)
+    assert norms[3] == 0
+    with pytest.raises(ValueError):
+        service.index_embeddings(corpus(2), raw)
+
+
+def test_search_many_matches_single_queries(make_service):
+    service = make_service(backend="exact", merge_threshold=100)
+    service.build_index(corpus(300))
+    service.add_documents(corpus(5, prefix="fresh"))
+    queries = ["article 10", "fresh 1", "article 299", "something else"]
+
+    batch = service.search_many(queries, top_k=5)
+
+    assert [[hit.index for hit in hits] for hits in batch] == \
+        [[hit.index for hit in service.search(q, top_k=5)] for q in queries]
+    assert batch[0][0]["text"] == "article 10" and batch[1][0]["text"] == "fresh 1"
+    assert batch[1][0].index == 301
+    assert service.search_many([]) == []
+
+
+def test_hits_are_views_not_copies(make_service):
+    service = make_service(backend="exact")
+    documents = corpus(10)
+    service.build_index(documents)
+
+    hit = service.search("article 2", top_k=1)[0]
+
+    assert hit.document is service.documents[2]
+    assert hit["similarity_score"] == pytest.approx(1.0, abs=1e-5) and hit.score == hit["similarity_score"]
+    assert dict(hit) == {"text": "article 2", "id": 2, "similarity_score": hit.score}
+    copy = hit.copy()
+    copy["rerank_score"] = 0.5
+    assert "rerank_score" not in service.documents[2]
+
+
+def clustered(n, queries=50, dim=32, clusters=20, seed=0):
+    """Corpus and held-out queries drawn from the same Gaussian mixture"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    points = centers[rng.integers(clusters, size=n + queries)] + 0.3 * rng.standard_normal((n + queries, dim))
+    points = points.astype(np.float32)
+    return points[:n], points[n:]
+
+
+def recall_at_k(ssr, index, vectors, queries, k=10):
+    exact = ssr.top_k_indices(ssr.normalize_rows(queries) @ vectors.T, k)
+    found, _ = index.search(ssr.normalize_rows(queries), k)
+    return np.mean([len(set(a) & set(b)) / k for a, b in zip(exact, found)])
+
+
+@pytest.mark.parametrize("params, min_recall, compression", [
+    ({"quantizer": "pq", "m": 16, "nprobe": 8}, 0.7, 8),
+    ({"quantizer": "pq", "m": 8, "nprobe": 8, "refine": 10}, 0.95, 16),
+    ({"quantizer": "int8", "nprobe": 8}, 0.95, 4),
+])
+def test_ivf_recall_and_memory(ssr, params, min_recall, compression):
+    corpus_vectors, queries = clustered(3000)
+    vectors = ssr.normalize_rows(corpus_vectors)
+    index = ssr.IVFPQVectorIndex(32, nlist=32, **params)
+    index.build(vectors)
+
+    assert recall_at_k(ssr, index, vectors, queries) >= min_recall
+    # pq stores m bytes per vector, int8 one byte per dimension, vs 128 bytes as float32
+    assert index.code_bytes * compression == vectors.nbytes
+    assert index.list_offsets[-1] == 3000 and sorted(index.ids) == list(range(3000))
+
+
+def test_ivf_nprobe_trades_recall(ssr):
+    corpus_vectors, queries = clustered(3000)
+    vectors = ssr.normalize_rows(corpus_vectors)
+    index = ssr.IVFPQVectorIndex(32, nlist=64, quantizer="int8", nprobe=1)
+    index.build(vectors)
+
+    low = recall_at_k(ssr, index, vectors, queries)
+    index.nprobe = 64
+
+    assert recall_at_k(ssr, index, vectors, queries) > max(low, 0.95)
+
+
+def test_hnsw_backend_recall(ssr):
+    pytest.importorskip("hnswlib")
+    corpus_vectors, queries = clustered(2000)
+    vectors = ssr.normalize_rows(corpus_vectors)
+    index = ssr.HNSWVectorIndex(32, M=16, ef_construction=100, ef_search=64)
+    index.build(vectors)
+
+    assert recall_at_k(ssr, index, vectors, queries) >= 0.95
+    ids, scores = index.search(vectors[:1], 5000)
+    assert ids.shape == (1, 5000) and ids[0, 2000] == -1
+
+
+@pytest.mark.parametrize("backend, params", [
+    ("ivfpq", {"nlist": 16, "m": 4, "refine": 4}),
+    ("hnsw", {"M": 8}),
+    ("exact", {}),
+])
+def test_backends_serve_and_persist(make_service, ssr, tmp_path, backend, params):
+    if backend == "hnsw":
+        pytest.importorskip("hnswlib")
+    index_dir = str(tmp_path / "index")
+    service = make_service(backend=backend, index_params=params, index_dir=index_dir)
+    service.build_index(corpus(400))
+
+    restarted = make_service(backend=backend, index_params=params, index_dir=index_dir)
+
+    assert restarted.co.calls == []
+    assert type(restarted.search_index) is type(service.search_index)
+    if backend == "ivfpq":
+        assert isinstance(restarted.search_index.codes, np.memmap)
+        assert restarted.search_index.params["nlist"] == 16
+    assert restarted.search("article 123", top_k=3)[0]["id"] == 123
+    assert [h.index for h in restarted.find_similar(5, top_k=3)] == [h.index for h in service.find_similar(5, top_k=3)]
+
+
+def test_switching_backend_reindexes_stored_embeddings(make_service, ssr, tmp_path, monkeypatch):
+    index_dir = str(tmp_path / "index")
+    make_service(backend="exact", index_dir=index_dir).build_index(corpus(100))
+
+    switched = make_service(backend="ivfpq", index_params={"nlist": 4, "m": 4}, index_dir=index_dir)
+
+    assert switched.co.calls == []
+    assert isinstance(switched.search_index, ssr.IVFPQVectorIndex) and len(switched.search_index) == 100
+    assert (Path(index_dir) / "CURRENT").read_text() == "v000002"
+
+    # The re-indexed version was saved, so the next startup memory-maps it instead of rebuilding
+    monkeypatch.setattr(ssr.IVFPQVectorIndex, "build", lambda self, vectors: pytest.fail("index rebuilt"))
+    restarted = make_service(backend="ivfpq", index_params={"nlist": 4, "m": 4}, index_dir=index_dir)
+
+    assert isinstance(restarted.search_index.codes, np.memmap)
+    assert restarted.search("article 42", top_k=1)[0]["id"] == 42
+
+
+@pytest.mark.parametrize("backend, built, restarted_with", [
+    ("ivfpq", {"nlist": 8, "m": 4, "nprobe": 2}, {"nlist": 8, "m": 4, "nprobe": 8, "refine": 4}),
+    ("hnsw", {"M": 8, "ef_search": 16}, {"M": 8, "ef_search": 256}),
+])
+def test_restart_applies_new_query_params(make_service, ssr, tmp_path, monkeypatch, backend, built, restarted_with):
+    if backend == "hnsw":
+        pytest.importorskip("hnswlib")
+    index_dir = str(tmp_path / "index")
+    make_service(backend=backend, index_params=built, index_dir=index_dir).build_index(corpus(200))
+
+    backend_cls = ssr.VECTOR_BACKENDS[backend]
+    monkeypatch.setattr(backend_cls, "build", lambda self, vectors: pytest.fail("index rebuilt"))
+    restarted = make_service(backend=backend, index_params=restarted_with, index_dir=index_dir)
+
+    for key, value in restarted_with.items():
+        assert restarted.search_index.params[key] == value
+    assert (Path(index_dir) / "CURRENT").read_text() == "v000001"
+    assert restarted.search("article 123", top_k=1)[0]["id"] == 123
+
+
+def test_restart_with_new_build_params_rebuilds_from_stored_embeddings(make_service, tmp_path):
+    index_dir = str(tmp_path / "index")
+    make_service(backend="ivfpq", index_params={"nlist": 4, "m": 4}, index_dir=index_dir).build_index(corpus(100))
+
+    restarted = make_service(backend="ivfpq", index_params={"nlist": 8, "m": 4}, index_dir=index_dir)
+
+    assert restarted.co.calls == []
+    assert restarted.search_index.params["nlist"] == 8
+    assert (Path(index_dir) / "CURRENT").read_text() == "v000002"
+    assert make_service(backend="ivfpq", index_dir=index_dir).search_index.params["nlist"] == 8
+
+
+def test_incomplete_backend_fails_at_construction(ssr):
+    class NoSearch(ssr.VectorIndex):
+        def build(self, embeddings):
+            pass
+
+        def save(self, directory):
+            pass
+
+        @classmethod
+        def load(cls, directory, dim, params, embeddings):
+            return cls(dim)
+
+    with pytest.raises(TypeError, match="search"):
+        NoSearch(8)
+
+
+def test_unknown_backend_and_bad_params(ssr):
+    with pytest.raises(ValueError):
+        ssr.SemanticSearchService(cohere_key="test", backend="elasticsearch")
+    with pytest.raises(ValueError):
+        ssr.IVFPQVectorIndex(30, m=8)
+    with pytest.raises(ValueError):
+        ssr.IVFPQVectorIndex(32, quantizer="fp16")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark recall@k vs QPS for the semantic search vector backends.
+
+Builds each backend on a synthetic Gaussian-mixture corpus and sweeps its
+query-time knob (HNSW ef_search, IVF nprobe, Annoy search_k), measuring
+recall@k against exact search, batch QPS, build time and index size.
+Backends whose optional dependency is missing are skipped.
+
+Usage:
+    python scripts/bench_ann_backends.py --docs 50000 --dim 256
+    python scripts/bench_ann_backends.py --backends hnsw ivfpq --json ann.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.semantic_search_rag import (  # noqa: E402
+    AnnoyVectorIndex,
+    HNSWVectorIndex,
+    IVFPQVectorIndex,
+    normalize_rows,
+    top_k_indices,
+)
+
+
+def synthetic_corpus(n, n_queries, dim, clusters, seed=0):
+    """Clustered embeddings with held-out queries from the same distribution"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    total = n + n_queries
+    points = centers[rng.integers(clusters, size=total)] + 0.5 * rng.standard_normal((total, dim), dtype=np.float32)
+    points = normalize_rows(points)
+    return points[:n], points[n:]
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def measure(index, queries, truth, k):
+    start = time.perf_counter()
+    found, _ = index.search(queries, k)
+    elapsed = time.perf_counter() - start
+    recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(truth, found)])
+    return recall, len(queries) / elapsed
+
+
+def sweeps(args, dim):
+    """(label, factory, knob attribute, knob values)"""
+    return {
+        "hnsw": (f"hnsw M={args.hnsw_m}", lambda: HNSWVectorIndex(dim, M=args.hnsw_m, ef_construction=200),
+                 "ef_search", [16, 32, 64, 128, 256]),
+        "ivfpq": (f"ivf-pq m={args.pq_m} refine={args.refine}",
+                  lambda: IVFPQVectorIndex(dim, m=args.pq_m, refine=args.refine),
+                  "nprobe", [1, 4, 8, 16, 32, 64]),
+        "ivf-int8": ("ivf-int8", lambda: IVFPQVectorIndex(dim, quantizer="int8"),
+                     "nprobe", [1, 4, 8, 16, 32, 64]),
+        "annoy": ("annoy trees=50", lambda: AnnoyVectorIndex(dim, n_trees=50),
+                  "search_k", [500, 2000, 5000, 20000]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--backends", nargs="+", default=["hnsw", "ivfpq", "ivf-int8", "annoy"])
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    parser.add_argument("--pq-m", type=int, default=64, help="PQ sub-quantizers (bytes per vector)")
+    parser.add_argument("--refine", type=int, default=4, help="IVF-PQ re-scoring factor (0 = codes only)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    corpus, queries = synthetic_corpus(args.docs, args.queries, args.dim, args.clusters)
+    print(f"corpus: {args.docs} x {args.dim} float32 ({corpus.nbytes / 2**20:.0f} MB), "
+          f"{args.queries} queries, recall@{args.k}")
+
+    start = time.perf_counter()
+    truth = top_k_indices(queries @ corpus.T, args.k)
+    exact_qps = args.queries / (time.perf_counter() - start)
+    results = [{"backend": "exact", "knob": None, "value": None, "recall": 1.0, "qps": exact_qps,
+                "build_seconds": 0.0, "index_mb": corpus.nbytes / 2**20}]
+
+    print(f"\n{'backend':<26} {'knob':<16} {'recall':>7} {'QPS':>9} {'build s':>8} {'index MB':>9}")
+    print("-" * 80)
+    print(f"{'exact':<26} {'-':<16} {1.0:7.3f} {exact_qps:9.0f} {0.0:8.1f} {corpus.nbytes / 2**20:9.1f}")
+
+    available = sweeps(args, args.dim)
+    for name in args.backends:
+        label, factory, knob, values = available[name]
+        try:
+            index = factory()
+        except ImportError as e:
+            print(f"{label:<26} skipped ({e})")
+            continue
+
+        start = time.perf_counter()
+        index.build(corpus)
+        build_seconds = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(directory)
+            index_mb = directory_size(directory) / 2**20
+
+        for value in values:
+            setattr(index, knob, value)
+            recall, qps = measure(index, queries, truth, args.k)
+            print(f"{label:<26} {f'{knob}={value}':<16} {recall:7.3f} {qps:9.0f} {build_seconds:8.1f} {index_mb:9.1f}")
+            results.append({"backend": name, "knob": knob, "value": value, "recall": recall, "qps": qps,
+                            "build_seconds": build_seconds, "index_mb": index_mb})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark exact (brute-force) semantic search on a synthetic corpus.
+
+Compares the previous per-query path (recompute corpus norms, full argsort,
+copy each document dict) against pre-normalized float32 search with
+argpartition top-k, for single queries and batched search_many-style calls.
+No Cohere calls are made; embeddings are random.
+
+Usage:
+    python scripts/bench_semantic_search.py --docs 100000 --dim 1024
+    python scripts/bench_semantic_search.py --queries 1000 --top-k 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.semantic_search_rag import SemanticSearchService  # noqa: E402
+
+
+def legacy_search(embeddings, documents, query, top_k):
+    """Previous _search_brute_force"""
+    similarities = np.dot(embeddings, query) / (
+        np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query)
+    )
+    top_indices = np.argsort(similarities)[-top_k:][::-1]
+    results = []
+    for idx in top_indices:
+        result = documents[idx].copy()
+        result['similarity_score'] = float(similarities[idx])
+        results.append(result)
+    return results
+
+
+def bench(label, fn, n_queries):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed / n_queries * 1000:8.2f} ms/query  {n_queries / elapsed:8.1f} QPS")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy-queries", type=int, default=20,
+                        help="Queries to run through the previous implementation")
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((args.docs, args.dim), dtype=np.float32)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    documents = [{"text": f"document {i}", "id": i} for i in range(args.docs)]
+    print(f"corpus: {args.docs} x {args.dim} ({embeddings.nbytes / 2**20:.0f} MB float32), "
+          f"{args.queries} queries, top_k={args.top_k}")
+
+    service = SemanticSearchService(cohere_key="benchmark", backend="exact")
+    start = time.perf_counter()
+    service.index_embeddings(documents, embeddings)
+    print(f"{'index (normalize once)':<36} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    legacy_corpus = embeddings.astype(np.float64)
+    n_legacy = min(args.legacy_queries, args.queries)
+    legacy = bench("legacy per-query", lambda: [
+        legacy_search(legacy_corpus, documents, q, args.top_k) for q in queries[:n_legacy]
+    ], n_legacy)
+    single = bench("pre-normalized single query", lambda: [
+        service.search_vectors(q[None, :], args.top_k) for q in queries
+    ], args.queries)
+    batch = bench("pre-normalized batch (search_many)", lambda: service.search_vectors(queries, args.top_k),
+                  args.queries)
+
+    print(f"speedup vs legacy: single {legacy / n_legacy / (single / args.queries):.1f}x, "
+          f"batch {legacy / n_legacy / (batch / args.queries):.1f}x")
+
+    expected = [r["id"] for r in legacy_search(legacy_corpus, documents, queries[0], args.top_k)]
+    got = [hit.index for hit in service.search_vectors(queries[0], args.top_k)[0]]
+    print(f"top-{args.top_k} matches legacy: {expected == got}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,40 +3,680 @@ Semantic Search and RAG Service for Vaal AI Empire
 Combines Cohere embeddings with vector search for intelligent content discovery
 """
 
+import hashlib
+import json
 import logging
+import mmap
 import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 import cohere
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Cohere accepts at most 96 texts per embed call
+EMBED_BATCH_SIZE = 96
+
+# Embedding cache kept next to the persisted index when no cache_path is given
+EMBEDDING_CACHE_FILE = "embeddings.db"
+
+# Bump when the on-disk index layout changes
+# (2: embeddings stored L2-normalized, 3: pluggable backend files)
+INDEX_FORMAT_VERSION = 3
+
+# Queries per matrix product in search_vectors, bounding the score matrix size
+QUERY_BLOCK = 256
+
+
+class EmbeddingError(RuntimeError):
+    """Embedding request failed after all retries"""
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting calls per minute"""
+
+    def __init__(self, calls_per_minute: float, burst: Optional[int] = None):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(calls_per_minute // 60)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store backed by SQLite
+
+    Vectors are stored as float32 blobs keyed on (model, input_type,
+    sha256(text)), so re-indexing an unchanged corpus needs no API calls.
+    Use ":memory:" for a per-process cache.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS embeddings (
+        model TEXT NOT NULL,
+        input_type TEXT NOT NULL,
+        text_hash TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        vector BLOB NOT NULL,
+        PRIMARY KEY (model, input_type, text_hash)
+    ) WITHOUT ROWID;
+    """
+
+    # SQLite's default limit on bound parameters is 999
+    _QUERY_CHUNK = 900
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, input_type: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return cached vectors for whichever hashes are present"""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique), self._QUERY_CHUNK):
+                chunk = unique[start:start + self._QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND input_type = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (model, input_type, *chunk)
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, input_type: str, items: Dict[str, np.ndarray]):
+        """Store vectors keyed by text hash"""
+        rows = [
+            (model, input_type, text_hash, len(vector), np.asarray(vector, dtype=np.float32).tobytes())
+            for text_hash, vector in items.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, input_type, text_hash, dim, vector) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as float32 so cosine similarity is a plain dot product"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores along the last axis, best first"""
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    if k < n:
+        part = np.argpartition(scores, n - k, axis=-1)[..., n - k:]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+
+class SearchHit(Mapping):
+    """
+    Search result: corpus index and score plus a read-only view of the document
+
+    Reads like the document dict with ``similarity_score`` (and Annoy's
+    ``distance``) added, but the document is only fetched when a field is
+    accessed and is never copied; use ``dict(hit)`` for a mutable copy.
+    """
+
+    __slots__ = ("index", "score", "distance", "_source", "_offset", "_with_scores", "_doc")
+
+    def __init__(self, index: int, score: float, distance: Optional[float], source: Sequence[Dict],
+                 offset: int = 0, with_scores: bool = True):
+        self.index = index
+        self.score = score
+        self.distance = distance
+        self._source = source
+        self._offset = offset
+        self._with_scores = with_scores
+        self._doc = None
+
+    @property
+    def document(self) -> Dict:
+        if self._doc is None:
+            self._doc = self._source[self.index - self._offset]
+        return self._doc
+
+    def _extra(self) -> Dict[str, float]:
+        if not self._with_scores:
+            return {}
+        if self.distance is None:
+            return {"similarity_score": self.score}
+        return {"similarity_score": self.score, "distance": self.distance}
+
+    def __getitem__(self, key):
+        extra = self._extra()
+        if key in extra:
+            return extra[key]
+        return self.document[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.document
+        yield from (key for key in self._extra() if key not in self.document)
+
+    def __len__(self) -> int:
+        return len(set(self.document) | set(self._extra()))
+
+    def copy(self) -> Dict:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"SearchHit(index={self.index}, score={self.score:.4f})"
+
+
+# ============================================================================
+# Vector index backends
+# ============================================================================
+
+def _kmeans(
+    vectors: np.ndarray,
+    k: int,
+    iterations: int,
+    rng: np.random.Generator,
+    block: int = 16384
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lloyd's k-means; returns (centroids, assignments)"""
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignments = _assign(vectors, centroids, block)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Re-seed empty clusters from random points
+        if empty.any():
+            centroids[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+    return centroids, _assign(vectors, centroids, block)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, block: int = 16384) -> np.ndarray:
+    """Nearest centroid (squared L2) for each vector, in blocks to bound memory"""
+    half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block):
+        chunk = np.asarray(vectors[start:start + block], dtype=np.float32)
+        out[start:start + block] = np.argmax(chunk @ centroids.T - half_norms, axis=1)
+    return out
+
+
+class VectorIndex(ABC):
+    """
+    Nearest neighbour index over L2-normalized float32 vectors
+
+    Scores are inner products (cosine similarity). ``search`` returns
+    (ids, scores) arrays of shape (queries, k), padded with id -1 when fewer
+    than k results are found. Backends persist into a version directory next
+    to the service's embeddings.npy.
+    """
+
+    name = ""
+    reports_distance = False
+    # Parameters that only affect queries; a saved index can be reopened with new values
+    QUERY_PARAMS: Tuple[str, ...] = ()
+
+    def __init__(self, dim: int, **params):
+        self.dim = dim
+        self.count = 0
+
+    @property
+    def params(self) -> Dict:
+        """Construction parameters, recorded in the index manifest"""
+        return {}
+
+    @abstractmethod
+    def build(self, embeddings: np.ndarray):
+        """Index the (n, dim) normalized embeddings; row i gets id i"""
+
+    @abstractmethod
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (ids, scores) of the k best matches per query row"""
+
+    @abstractmethod
+    def save(self, directory: str):
+        """Write the index files into a version directory"""
+
+    @classmethod
+    @abstractmethod
+    def load(cls, directory: str, dim: int, params: Dict, embeddings: np.ndarray) -> "VectorIndex":
+        """Open an index written by save(); embeddings is the version's memory-mapped copy"""
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def _pad(rows: List[Tuple[List[int], List[float]]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        ids = np.full((len(rows), k), -1, dtype=np.int64)
+        scores = np.full((len(rows), k), -np.inf, dtype=np.float32)
+        for i, (row_ids, row_scores) in enumerate(rows):
+            ids[i, :len(row_ids)] = row_ids
+            scores[i, :len(row_scores)] = row_scores
+        return ids, scores
+
+
+class AnnoyVectorIndex(VectorIndex):
+    """
+    Annoy random-projection forest (memory-mapped on load)
+
+    n_trees trades build time and size for recall; search_k (default
+    n_trees * k) trades query latency for recall.
+    """
+
+    name = "annoy"
+    reports_distance = True
+    QUERY_PARAMS = ("search_k",)
+    FILENAME = "annoy.ann"
+
+    def __init__(self, dim: int, n_trees: int = 10, search_k: int = -1):
+        from annoy import AnnoyIndex
+
+        super().__init__(dim)
+        self.n_trees = n_trees
+        self.search_k = search_k
+        self.index = AnnoyIndex(dim, 'angular')
+
+    @property
+    def params(self) -> Dict:
+        return {"n_trees": self.n_trees, "search_k": self.search_k}
+
+    def build(self, embeddings: np.ndarray):
+        for i, embedding in enumerate(embeddings):
+            self.index.add_item(i, embedding)
+        self.index.build(self.n_trees)
+        self.count = len(embeddings)
+        logger.info(f"Annoy index built with {self.n_trees} trees")
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        rows = []
+        for query in queries:
+            ids, distances = self.index.get_nns_by_vector(query, k, self.search_k, include_distances=True)
+            # Angular distance is sqrt(2 - 2 cos) on normalized vectors
+            rows.append((ids, [1 - d * d / 2 for d in distances]))
+        return self._pad(rows, k)
+
+    def save(self, directory: str):
+        self.index.save(os.path.join(directory, self.FILENAME))
+
+    @classmethod
+    def load(cls, directory: str, dim: int, params: Dict, embeddings: np.ndarray) -> "AnnoyVectorIndex":
+        instance = cls(dim, **params)
+        instance.index.load(os.path.join(directory, cls.FILENAME))  # mmap, no rebuild
+        instance.count = instance.index.get_n_items()
+        return instance
+
+
+class HNSWVectorIndex(VectorIndex):
+    """
+    Hierarchical navigable small world graph (hnswlib)
+
+    M and ef_construction set graph degree and build quality; ef_search
+    (raised to at least k per query) trades latency for recall.
+    """
+
+    name = "hnsw"
+    QUERY_PARAMS = ("ef_search",)
+    FILENAME = "hnsw.bin"
+
+    def __init__(self, dim: int, M: int = 16, ef_construction: int = 200, ef_search: int = 64, seed: int = 100):
+        import hnswlib
+
+        super().__init__(dim)
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        self.index = hnswlib.Index(space="ip", dim=dim)
+
+    @property
+    def params(self) -> Dict:
+        return {"M": self.M, "ef_construction": self.ef_construction, "ef_search": self.ef_search,
+                "seed": self.seed}
+
+    def build(self, embeddings: np.ndarray):
+        self.index.init_index(max_elements=len(embeddings), M=self.M,
+                              ef_construction=self.ef_construction, random_seed=self.seed)
+        self.index.add_items(np.asarray(embeddings, dtype=np.float32), np.arange(len(embeddings)))
+        self.count = len(embeddings)
+        logger.info(f"HNSW index built (M={self.M}, ef_construction={self.ef_construction})")
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        found = min(k, self.count)
+        self.index.set_ef(max(self.ef_search, found))
+        labels, distances = self.index.knn_query(queries, k=found)
+        # hnswlib's "ip" distance is 1 - inner product
+        return self._pad([(row, 1 - dist) for row, dist in zip(labels, distances)], k)
+
+    def save(self, directory: str):
+        self.index.save_index(os.path.join(directory, self.FILENAME))
+
+    @classmethod
+    def load(cls, directory: str, dim: int, params: Dict, embeddings: np.ndarray) -> "HNSWVectorIndex":
+        instance = cls(dim, **params)
+        instance.index.load_index(os.path.join(directory, cls.FILENAME))
+        instance.count = instance.index.get_current_count()
+        return instance
+
+
+class IVFPQVectorIndex(VectorIndex):
+    """
+    Inverted file index with quantized residuals (pure numpy)
+
+    Vectors are bucketed by a k-means coarse quantizer into ``nlist`` lists;
+    each residual is stored as product-quantization codes (``m`` bytes per
+    vector) or int8 (one byte per dimension), cutting memory 4x (int8) to
+    4 * dim / m (pq) versus float32. Queries scan the ``nprobe`` closest
+    lists with table lookups; ``refine`` > 0 re-scores the best
+    k * refine candidates against the memory-mapped float32 embeddings.
+    Lists and codes are saved as .npy and memory-mapped on load, so the
+    corpus does not have to fit in RAM.
+    """
+
+    name = "ivfpq"
+    QUERY_PARAMS = ("nprobe", "refine")
+    ARRAYS = ("centroids", "list_offsets", "ids", "codes", "codebooks", "scale", "offset")
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        quantizer: str = "pq",
+        m: int = 16,
+        refine: int = 0,
+        train_size: int = 50_000,
+        pq_train_size: int = 10_000,
+        iterations: int = 10,
+        seed: int = 0
+    ):
+        super().__init__(dim)
+        if quantizer not in ("pq", "int8"):
+            raise ValueError(f"quantizer must be 'pq' or 'int8', not {quantizer!r}")
+        if quantizer == "pq" and dim % m:
+            raise ValueError(f"dim {dim} is not divisible by m={m}")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.quantizer = quantizer
+        self.m = m
+        self.refine = refine
+        self.train_size = train_size
+        self.pq_train_size = pq_train_size
+        self.iterations = iterations
+        self.seed = seed
+        self.vectors: Optional[np.ndarray] = None
+        self.centroids = self.list_offsets = self.ids = self.codes = None
+        self.codebooks = self.scale = self.offset = None
+
+    @property
+    def params(self) -> Dict:
+        return {"nlist": self.nlist, "nprobe": self.nprobe, "quantizer": self.quantizer, "m": self.m,
+                "refine": self.refine, "train_size": self.train_size, "pq_train_size": self.pq_train_size,
+                "iterations": self.iterations,
+                "seed": self.seed}
+
+    @property
+    def code_bytes(self) -> int:
+        return self.codes.nbytes if self.codes is not None else 0
+
+    def build(self, embeddings: np.ndarray):
+        rng = np.random.default_rng(self.seed)
+        n = len(embeddings)
+        self.nlist = min(self.nlist or max(1, int(4 * np.sqrt(n))), n)
+        sample = np.asarray(embeddings[np.sort(rng.choice(n, min(n, self.train_size), replace=False))],
+                            dtype=np.float32)
+
+        self.centroids, _ = _kmeans(sample, self.nlist, self.iterations, rng)
+        assignments = _assign(embeddings, self.centroids)
+        order = np.argsort(assignments, kind="stable")
+        self.ids = order.astype(np.int64)
+        self.list_offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=self.nlist), out=self.list_offsets[1:])
+
+        sample_residuals = sample - self.centroids[_assign(sample, self.centroids)]
+        if self.quantizer == "pq":
+            # 256-centroid codebooks converge on ~40 points per centroid; more mostly costs build time
+            sample_residuals = sample_residuals[:self.pq_train_size]
+            dsub = self.dim // self.m
+            self.codebooks = np.stack([
+                _kmeans(sample_residuals[:, j * dsub:(j + 1) * dsub], 256, self.iterations, rng)[0]
+                for j in range(self.m)
+            ])
+        else:
+            low, high = sample_residuals.min(axis=0), sample_residuals.max(axis=0)
+            self.scale = np.maximum(high - low, 1e-12).astype(np.float32) / 255
+            self.offset = (low + 128 * self.scale).astype(np.float32)
+
+        self.codes = np.empty((n, self.m if self.quantizer == "pq" else self.dim),
+                              dtype=np.uint8 if self.quantizer == "pq" else np.int8)
+        for start in range(0, n, 16384):
+            rows = order[start:start + 16384]
+            residuals = np.asarray(embeddings[rows], dtype=np.float32) - self.centroids[assignments[rows]]
+            self.codes[start:start + len(rows)] = self._encode(residuals)
+
+        self.vectors = embeddings
+        self.count = n
+        logger.info(f"IVF index built: {self.nlist} lists, {self.quantizer} codes, "
+                    f"{self.codes.nbytes / max(n, 1):.0f} bytes/vector")
+
+    def _encode(self, residuals: np.ndarray) -> np.ndarray:
+        if self.quantizer == "int8":
+            return np.clip(np.rint((residuals - self.offset) / self.scale), -128, 127).astype(np.int8)
+        dsub = self.dim // self.m
+        return np.stack([
+            _assign(residuals[:, j * dsub:(j + 1) * dsub], self.codebooks[j]) for j in range(self.m)
+        ], axis=1).astype(np.uint8)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        probes = top_k_indices(queries @ self.centroids.T, self.nprobe)
+        rows = []
+        for query, lists in zip(queries, probes):
+            starts, ends = self.list_offsets[lists], self.list_offsets[lists + 1]
+            sizes = ends - starts
+            if not sizes.sum():
+                rows.append(([], []))
+                continue
+            positions = np.concatenate([np.arange(a, b) for a, b in zip(starts, ends)])
+            codes = np.asarray(self.codes[positions])
+            # <q, x> = <q, centroid> + <q, residual>
+            scores = np.repeat(self.centroids[lists] @ query, sizes)
+            if self.quantizer == "pq":
+                tables = np.einsum("mcd,md->mc", self.codebooks, query.reshape(self.m, -1))
+                scores += tables[np.arange(self.m), codes].sum(axis=1)
+            else:
+                scores += codes.astype(np.float32) @ (query * self.scale) + float(query @ self.offset)
+            ids = np.asarray(self.ids[positions])
+
+            if self.refine and self.vectors is not None:
+                # Sorted ids keep reads from the memory-mapped embeddings sequential
+                ids = np.sort(ids[top_k_indices(scores, k * self.refine)])
+                scores = np.asarray(self.vectors[ids], dtype=np.float32) @ query
+            best = top_k_indices(scores, k)
+            rows.append((ids[best], scores[best]))
+        return self._pad(rows, k)
+
+    def save(self, directory: str):
+        for name in self.ARRAYS:
+            value = getattr(self, name)
+            if value is not None:
+                np.save(os.path.join(directory, f"ivf_{name}.npy"), value)
+
+    @classmethod
+    def load(cls, directory: str, dim: int, params: Dict, embeddings: np.ndarray) -> "IVFPQVectorIndex":
+        instance = cls(dim, **params)
+        for name in cls.ARRAYS:
+            path = os.path.join(directory, f"ivf_{name}.npy")
+            if os.path.exists(path):
+                mmap_mode = "r" if name in ("ids", "codes") else None
+                setattr(instance, name, np.load(path, mmap_mode=mmap_mode))
+        instance.vectors = embeddings
+        instance.count = len(instance.ids)
+        return instance
+
+
+# Backends selectable by name; "exact" searches the normalized embeddings directly
+VECTOR_BACKENDS = {
+    "exact": None,
+    "annoy": AnnoyVectorIndex,
+    "hnsw": HNSWVectorIndex,
+    "ivfpq": IVFPQVectorIndex,
+}
+
+
+class DocumentStore:
+    """
+    Read-only documents stored as JSON lines with a memory-mapped offsets array
+
+    Documents are decoded on access, so opening a large corpus only maps the
+    files instead of parsing every document.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offsets = np.load(path + ".offsets.npy", mmap_mode="r")
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b""
+
+    @staticmethod
+    def write(path: str, documents: Sequence[Dict]):
+        """Write documents and their byte offsets"""
+        offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        with open(path, "wb") as f:
+            for i, doc in enumerate(documents):
+                line = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets[i + 1] = offsets[i] + len(line)
+        np.save(path + ".offsets.npy", offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return json.loads(self._data[self._offsets[index]:self._offsets[index + 1]])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+@dataclass
+class IndexState:
+    """One generation of the main index; replaced as a whole, never mutated"""
+    embeddings: Optional[np.ndarray] = None
+    documents: Sequence[Dict] = ()
+    search_index: Any = None
+    version: Optional[str] = None
+
 
 class SemanticSearchService:
     """
     Semantic search using Cohere embeddings and vector similarity
-    Supports both Annoy (local) and Elasticsearch (production) backends
+    Exact search or a pluggable ANN backend (Annoy, HNSW, IVF-PQ)
     """
 
     def __init__(
         self,
         cohere_key: Optional[str] = None,
-        backend: str = "annoy",  # "annoy" or "elasticsearch"
-        embedding_model: str = "embed-v4.0"
+        backend: str = "annoy",  # "exact", "annoy", "hnsw" or "ivfpq"
+        embedding_model: str = "embed-v4.0",
+        cache_path: Optional[str] = None,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrency: int = 4,
+        calls_per_minute: float = 1000,
+        max_retries: int = 5,
+        index_dir: Optional[str] = None,
+        n_trees: int = 10,
+        merge_threshold: int = 1000,
+        index_params: Optional[Dict] = None
     ):
         """
         Initialize semantic search service
 
         Args:
             cohere_key: Cohere API key
-            backend: Vector search backend ("annoy" or "elasticsearch")
+            backend: Vector search backend (see VECTOR_BACKENDS)
             embedding_model: Cohere embedding model to use
+            cache_path: SQLite embedding cache (default $EMBEDDING_CACHE_PATH, else
+                index_dir/embeddings.db, else in-memory for this process only)
+            batch_size: Texts per embed call (Cohere allows up to 96)
+            max_concurrency: Embed calls in flight at once
+            calls_per_minute: Rate limit for embed calls
+            max_retries: Retries per batch before raising EmbeddingError
+            index_dir: Directory for the persisted index; loaded on startup if present
+            n_trees: Annoy trees per build (more = better recall, slower build)
+            merge_threshold: Delta size that triggers a background index rebuild
+            index_params: Backend tuning parameters (e.g. {"ef_search": 128} for hnsw,
+                {"nprobe": 16, "quantizer": "int8"} for ivfpq)
         """
+        if backend not in VECTOR_BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {sorted(VECTOR_BACKENDS)}")
         self.cohere_key = cohere_key or os.getenv("COHERE_API_KEY")
         self.backend = backend
         self.embedding_model = embedding_model
+        self.batch_size = min(batch_size, EMBED_BATCH_SIZE)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(calls_per_minute)
+        cache_path = cache_path or os.getenv("EMBEDDING_CACHE_PATH")
+        if not cache_path and index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+            cache_path = os.path.join(index_dir, EMBEDDING_CACHE_FILE)
+        self.embedding_cache = EmbeddingCache(cache_path or ":memory:")
+        self.embedding_stats = {"api_calls": 0, "cache_hits": 0, "embedded": 0}
+        self._stats_lock = threading.Lock()
 
         # Initialize Cohere
         if not self.cohere_key:
@@ -45,9 +685,38 @@ class SemanticSearchService:
         self.available = True
 
         # Initialize backend
-        self.search_index = None
-        self.documents = []
-        self.embeddings = None
+        self.index_dir = index_dir
+        self.n_trees = n_trees
+        self.index_params = dict(index_params or {})
+        if backend == "annoy":
+            self.index_params.setdefault("n_trees", n_trees)
+        self.merge_threshold = merge_threshold
+        self._state = IndexState()
+        # Documents added since the last build, searched by brute force until merged
+        self._delta_documents: List[Dict] = []
+        self._delta_embeddings: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._generation = 0
+        self._merge_thread: Optional[threading.Thread] = None
+
+        if index_dir:
+            self.load_index()
+
+    @property
+    def search_index(self):
+        return self._state.search_index
+
+    @property
+    def documents(self) -> Sequence[Dict]:
+        return self._state.documents
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        return self._state.embeddings
+
+    def __len__(self) -> int:
+        return len(self._state.documents) + len(self._delta_documents)
 
     def embed_texts(
         self,
@@ -57,27 +726,82 @@ class SemanticSearchService:
         """
         Generate embeddings for a list of texts
 
+        Cached vectors are reused; the rest are embedded in API-sized batches
+        issued concurrently under the rate limit.
+
         Args:
             texts: List of text strings to embed
             input_type: "search_document" or "search_query"
 
         Returns:
-            Numpy array of embeddings
+            Numpy array of float32 embeddings, one row per text
+
+        Raises:
+            EmbeddingError: if a batch still fails after retries
         """
         if not self.available:
             # Mock embeddings for testing
             return np.random.rand(len(texts), 1024)
 
-        try:
-            response = self.co.embed(
-                texts=texts,
-                model=self.embedding_model,
-                input_type=input_type
-            )
-            return np.array(response.embeddings)
-        except Exception as e:
-            logger.error(f"Embedding error: {e}")
-            return np.random.rand(len(texts), 1024)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        vectors = self.embedding_cache.get_many(self.embedding_model, input_type, hashes)
+
+        # Embed each distinct missing text once
+        missing = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in vectors:
+                missing.setdefault(text_hash, text)
+
+        if missing:
+            items = list(missing.items())
+            batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+            workers = min(self.max_concurrency, len(batches))
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(lambda batch: self._embed_batch(batch, input_type), batches))
+            else:
+                results = [self._embed_batch(batch, input_type) for batch in batches]
+
+            fresh = {}
+            for batch_vectors in results:
+                fresh.update(batch_vectors)
+            self.embedding_cache.put_many(self.embedding_model, input_type, fresh)
+            vectors.update(fresh)
+
+        with self._stats_lock:
+            self.embedding_stats["cache_hits"] += len(texts) - sum(1 for h in hashes if h in missing)
+            self.embedding_stats["embedded"] += len(missing)
+        if missing:
+            logger.info(f"Embedded {len(missing)} texts ({len(texts) - len(missing)} from cache)")
+
+        return np.vstack([vectors[text_hash] for text_hash in hashes])
+
+    def _embed_batch(self, batch: List[Tuple[str, str]], input_type: str) -> Dict[str, np.ndarray]:
+        """Embed one API-sized batch with rate limiting and exponential backoff"""
+        texts = [text for _, text in batch]
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with self._stats_lock:
+                    self.embedding_stats["api_calls"] += 1
+                response = self.co.embed(
+                    texts=texts,
+                    model=self.embedding_model,
+                    input_type=input_type
+                )
+                embeddings = np.asarray(response.embeddings, dtype=np.float32)
+                if embeddings.shape[0] != len(texts):
+                    raise EmbeddingError(f"Expected {len(texts)} embeddings, got {embeddings.shape[0]}")
+                return {text_hash: embeddings[i] for i, (text_hash, _) in enumerate(batch)}
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise EmbeddingError(f"Embedding failed after {attempt + 1} attempts: {e}") from e
+                delay = min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2)
+                logger.warning(f"Embedding error (attempt {attempt + 1}), retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
 
     def build_index(
         self,
@@ -85,7 +809,7 @@ class SemanticSearchService:
         text_field: str = "text"
     ):
         """
-        Build search index from documents
+        Build search index from documents, replacing any existing index
 
         Args:
             documents: List of document dictionaries
@@ -93,44 +817,305 @@ class SemanticSearchService:
         """
         logger.info(f"Building search index for {len(documents)} documents...")
 
-        self.documents = documents
         texts = [doc[text_field] for doc in documents]
 
         # Generate embeddings
-        self.embeddings = self.embed_texts(texts, input_type="search_document")
-
-        # Build Annoy index
-        if self.backend == "annoy":
-            self._build_annoy_index()
-        else:
-            logger.warning(f"Backend {self.backend} not yet implemented")
+        embeddings = self.embed_texts(texts, input_type="search_document")
+        self.index_embeddings(documents, embeddings)
 
         logger.info("Search index built successfully")
 
-    def _build_annoy_index(self):
-        """Build Annoy index for fast nearest neighbor search"""
-        try:
-            from annoy import AnnoyIndex
-
-            n_dims = self.embeddings.shape[1]
-            self.search_index = AnnoyIndex(n_dims, 'angular')
+    def index_embeddings(self, documents: Sequence[Dict], embeddings: np.ndarray):
+        """Build the index from precomputed embeddings (one row per document)"""
+        if len(documents) != len(embeddings):
+            raise ValueError(f"{len(documents)} documents but {len(embeddings)} embeddings")
+        with self._lock:
+            self._generation += 1
+            self._delta_documents = []
+            self._delta_embeddings = None
+        self._install(normalize_rows(embeddings), list(documents))
+
+    def add_documents(
+        self,
+        documents: List[Dict],
+        text_field: str = "text"
+    ):
+        """
+        Add documents without rebuilding the index
 
-            for i, embedding in enumerate(self.embeddings):
-                self.search_index.add_item(i, embedding)
+        New documents are searched by brute force alongside the main index and
+        merged into a rebuilt index in the background once ``merge_threshold``
+        of them accumulate. Unmerged additions are not persisted; re-adding
+        them after a restart is served from the embedding cache.
+        """
+        if not documents:
+            return
+        embeddings = normalize_rows(
+            self.embed_texts([doc[text_field] for doc in documents], input_type="search_document")
+        )
 
-            self.search_index.build(10)  # 10 trees
-            logger.info("Annoy index built with 10 trees")
+        with self._lock:
+            self._delta_documents = self._delta_documents + list(documents)
+            if self._delta_embeddings is None:
+                self._delta_embeddings = embeddings
+            else:
+                self._delta_embeddings = np.vstack([self._delta_embeddings, embeddings])
+            pending = len(self._delta_documents)
+
+        if pending >= self.merge_threshold:
+            self.merge_delta(wait=False)
+
+    def merge_delta(self, wait: bool = True):
+        """Rebuild the main index with the delta folded in (in a background thread unless ``wait``)"""
+        with self._lock:
+            if self._merge_thread and self._merge_thread.is_alive():
+                thread = self._merge_thread
+            elif not self._delta_documents:
+                return
+            else:
+                thread = threading.Thread(target=self._merge, name="semantic-index-merge", daemon=True)
+                self._merge_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _merge(self):
+        with self._lock:
+            state = self._state
+            generation = self._generation
+            count = len(self._delta_documents)
+            delta_documents = self._delta_documents[:count]
+            delta_embeddings = self._delta_embeddings[:count]
+
+        logger.info(f"Merging {count} new documents into the index...")
+        try:
+            if state.embeddings is not None and len(state.embeddings):
+                embeddings = np.vstack([state.embeddings, delta_embeddings])
+            else:
+                embeddings = delta_embeddings
+            self._install(embeddings, list(state.documents) + delta_documents,
+                          generation=generation, merged=count)
+        except Exception as e:
+            logger.error(f"Index merge failed: {e}")
 
+    def _install(
+        self,
+        embeddings: np.ndarray,
+        documents: List[Dict],
+        generation: Optional[int] = None,
+        merged: int = 0
+    ):
+        """Build (and persist) a new index generation, then swap it in"""
+        search_index = self._build_search_index(embeddings)
+        state = IndexState(embeddings=embeddings, documents=documents, search_index=search_index)
+        if self.index_dir:
+            version = self._write_version(state, generation)
+            if version is None:
+                logger.info("Index was rebuilt during merge; discarding merged result")
+                return
+            # Serve from the memory-mapped copy so the build buffers can be freed
+            state = self._read_version(version) or state
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                logger.info("Index was rebuilt during merge; discarding merged result")
+                return
+            self._state = state
+            if merged:
+                self._delta_documents = self._delta_documents[merged:]
+                remaining = self._delta_embeddings[merged:]
+                self._delta_embeddings = remaining if len(remaining) else None
+
+    def _build_search_index(self, embeddings: np.ndarray) -> Optional[VectorIndex]:
+        """Build the configured ANN index for fast nearest neighbor search (None = exact search)"""
+        backend_cls = VECTOR_BACKENDS[self.backend]
+        if backend_cls is None or embeddings is None or not len(embeddings):
+            return None
+        try:
+            search_index = backend_cls(embeddings.shape[1], **self.index_params)
         except ImportError:
-            logger.warning("Annoy not installed - using brute force search")
-            self.search_index = None
+            logger.warning(f"{self.backend} backend dependencies not installed - using brute force search")
+            return None
+        search_index.build(embeddings)
+        return search_index
+
+    # ------------------------------------------------------------------
+    # Persistence
+    #
+    # index_dir/CURRENT names the live version directory, which holds
+    # manifest.json, embeddings.npy, documents.jsonl (+ offsets) and the
+    # backend's own files. Versions are written to a temp dir, renamed into place and
+    # then published by atomically replacing CURRENT.
+    # ------------------------------------------------------------------
+
+    def save_index(self) -> Optional[str]:
+        """Persist the index (merging any delta first); returns the version written"""
+        if not self.index_dir:
+            raise ValueError("index_dir is not configured")
+        if self._delta_documents:
+            self.merge_delta(wait=True)
+        with self._lock:
+            state = self._state
+            generation = self._generation
+        if state.version:
+            return state.version
+        version = self._write_version(state, generation)
+        if version is None:
+            # Replaced while saving; the newer index was persisted by its own build
+            return self._current_version()
+        with self._lock:
+            if self._state is state:
+                self._state = self._read_version(version) or state
+        return version
+
+    def load_index(self) -> bool:
+        """Memory-map the current persisted index, if any"""
+        version = self._current_version()
+        state = self._read_version(version) if version else None
+        if state is None:
+            return False
+        if state.version is None:
+            # Re-indexed for a different backend: persist it so the next startup only mmaps
+            version = self._write_version(state)
+            state = self._read_version(version) or state
+        with self._lock:
+            self._generation += 1
+            self._state = state
+            self._delta_documents = []
+            self._delta_embeddings = None
+        logger.info(f"Loaded search index {version} ({len(state.documents)} documents)")
+        return True
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.index_dir, "CURRENT")) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_version(self, state: IndexState, generation: Optional[int] = None) -> Optional[str]:
+        """
+        Write ``state`` as a new version and publish it as CURRENT
+
+        With ``generation``, nothing is published (and None is returned) if the
+        index was replaced since that generation, so a slow background merge
+        can never overwrite a newer build on disk.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        with self._save_lock:
+            current = self._current_version()
+            number = int(current[1:]) + 1 if current else 1
+            version = f"v{number:06d}"
+
+            staging = tempfile.mkdtemp(prefix=".staging-", dir=self.index_dir)
+            try:
+                embeddings = state.embeddings if state.embeddings is not None else np.empty((0, 0), np.float32)
+                np.save(os.path.join(staging, "embeddings.npy"), np.asarray(embeddings, dtype=np.float32))
+                DocumentStore.write(os.path.join(staging, "documents.jsonl"), state.documents)
+                if state.search_index is not None:
+                    state.search_index.save(staging)
+                manifest = {
+                    "format": INDEX_FORMAT_VERSION,
+                    "version": version,
+                    "backend": self.backend,
+                    "embedding_model": self.embedding_model,
+                    "n_documents": len(state.documents),
+                    "dim": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+                    "normalized": True,
+                    "has_index": state.search_index is not None,
+                    "index_params": state.search_index.params if state.search_index is not None else {},
+                    "created_at": datetime.utcnow().isoformat(),
+                }
+                with open(os.path.join(staging, "manifest.json"), "w") as f:
+                    json.dump(manifest, f, indent=2)
+                # A rebuild bumps the generation before writing its own version under
+                # this lock, so checking here orders every publish after the rebuild's
+                with self._lock:
+                    stale = generation is not None and generation != self._generation
+                if stale:
+                    shutil.rmtree(staging, ignore_errors=True)
+                    return None
+                os.rename(staging, os.path.join(self.index_dir, version))
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            pointer = os.path.join(self.index_dir, "CURRENT.tmp")
+            with open(pointer, "w") as f:
+                f.write(version)
+            os.replace(pointer, os.path.join(self.index_dir, "CURRENT"))
+            self._prune_versions(keep={version, current})
+
+        logger.info(f"Saved search index {version} to {self.index_dir}")
+        return version
+
+    def _prune_versions(self, keep: set):
+        for name in os.listdir(self.index_dir):
+            path = os.path.join(self.index_dir, name)
+            if os.path.isdir(path) and name.startswith("v") and name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _read_version(self, version: str) -> Optional[IndexState]:
+        path = os.path.join(self.index_dir, version)
+        try:
+            with open(os.path.join(path, "manifest.json")) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Search index {version} not found in {self.index_dir}")
+            return None
+
+        if manifest["format"] != INDEX_FORMAT_VERSION or manifest["embedding_model"] != self.embedding_model:
+            logger.warning(
+                f"Ignoring search index {version}: built with format {manifest['format']} "
+                f"and model {manifest['embedding_model']}"
+            )
+            return None
+
+        embeddings = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="r")
+        needs_index = VECTOR_BACKENDS[self.backend] is not None and len(embeddings) > 0
+        search_index = None
+        reindexed = False
+        backend_cls = VECTOR_BACKENDS[self.backend]
+        index_params = dict(manifest["index_params"])
+        rebuilt_params = []
+        if backend_cls is not None:
+            for key, value in self.index_params.items():
+                if key in backend_cls.QUERY_PARAMS:
+                    index_params[key] = value
+                elif value is not None and key in index_params and index_params[key] != value:
+                    rebuilt_params.append(key)
+
+        if manifest["backend"] == self.backend and manifest["has_index"] and not rebuilt_params:
+            try:
+                search_index = backend_cls.load(path, manifest["dim"], index_params, embeddings)
+            except ImportError:
+                logger.warning(f"{self.backend} backend dependencies not installed - using brute force search")
+        elif manifest["backend"] != self.backend or needs_index:
+            # Switching backends, changing build parameters or a missing index re-indexes
+            # the stored embeddings; nothing is re-embedded
+            if rebuilt_params and manifest["has_index"]:
+                logger.info(
+                    f"Search index {version} was built with different {', '.join(rebuilt_params)}; rebuilding it"
+                )
+            else:
+                logger.info(f"Search index {version} has no {self.backend} index; building it")
+            search_index = self._build_search_index(embeddings)
+            reindexed = search_index is not None or not needs_index
+
+        return IndexState(
+            embeddings=embeddings,
+            documents=DocumentStore(os.path.join(path, "documents.jsonl")),
+            search_index=search_index,
+            # An unsaved state (version None) is written by load_index
+            version=None if reindexed else version
+        )
 
     def search(
         self,
         query: str,
         top_k: int = 10,
         include_distances: bool = True
-    ) -> List[Dict]:
+    ) -> List[SearchHit]:
         """
         Search for documents similar to query
 
@@ -140,105 +1125,147 @@ class SemanticSearchService:
             include_distances: Include similarity scores
 
         Returns:
-            List of document dictionaries with scores
+            List of SearchHit document views with scores, best first
         """
-        if not self.documents:
+        if not len(self):
             logger.warning("No documents indexed")
             return []
 
         # Embed query
         query_embedding = self.embed_texts([query], input_type="search_query")[0]
 
-        # Search
-        if self.search_index:
-            return self._search_annoy(query_embedding, top_k, include_distances)
-        else:
-            return self._search_brute_force(query_embedding, top_k, include_distances)
+        return self.search_vectors(query_embedding[None, :], top_k, include_distances)[0]
 
-    def _search_annoy(
+    def search_many(
         self,
-        query_embedding: np.ndarray,
-        top_k: int,
-        include_distances: bool
-    ) -> List[Dict]:
-        """Search using Annoy index"""
-        try:
-            indices, distances = self.search_index.get_nns_by_vector(
-                query_embedding,
-                top_k,
-                include_distances=True
-            )
+        queries: List[str],
+        top_k: int = 10,
+        include_distances: bool = True
+    ) -> List[List[SearchHit]]:
+        """Search many queries with batched embedding calls and one matrix product per block"""
+        if not len(self) or not queries:
+            return [[] for _ in queries]
+        query_embeddings = self.embed_texts(queries, input_type="search_query")
+        return self.search_vectors(query_embeddings, top_k, include_distances)
+
+    def search_vectors(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        include_distances: bool = True,
+        exclude: Optional[int] = None
+    ) -> List[List[SearchHit]]:
+        """
+        Search precomputed query embeddings (one row per query)
+
+        Brute-force scoring is a single (queries x corpus) matrix product over
+        the pre-normalized corpus followed by argpartition top-k; the delta
+        buffer is scored the same way and merged in.
+        """
+        with self._lock:
+            state = self._state
+            delta_documents = self._delta_documents
+            delta_embeddings = self._delta_embeddings
+
+        queries = normalize_rows(np.atleast_2d(query_embeddings))
+        n_main = len(state.documents)
+        k = top_k + (exclude is not None)
 
-            results = []
-            for idx, dist in zip(indices, distances):
-                result = self.documents[idx].copy()
-                if include_distances:
-                    result['similarity_score'] = 1 - (dist**2 / 2)  # Convert to 0-1 similarity
-                    result['distance'] = dist
-                results.append(result)
+        results = []
+        for start in range(0, len(queries), QUERY_BLOCK):
+            block = queries[start:start + QUERY_BLOCK]
+            if not n_main:
+                hits = [[] for _ in block]
+            elif state.search_index is not None:
+                hits = self._search_index(state, block, k)
+            else:
+                hits = self._search_brute_force(state.embeddings, block, k)
+
+            if delta_embeddings is not None:
+                delta = self._search_brute_force(delta_embeddings, block, k)
+                hits = [
+                    sorted(main + [(idx + n_main, score, dist) for idx, score, dist in extra],
+                           key=lambda hit: hit[1], reverse=True)[:k]
+                    for main, extra in zip(hits, delta)
+                ]
+
+            for query_hits in hits:
+                if exclude is not None:
+                    query_hits = [hit for hit in query_hits if hit[0] != exclude]
+                results.append([
+                    SearchHit(idx, score, dist, state.documents, with_scores=include_distances)
+                    if idx < n_main else
+                    SearchHit(idx, score, dist, delta_documents, offset=n_main, with_scores=include_distances)
+                    for idx, score, dist in query_hits[:top_k]
+                ])
+        return results
 
-            return results
+    def _search_index(
+        self,
+        state: IndexState,
+        queries: np.ndarray,
+        top_k: int
+    ) -> List[List[Tuple[int, float, Optional[float]]]]:
+        """Search using the ANN backend, falling back to exact search on error"""
+        try:
+            ids, scores = state.search_index.search(queries, top_k)
         except Exception as e:
-            logger.error(f"Annoy search error: {e}")
-            return self._search_brute_force(query_embedding, top_k, include_distances)
+            logger.error(f"{self.backend} search error: {e}")
+            return self._search_brute_force(state.embeddings, queries, top_k)
+
+        with_distance = state.search_index.reports_distance
+        return [
+            [
+                (int(idx), float(score), float(np.sqrt(max(0.0, 2 - 2 * score))) if with_distance else None)
+                for idx, score in zip(row_ids, row_scores) if idx >= 0
+            ]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
 
     def _search_brute_force(
         self,
-        query_embedding: np.ndarray,
-        top_k: int,
-        include_distances: bool
-    ) -> List[Dict]:
-        """Fallback brute force search using cosine similarity"""
-        # Compute cosine similarity
-        similarities = np.dot(self.embeddings, query_embedding) / (
-            np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-        )
-
-        # Get top k indices
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-
-        results = []
-        for idx in top_indices:
-            result = self.documents[idx].copy()
-            if include_distances:
-                result['similarity_score'] = float(similarities[idx])
-            results.append(result)
-
-        return results
+        embeddings: np.ndarray,
+        queries: np.ndarray,
+        top_k: int
+    ) -> List[List[Tuple[int, float, Optional[float]]]]:
+        """Exact search: cosine similarity is a dot product on normalized vectors"""
+        scores = queries @ embeddings.T
+        top = top_k_indices(scores, top_k)
+        top_scores = np.take_along_axis(scores, top, axis=-1)
+        return [
+            [(int(idx), float(score), None) for idx, score in zip(row, row_scores)]
+            for row, row_scores in zip(top, top_scores)
+        ]
 
     def find_similar(
         self,
         document_id: int,
         top_k: int = 10
-    ) -> List[Dict]:
+    ) -> List[SearchHit]:
         """
         Find documents similar to an existing document
 
         Args:
-            document_id: Index of document in the corpus
+            document_id: Index of document in the corpus (delta documents follow the main index)
             top_k: Number of results to return
 
         Returns:
             List of similar documents
         """
-        if not self.search_index or document_id >= len(self.documents):
+        with self._lock:
+            state = self._state
+            delta_embeddings = self._delta_embeddings
+        n_main = len(state.documents)
+
+        if 0 <= document_id < n_main:
+            vector = np.asarray(state.embeddings[document_id])
+        elif delta_embeddings is not None and n_main <= document_id < n_main + len(delta_embeddings):
+            vector = delta_embeddings[document_id - n_main]
+        else:
             return []
 
         try:
-            indices, distances = self.search_index.get_nns_by_item(
-                document_id,
-                top_k + 1,  # +1 to exclude the query document itself
-                include_distances=True
-            )
-
-            results = []
-            for idx, dist in zip(indices[1:], distances[1:]):  # Skip first (itself)
-                result = self.documents[idx].copy()
-                result['similarity_score'] = 1 - (dist**2 / 2)
-                result['distance'] = dist
-                results.append(result)
-
-            return results
+            return self.search_vectors(vector[None, :], top_k, exclude=document_id)[0]
         except Exception as e:
             logger.error(f"Similar document search error: {e}")
             return []
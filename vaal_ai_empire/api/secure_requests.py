@@ -118,7 +118,8 @@ def create_ssrf_safe_async_session(
     timeout: float = 30.0,
     follow_redirects: bool = False,
     max_redirects: int = 0,
-    allowed_domains: Optional[Set[str]] = None
+    allowed_domains: Optional[Set[str]] = None,
+    limits: Optional[httpx.Limits] = None
 ) -> httpx.AsyncClient:
     """Create SSRF-safe async HTTP client."""
     
@@ -131,8 +132,9 @@ def create_ssrf_safe_async_session(
                 raise ValueError(f"Blocked SSRF attempt to: {url}")
             return await super().handle_async_request(request)
 
+    transport_kwargs = {'limits': limits} if limits is not None else {}
     return httpx.AsyncClient(
-        transport=SSRFSafeTransport(),
+        transport=SSRFSafeTransport(**transport_kwargs),
         timeout=timeout,
         follow_redirects=follow_redirects,
         max_redirects=max_redirects,